@@ -0,0 +1,226 @@
+# artifacts.py
+
+"""
+Emisión en paralelo de los artefactos de un plan compilado.
+
+A partir del diccionario de pipeline.compile_plan() se generan los
+artefactos pedidos (configuración Cisco, ensamblador, IR, tablas) en un
+pool de hilos o procesos. Cada archivo se escribe de forma atómica (archivo
+temporal + os.replace) y se omite si su contenido no cambió desde la última
+emisión, según el hash guardado en el manifiesto del directorio.
+
+Con un pool de procesos, los spans que cada trabajador registra se regresan
+en el reporte y se combinan en el Tracer activo del proceso principal.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import tracing
+
+# Manifiesto con el hash de cada artefacto emitido en el directorio
+MANIFEST_NAME = ".artefactos.json"
+
+
+def _render_cisco(plan):
+    from cisco_generator import generate_cisco_config
+    return generate_cisco_config(plan['vlsm_results'])
+
+
+def _render_asm(plan):
+    from code_generator_asm import generate_asm_code
+    return generate_asm_code(plan['ir'])
+
+
+def _render_asm_packed(plan):
+    from code_generator_asm import generate_packed_asm_code
+    return generate_packed_asm_code(plan['ir'])
+
+
+def _render_ir(plan):
+    return "\n".join(str(i) for i in plan['ir'])
+
+
+# Artefactos de texto: nombre -> (archivo, función que genera el texto)
+TEXT_ARTIFACTS = {
+    "cisco": ("router_config.ioscfg", _render_cisco),
+    "asm": ("router_config.asm", _render_asm),
+    "asm_packed": ("router_config_packed.asm", _render_asm_packed),
+    "ir": ("codigo_intermedio.txt", _render_ir),
+}
+
+# Artefactos tabulares: nombre del formato de exporters.py
+TABLE_ARTIFACTS = ("csv", "jsonl", "arrow", "parquet", "xlsx")
+
+# Artefactos que necesitan resultados VLSM (no se generan con errores)
+NEEDS_VLSM = {"cisco", *TABLE_ARTIFACTS}
+
+
+def artifact_filename(name):
+    """Nombre de archivo del artefacto name."""
+    if name in TEXT_ARTIFACTS:
+        return TEXT_ARTIFACTS[name][0]
+    from exporters import get_exporter
+    return f"vlsm{get_exporter(name).extension}"
+
+
+def _atomic_path(path):
+    """Crea un archivo temporal junto a path y devuelve su ruta."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    os.close(fd)
+    return tmp_path
+
+
+def atomic_write(path, data):
+    """Escribe data (bytes) en path de forma atómica."""
+    tmp_path = _atomic_path(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _table_key(name, plan):
+    """
+    Hash de un artefacto tabular: formatos como xlsx guardan la fecha de
+    creación y nunca producen bytes idénticos, así que se usa la clave del
+    plan (pipeline.plan_key) junto con el nombre del exportador. Solo un
+    plan sin clave se resume registro por registro.
+    """
+    digest = hashlib.sha256(f"{name}\0".encode())
+    if plan.get('key'):
+        digest.update(plan['key'].encode())
+    else:
+        for record in plan['vlsm_results']:
+            digest.update(json.dumps(record, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def emit_artifact(name, plan, out_dir, previous_key=None, text=None):
+    """
+    Genera y escribe un artefacto. Se ejecuta dentro del pool.
+    text: texto ya generado del artefacto (p. ej. leído de la caché).
+    Retorna un reporte con artefacto, archivo, estado ("escrito",
+    "sin_cambios" o "error"), clave (hash), segundos y error.
+    """
+    start = time.perf_counter()
+    start_ns = time.perf_counter_ns()
+    path = os.path.join(out_dir, artifact_filename(name))
+    report = {"artefacto": name, "archivo": path, "estado": "escrito",
+              "clave": None, "segundos": 0.0, "error": None}
+    try:
+        if name in NEEDS_VLSM and not plan['vlsm_results']:
+            raise ValueError("El plan tiene errores; no hay resultados VLSM.")
+
+        if name in TEXT_ARTIFACTS:
+            if text is None:
+                text = TEXT_ARTIFACTS[name][1](plan)
+            data = text.encode("utf-8")
+            key = hashlib.sha256(data).hexdigest()
+            if key == previous_key and os.path.exists(path):
+                report["estado"] = "sin_cambios"
+            else:
+                atomic_write(path, data)
+        else:
+            key = _table_key(name, plan)
+            if key == previous_key and os.path.exists(path):
+                report["estado"] = "sin_cambios"
+            else:
+                from exporters import get_exporter
+                tmp_path = _atomic_path(path)
+                try:
+                    get_exporter(name).write(tmp_path, plan['vlsm_results'])
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        report["clave"] = key
+    except Exception as e:
+        report["estado"] = "error"
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["segundos"] = time.perf_counter() - start
+    tracing.add_span(f"artefacto.{name}", start_ns, time.perf_counter_ns(), estado=report["estado"])
+    return report
+
+
+def _emit_artifact_traced(*args):
+    """
+    emit_artifact() en un proceso del pool con su propio Tracer; los spans
+    se regresan en report["traza"] porque el Tracer del proceso principal
+    no los ve.
+    """
+    tracer = tracing.start_tracing()
+    try:
+        report = emit_artifact(*args)
+    finally:
+        tracing.stop_tracing()
+    report["traza"] = {"eventos": tracer.events, "contadores": tracer.counters}
+    return report
+
+
+def load_manifest(out_dir):
+    """Lee el manifiesto de hashes del directorio (vacío si no existe)."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def emit_artifacts(plan, artifacts, out_dir, max_workers=None, use_processes=False, texts=None):
+    """
+    Genera en paralelo los artefactos pedidos del plan dentro de out_dir.
+
+    artifacts: nombres de TEXT_ARTIFACTS o TABLE_ARTIFACTS.
+    use_processes: usa un pool de procesos en lugar de hilos (útil cuando
+                   la generación es intensiva en CPU). Si hay trazado
+                   activo, los spans de los trabajadores se combinan en él.
+    texts: diccionario opcional {nombre: texto} de artefactos de texto ya
+           generados; esos no se vuelven a generar.
+
+    Retorna la lista de reportes de emit_artifact(), en el orden pedido.
+    """
+    unknown = [name for name in artifacts if name not in TEXT_ARTIFACTS and name not in TABLE_ARTIFACTS]
+    if unknown:
+        raise ValueError(f"Artefactos no soportados: {', '.join(unknown)}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    # Solo se envía al pool lo que usan los back ends
+    job_plan = {'vlsm_results': plan['vlsm_results'], 'ir': plan['ir'], 'key': plan.get('key')}
+
+    job = emit_artifact
+    if use_processes:
+        pool_class = ProcessPoolExecutor
+        if tracing.enabled():
+            job = _emit_artifact_traced
+    else:
+        pool_class = ThreadPoolExecutor
+    with pool_class(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(job, name, job_plan, out_dir,
+                        manifest.get(artifact_filename(name)), (texts or {}).get(name))
+            for name in artifacts
+        ]
+        reports = [future.result() for future in futures]
+
+    for report in reports:
+        trace = report.pop("traza", None)
+        if trace is not None:
+            tracing.merge(trace["eventos"], trace["contadores"])
+
+    for report in reports:
+        if report["estado"] != "error":
+            manifest[os.path.basename(report["archivo"])] = report["clave"]
+    atomic_write(os.path.join(out_dir, MANIFEST_NAME),
+                 json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return reports
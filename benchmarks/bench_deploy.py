@@ -0,0 +1,72 @@
+# benchmarks/bench_deploy.py
+
+"""
+Prueba de carga del motor de despliegue de deploy.py.
+
+Levanta N servidores MockIOSServer locales, genera una configuración Cisco
+para cada uno y la envía con ConfigDeployer; después envía otra vez para
+medir el efecto del pool de conexiones.
+
+Uso:
+    python benchmarks/bench_deploy.py --devices 300 --subnets 200 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cisco_generator import generate_cisco_config
+from deploy import ConfigDeployer, MockIOSServer, summarize_results
+from vlsm_calc import calculate_vlsm
+
+
+async def run(args):
+    servers = [
+        MockIOSServer(f"R{i}", latency=args.latency, failure_rate=args.failure_rate, seed=i)
+        for i in range(args.devices)
+    ]
+    for server in servers:
+        await server.start()
+
+    config = generate_cisco_config(calculate_vlsm("10.0.0.0", "/8", [10] * args.subnets, "Carga"))
+    devices = [
+        {"hostname": server.hostname, "host": server.host, "port": server.port, "config": config}
+        for server in servers
+    ]
+
+    deployer = ConfigDeployer(concurrency=args.concurrency, timeout=args.timeout, retries=args.retries)
+    try:
+        for label in ("Conexiones nuevas", "Conexiones del pool"):
+            start = time.perf_counter()
+            results = await deployer.deploy(devices)
+            summary = summarize_results(results, time.perf_counter() - start)
+            print(f"== {label} ==")
+            for key, value in summary.items():
+                print(f"  {key:<14} {value:.4f}" if isinstance(value, float) else f"  {key:<14} {value}")
+            print(f"  {'por_segundo':<14} {summary['dispositivos'] / summary['segundos']:.1f}")
+        print(f"Conexiones abiertas: {deployer.pool.opened}, reutilizadas: {deployer.pool.reused}")
+        print(f"Interfaces en R0: {len(servers[0].device.interfaces)}")
+    finally:
+        await deployer.close()
+        for server in servers:
+            await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=300)
+    parser.add_argument("--subnets", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
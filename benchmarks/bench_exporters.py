@@ -0,0 +1,56 @@
+# benchmarks/bench_exporters.py
+
+"""
+Throughput de los exportadores tabulares de exporters.py.
+
+Calcula un plan VLSM sintético y lo exporta en cada formato, midiendo
+filas por segundo y tamaño del archivo. El formato xlsx es la referencia.
+
+Uso:
+    python benchmarks/bench_exporters.py --rows 200000 --formats csv jsonl parquet xlsx
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exporters import EXPORTERS, get_exporter
+from vlsm_calc import calculate_vlsm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--formats", nargs="+", default=list(EXPORTERS), choices=list(EXPORTERS))
+    args = parser.parse_args(argv)
+
+    records = calculate_vlsm("10.0.0.0", "/8", [2] * args.rows, "Bench")
+    timings = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            exporter = get_exporter(fmt)
+            path = os.path.join(tmp, f"bench{exporter.extension}")
+            try:
+                start = time.perf_counter()
+                rows = exporter.write(path, iter(records))
+                elapsed = time.perf_counter() - start
+            except ImportError as e:
+                print(f"{fmt:<8} omitido: {e}")
+                continue
+            timings[fmt] = elapsed
+            size = os.path.getsize(path) / (1 << 20)
+            print(f"{fmt:<8} {elapsed:8.3f} s  {rows / elapsed:12,.0f} filas/s  {size:8.1f} MiB")
+
+    if "xlsx" in timings:
+        for fmt, elapsed in timings.items():
+            if fmt != "xlsx":
+                print(f"{fmt:<8} {timings['xlsx'] / elapsed:6.1f}x más rápido que xlsx")
+
+
+if __name__ == "__main__":
+    main()
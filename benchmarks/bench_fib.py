@@ -0,0 +1,69 @@
+# benchmarks/bench_fib.py
+
+"""
+Benchmark de la tabla de reenvío de vm.py.
+
+Genera un .ioscfg con N interfaces (una subred /30 por interfaz), lo
+interpreta con parse_ioscfg(), construye la ForwardingTable y mide las
+búsquedas por segundo de lookup_many() sobre direcciones aleatorias.
+
+Uso:
+    python benchmarks/bench_fib.py --interfaces 100000 --lookups 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cisco_generator import save_cisco_config
+from summarization import ip_to_int
+from vlsm_calc import calculate_vlsm
+from vm import ForwardingTable, parse_ioscfg
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interfaces", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = calculate_vlsm("10.0.0.0", "/8", [2] * args.interfaces, "Bench")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.ioscfg")
+        save_cisco_config(results, path)
+
+        start = time.perf_counter()
+        device = parse_ioscfg(path)
+        parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = ForwardingTable.from_device(device)
+    build_time = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    base = ip_to_int("10.0.0.0")
+    span = args.interfaces * 4 * 2  # la mitad de las direcciones no tiene ruta
+    addresses = [base + rng.randrange(span) for _ in range(args.lookups)]
+
+    start = time.perf_counter()
+    answers = table.lookup_many(addresses)
+    lookup_time = time.perf_counter() - start
+
+    hits = sum(1 for answer in answers if answer is not None)
+    print(f"Interfaces:            {len(device.interfaces)}")
+    print(f"Rutas en la tabla:     {len(table)}")
+    print(f"Interpretación:        {parse_time:.3f} s")
+    print(f"Construcción de tabla: {build_time:.3f} s")
+    print(f"Búsquedas:             {args.lookups} ({hits} con ruta)")
+    print(f"Búsquedas por segundo: {args.lookups / lookup_time:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
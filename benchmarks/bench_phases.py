@@ -0,0 +1,191 @@
+# benchmarks/bench_phases.py
+
+"""
+Tiempo de cada fase del compilador sobre planes sintéticos.
+
+Para cada tamaño (número de bloques) genera un plan con synthetic.py y mide:
+
+    lexer        VLSMLexer.tokenize
+    parse        VLSMParser.parse
+    parse_tree   VLSMParser.parse_with_tree
+    semantic     VLSMSemanticAnalyzer.analyze
+    vlsm         calculate_vlsm sobre todos los bloques
+    ir           IntermediateCodeGenerator.generate (incluye optimizar y texto)
+    optimizer    IROptimizer.optimize sobre el IR sin optimizar
+    asm          ASMCodeGenerator.generate
+    cisco        generate_cisco_config
+
+Cada fase se repite --repeat veces y se guarda el mejor tiempo. Con errores
+inyectados (--error-rate) las fases vlsm y cisco se omiten si el plan tiene
+errores, igual que en el compilador.
+
+Los resultados se guardan en JSON (--output) y se pueden comparar contra una
+línea base (--baseline): el script termina con código 1 si alguna fase es
+más lenta que la base por encima de --threshold.
+
+Uso:
+    python benchmarks/bench_phases.py --sizes 10 1000 100000 --output base.json
+    python benchmarks/bench_phases.py --sizes 10 1000 100000 --baseline base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cisco_generator import generate_cisco_config
+from code_generator_asm import ASMCodeGenerator
+from intermediate_code import IntermediateCodeGenerator
+from lexer import VLSMLexer
+from optimizer import IROptimizer
+from parser import VLSMParser
+from pipeline import calculate_plan_vlsm
+from semantic import VLSMSemanticAnalyzer
+from synthetic import generate_plan
+
+PHASES = ["lexer", "parse", "parse_tree", "semantic", "vlsm", "ir", "optimizer", "asm", "cisco"]
+
+# Diferencias menores a esto se consideran ruido al comparar con la base
+MIN_REGRESSION_SECONDS = 0.001
+
+
+def best_time(func, repeat):
+    """Mejor tiempo de repeat ejecuciones de func(); retorna (segundos, resultado)."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_size(blocks, hosts, error_rate, seed, repeat):
+    """Mide todas las fases para un plan de blocks bloques."""
+    code = generate_plan(blocks, hosts, error_rate=error_rate, seed=seed)
+    times = {}
+
+    times["lexer"], (tokens, lex_errors) = best_time(lambda: VLSMLexer().tokenize(code), repeat)
+
+    def parse():
+        parser = VLSMParser(tokens)
+        return parser.parse(), parser.errors
+    times["parse"], (parsed_blocks, syntax_errors) = best_time(parse, repeat)
+    times["parse_tree"], _ = best_time(lambda: VLSMParser(tokens).parse_with_tree(), repeat)
+
+    def analyze():
+        analyzer = VLSMSemanticAnalyzer(parsed_blocks)
+        return analyzer.analyze()
+    times["semantic"], semantic_ok = best_time(analyze, repeat)
+    ok = semantic_ok and not lex_errors and not syntax_errors
+
+    vlsm_results = None
+    if ok:
+        times["vlsm"], vlsm_results = best_time(lambda: calculate_plan_vlsm(parsed_blocks), repeat)
+    else:
+        times["vlsm"] = None
+
+    def generate_ir():
+        generator = IntermediateCodeGenerator(parsed_blocks)
+        generator.generate()
+        return generator.emitter.instructions
+    times["ir"], raw_ir = best_time(generate_ir, repeat)
+    times["optimizer"], ir = best_time(lambda: IROptimizer().optimize(raw_ir), repeat)
+    times["asm"], _ = best_time(lambda: ASMCodeGenerator(ir).generate(), repeat)
+
+    if vlsm_results is not None:
+        times["cisco"], _ = best_time(lambda: generate_cisco_config(vlsm_results), repeat)
+    else:
+        times["cisco"] = None
+
+    counts = {
+        "bytes": len(code),
+        "tokens": len(tokens),
+        "bloques": len(parsed_blocks),
+        "subredes": len(vlsm_results) if vlsm_results is not None else 0,
+        "instrucciones_ir": len(ir),
+    }
+    return times, counts
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara results contra baseline (mismo formato JSON).
+    Retorna la lista de regresiones (tamaño, fase, base, actual, razón).
+    """
+    regressions = []
+    for size, entry in results.items():
+        base_entry = baseline.get("resultados", {}).get(size)
+        if not base_entry:
+            continue
+        for phase, current in entry["tiempos"].items():
+            base = base_entry["tiempos"].get(phase)
+            if current is None or not base:
+                continue
+            ratio = current / base
+            if ratio > 1 + threshold and current - base > MIN_REGRESSION_SECONDS:
+                regressions.append((size, phase, base, current, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10_000],
+                        help="números de bloques (hasta 1000000)")
+    parser.add_argument("--hosts", type=int, default=4, help="subredes por bloque")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="archivo JSON con resultados de referencia")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="tolerancia de regresión (0.10 = 10%% más lento)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'bloques':>9} " + " ".join(f"{phase:>10}" for phase in PHASES))
+    for size in args.sizes:
+        times, counts = bench_size(size, args.hosts, args.error_rate, args.seed, args.repeat)
+        results[str(size)] = {"tiempos": times, "conteos": counts}
+        cells = " ".join(f"{'-':>10}" if times[p] is None else f"{times[p]:10.4f}" for p in PHASES)
+        print(f"{size:>9} {cells}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "hosts": args.hosts,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "resultados": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key in ("hosts", "error_rate", "seed"):
+            if baseline.get("meta", {}).get(key) != report["meta"][key]:
+                print(f"Aviso: la línea base usa {key}={baseline['meta'].get(key)}; "
+                      f"esta corrida usa {report['meta'][key]}.")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nREGRESIONES:")
+            for size, phase, base, current, ratio in regressions:
+                print(f"  {size:>9} {phase:<10} {base:.4f} s -> {current:.4f} s ({ratio:.2f}x)")
+            return 1
+        print("\nSin regresiones respecto a la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
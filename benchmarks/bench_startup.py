@@ -0,0 +1,127 @@
+# benchmarks/bench_startup.py
+
+"""
+Tiempo de arranque (importación en frío) de los módulos del compilador.
+
+Cada corrida importa un módulo en un proceso nuevo de Python con
+-X importtime y toma el tiempo acumulado del módulo; se reporta la mediana
+de varias corridas y las importaciones más pesadas de cada módulo.
+
+Termina con código 1 si algún módulo supera el presupuesto de --budget-ms
+(default: DEFAULT_BUDGET_MS; 0 lo desactiva), y también si importa alguno
+de los módulos de --forbid (dependencias pesadas que deben cargarse en su
+primer uso, no al importar el núcleo del compilador).
+
+tests/test_startup.py solo verifica FORBIDDEN con forbidden_imports(), que
+no depende del reloj; el presupuesto de tiempo se revisa con este script.
+
+Uso:
+    python benchmarks/bench_startup.py --runs 7 --budget-ms 30
+    python benchmarks/bench_startup.py --modules gui --forbid openpyxl code_generator_asm
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos del núcleo: lo que carga una invocación corta del compilador
+CORE_MODULES = ["lexer", "parser", "semantic", "vlsm_calc", "intermediate_code", "pipeline", "cli"]
+
+# Dependencias que el núcleo no debe importar al arrancar
+FORBIDDEN = ["tkinter", "openpyxl", "pyarrow", "asyncio", "ipaddress"]
+
+# Presupuesto por módulo (mediana, ms). cli, el más pesado, tarda ~20 ms; el
+# margen cubre máquinas más lentas, no dependencias nuevas al arrancar
+DEFAULT_BUDGET_MS = 50.0
+
+
+def import_times(statement):
+    """
+    Ejecuta statement en un proceso nuevo con -X importtime.
+    Retorna {módulo: (propio_us, acumulado_us)} en orden de importación.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def forbidden_imports(module, forbidden=FORBIDDEN):
+    """
+    Importa module en un proceso nuevo y retorna, ordenados, los módulos de
+    forbidden que quedaron en sys.modules sin que el intérprete los cargue
+    por sí solo.
+    """
+    statement = (
+        "import sys; before = set(sys.modules); "
+        f"import {module}; "
+        f"print(' '.join(sorted(name for name in {list(forbidden)!r} "
+        "if name in sys.modules and name not in before)))"
+    )
+    proc = subprocess.run([sys.executable, "-c", statement],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    return proc.stdout.split()
+
+
+def measure(module, runs, baseline):
+    """
+    Mediana del tiempo acumulado de importar module (ms), los módulos que
+    carga además de los del intérprete, y los de la última corrida.
+    """
+    samples = []
+    for _ in range(runs):
+        times = import_times(f"import {module}")
+        samples.append(times[module][1] / 1000)
+    loaded = {name: t for name, t in times.items() if name not in baseline}
+    return statistics.median(samples), loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=CORE_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="importaciones más pesadas por módulo")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"presupuesto por módulo en ms; 0 lo desactiva (default: {DEFAULT_BUDGET_MS:g})")
+    parser.add_argument("--forbid", nargs="*", default=FORBIDDEN)
+    args = parser.parse_args(argv)
+
+    # Lo que el intérprete ya importa al arrancar no cuenta para el módulo
+    baseline = set(import_times("pass"))
+    failures = []
+
+    for module in args.modules:
+        median_ms, loaded = measure(module, args.runs, baseline)
+        print(f"{module:<20} {median_ms:8.2f} ms  ({len(loaded)} módulos)")
+
+        heaviest = sorted(loaded.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, _) in heaviest:
+            print(f"    {name:<30} {self_us / 1000:8.2f} ms")
+
+        if args.budget_ms and median_ms > args.budget_ms:
+            failures.append(f"{module}: {median_ms:.2f} ms supera el presupuesto de {args.budget_ms:.2f} ms")
+        forbidden = sorted(name for name in args.forbid if name in loaded)
+        if forbidden:
+            failures.append(f"{module}: importa al arrancar {', '.join(forbidden)}")
+
+    if failures:
+        print("\nFALLA:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
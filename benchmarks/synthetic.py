@@ -0,0 +1,94 @@
+# benchmarks/synthetic.py
+
+"""
+Generador determinista de planes sintéticos para benchmarks.
+
+generate_plan(blocks, hosts_per_block, error_rate, seed) produce el texto
+de un plan con `blocks` sentencias IP ... MASK ... HOSTS ... NAME ...; cada
+bloque pide `hosts_per_block` subredes de tamaño aleatorio y recibe su
+propia red base, alineada y sin traslaparse con las anteriores (las
+direcciones dan la vuelta al espacio IPv4 en planes enormes).
+
+Con error_rate > 0 una fracción de los bloques lleva un error léxico,
+sintáctico o semántico. La misma semilla produce siempre el mismo plan.
+
+Uso como script:
+    python benchmarks/synthetic.py --blocks 1000 --hosts 4 --error-rate 0.01 > plan.vlsm
+"""
+
+import argparse
+import random
+import sys
+
+# Tipos de error que se inyectan, en rotación aleatoria
+ERROR_KINDS = ("lexico", "sintactico", "semantico")
+
+
+def _block_size(hosts):
+    """Direcciones que ocupa una subred de hosts (potencia de 2, con red y broadcast)."""
+    return 1 << (hosts + 1).bit_length()
+
+
+def _int_to_ip(value):
+    return f"{value >> 24 & 255}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+def generate_blocks(blocks, hosts_per_block=4, max_hosts=250, error_rate=0.0, seed=0):
+    """
+    Genera las sentencias del plan, una por bloque.
+    Retorna una lista de (sentencia, tipo de error o None).
+    """
+    rng = random.Random(seed)
+    cursor = 1 << 24  # 1.0.0.0
+    statements = []
+
+    for i in range(blocks):
+        hosts = [rng.randint(1, max_hosts) for _ in range(hosts_per_block)]
+        total = sum(_block_size(h) for h in hosts)
+        size = 1 << (total - 1).bit_length()
+        prefix = 32 - size.bit_length() + 1
+
+        # Alinea la red base a su tamaño
+        base = (cursor + size - 1) // size * size % (1 << 32)
+        cursor = base + size
+
+        ip = _int_to_ip(base)
+        mask = f"/{prefix}"
+        name = f"Red{i + 1}"
+
+        error = None
+        if error_rate and rng.random() < error_rate:
+            error = rng.choice(ERROR_KINDS)
+            if error == "lexico":
+                name = f"{name} @"
+            elif error == "sintactico":
+                mask = mask.lstrip("/")
+            else:
+                # La IP base deja de ser la dirección de red
+                ip = _int_to_ip(base + 1)
+
+        statement = f"IP {ip} MASK {mask} HOSTS {','.join(map(str, hosts))} NAME {name};"
+        statements.append((statement, error))
+    return statements
+
+
+def generate_plan(blocks, hosts_per_block=4, max_hosts=250, error_rate=0.0, seed=0):
+    """Texto del plan sintético, un bloque por línea."""
+    statements = generate_blocks(blocks, hosts_per_block, max_hosts, error_rate, seed)
+    return "\n".join(statement for statement, _ in statements) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=100)
+    parser.add_argument("--hosts", type=int, default=4, help="subredes por bloque")
+    parser.add_argument("--max-hosts", type=int, default=250)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sys.stdout.write(generate_plan(args.blocks, args.hosts, args.max_hosts, args.error_rate, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# cache.py
+
+"""
+Caché persistente del compilador, direccionada por contenido.
+
+Cada entrada guarda el plan compilado completo de pipeline.compile_plan()
+(tokens, diagnósticos, bloques, árbol, resultados VLSM e IR optimizado) y
+los artefactos de texto ya generados (cisco, asm, ...). La clave es el
+SHA-256 del texto del plan junto con COMPILER_VERSION y CACHE_FORMAT, así
+que un cambio de versión invalida todas las entradas anteriores.
+
+Estructura en disco:
+
+    <directorio>/
+        .lock                      bloqueo para la limpieza entre procesos
+        objetos/ab/abcdef....pkl   una entrada (pickle) por plan
+
+Las entradas se escriben de forma atómica (archivo temporal + os.replace),
+así que un lector nunca ve una entrada a medias; una entrada ilegible se
+trata como fallo y se borra. Cada acierto actualiza la fecha de
+modificación de la entrada y, cuando el tamaño total supera max_bytes, se
+borran las entradas usadas hace más tiempo (bajo un bloqueo de archivo).
+
+Uso:
+    cache = PlanCache()
+    plan, texts, hit = compile_cached(code, ["cisco", "asm"], cache)
+"""
+
+import hashlib
+import os
+import pickle
+
+import tracing
+from artifacts import TEXT_ARTIFACTS, atomic_write
+from pipeline import COMPILER_VERSION, compile_plan
+
+# Versión del formato de las entradas; cambia si cambia su estructura
+CACHE_FORMAT = 3
+
+# Directorio por defecto (se puede cambiar con la variable de entorno)
+CACHE_ENV = "VLSM_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "compilador-vlsm")
+
+DEFAULT_MAX_BYTES = 512 << 20
+
+# Al limpiar se baja hasta esta fracción de max_bytes para no limpiar en
+# cada escritura
+EVICT_TARGET = 0.9
+
+
+class _FileLock:
+    """Bloqueo exclusivo entre procesos sobre un archivo (flock o msvcrt)."""
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "a+b")
+        try:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+        return False
+
+
+class PlanCache:
+    """
+    Caché en disco de planes compilados.
+
+    directory: directorio de la caché (default: $VLSM_CACHE_DIR o
+               ~/.cache/compilador-vlsm).
+    max_bytes: tamaño máximo total de las entradas (default: 512 MiB).
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get(CACHE_ENV) or DEFAULT_CACHE_DIR
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self.objects = os.path.join(self.directory, "objetos")
+        os.makedirs(self.objects, exist_ok=True)
+        self.lock_path = os.path.join(self.directory, ".lock")
+
+    @staticmethod
+    def key(code, link_includes=False):
+        """
+        Clave de un plan: hash del texto, de la versión del compilador y de
+        si los INCLUDE se enlazan (ver pipeline.compile_plan).
+        """
+        digest = hashlib.sha256(f"{COMPILER_VERSION}\0{CACHE_FORMAT}\0{int(link_includes)}\0".encode())
+        digest.update(code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.objects, key[:2], f"{key}.pkl")
+
+    def get(self, key):
+        """Regresa la entrada guardada con key, o None."""
+        path = self._path(key)
+        with tracing.span("cache.leer"):
+            try:
+                with open(path, "rb") as f:
+                    entry = pickle.load(f)
+            except FileNotFoundError:
+                return None
+            except Exception:
+                # Entrada corrupta o de otra versión de Python
+                self._remove(path)
+                return None
+        if not isinstance(entry, dict) or entry.get("clave") != key:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, entry):
+        """Guarda entry (diccionario) con key y limpia si hace falta."""
+        entry = dict(entry, clave=key)
+        path = self._path(key)
+        with tracing.span("cache.escribir"):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        if self.size() > self.max_bytes:
+            self.evict()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        """Lista de (mtime, tamaño, ruta) de todas las entradas."""
+        entries = []
+        for shard in os.scandir(self.objects):
+            if not shard.is_dir():
+                continue
+            for item in os.scandir(shard.path):
+                if not item.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+        return entries
+
+    def size(self):
+        """Tamaño total de las entradas, en bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Borra las entradas menos usadas hasta quedar bajo el límite."""
+        with _FileLock(self.lock_path):
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICT_TARGET
+            removed = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        tracing.counter("cache.desalojadas", removed)
+        return removed
+
+    def clear(self):
+        """Borra todas las entradas."""
+        with _FileLock(self.lock_path):
+            for _, _, path in self._entries():
+                self._remove(path)
+
+    def stats(self):
+        entries = self._entries()
+        return {"directorio": self.directory, "entradas": len(entries),
+                "bytes": sum(size for _, size, _ in entries), "max_bytes": self.max_bytes}
+
+
+def compile_cached(code, artifacts=(), cache=None, vlsm_cache=None, link_includes=False):
+    """
+    Compila code usando la caché y genera los artefactos de texto pedidos.
+
+    artifacts: nombres de artefactos; solo los de TEXT_ARTIFACTS se generan
+               y guardan aquí (los tabulares salen de plan['vlsm_results']).
+    Los artefactos solo se generan si el plan no tiene errores.
+    link_includes: se pasa a compile_plan().
+
+    Retorna (plan, textos, acierto) donde textos es {nombre: texto}.
+    """
+    names = [name for name in artifacts if name in TEXT_ARTIFACTS]
+    if cache is None:
+        plan = compile_plan(code, vlsm_cache=vlsm_cache, link_includes=link_includes)
+        texts = {name: TEXT_ARTIFACTS[name][1](plan) for name in names} if plan['ok'] else {}
+        return plan, texts, False
+
+    key = cache.key(code, link_includes)
+    entry = cache.get(key)
+    hit = entry is not None
+    tracing.counter("cache.aciertos" if hit else "cache.fallos")
+    if hit:
+        plan, texts = entry["plan"], entry["textos"]
+    else:
+        plan, texts = compile_plan(code, vlsm_cache=vlsm_cache, link_includes=link_includes), {}
+
+    # Los artefactos que aún no estén guardados se generan desde el plan
+    missing = [name for name in names if name not in texts] if plan['ok'] else []
+    for name in missing:
+        texts[name] = TEXT_ARTIFACTS[name][1](plan)
+    if not hit or missing:
+        cache.put(key, {"plan": plan, "textos": texts})
+    return plan, {name: texts[name] for name in names if name in texts}, hit
@@ -10,67 +10,442 @@ GigabitEthernet0/2
 ...
 
 El prefijo de interfaz puede modificarse desde gui.py
+
+Para planes muy grandes se usa write_cisco_config(), que recibe cualquier
+iterable de subredes y escribe la configuración por bloques directamente
+en un archivo o socket, sin construir el texto completo en memoria.
 """
 
-def generate_cisco_config(vlsm_results, interface_prefix="GigabitEthernet0/"):
+import io
+import itertools
+import operator
+import string
+
+from summarization import subnet_range, summarize_ranges, summary_records
+import tracing
+
+# Encabezado estético estilo Cisco
+CONFIG_HEADER = (
+    "! =======================================\n"
+    "! CONFIGURACIÓN GENERADA POR COMPILADOR VLSM\n"
+    "! Compatible con Cisco IOS\n"
+    "! =======================================\n"
+    "\n"
+)
+
+# Sección final del archivo
+CONFIG_FOOTER = "! FIN DE CONFIGURACIÓN"
+
+# Bloque de configuración de cada subred.
+# Campos disponibles: {iface}, {name}, {ip}, {mask}, {index}, {vlan} y
+# cualquier clave del diccionario de la subred (hosts_solicitados, ...).
+SUBNET_TEMPLATE = (
+    "! -------------------------------\n"
+    "! Subred: {name}\n"
+    "! Hosts solicitados: {hosts_solicitados}\n"
+    "! Hosts disponibles: {hosts_encontrados}\n"
+    "! -------------------------------\n"
+    "interface {iface}\n"
+    " description {name}\n"
+    " ip address {ip} {mask}\n"
+    " no shutdown\n"
+    " exit\n"
+    "\n"
+)
+
+# Campos calculados de la plantilla: posición en (index, vlan, iface, name)
+_COMPUTED_FIELDS = {"index": 0, "vlan": 1, "iface": 2, "name": 3}
+
+# Campos de la plantilla con otro nombre en la subred; el resto se toma de
+# la subred con su propio nombre
+_SUBNET_FIELDS = {"ip": "direccionamiento_de_red", "mask": "mascara_decimal"}
+
+
+def _tuple_getter(items):
+    """Como operator.itemgetter(*items), pero siempre regresa una tupla."""
+    if len(items) == 1:
+        get = operator.itemgetter(items[0])
+        return lambda obj: (get(obj),)
+    if not items:
+        return lambda obj: ()
+    return operator.itemgetter(*items)
+
+# Cantidad de subredes que se acumulan antes de cada escritura
+CHUNK_SUBNETS = 512
+
+
+def compile_template(template):
+    """
+    Compila una plantilla con campos {campo} una sola vez.
+    Retorna una función render(subnet, index, iface, name) que construye
+    el bloque completo de una subred con una única operación de formato.
+
+    Los especificadores de formato ({campo:>5}) no están soportados.
+    """
+    parts = []
+    subnet_keys = []
+    positions = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace("%", "%%"))
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion:
+            raise ValueError(f"Campo de plantilla no soportado: {{{field}}}")
+        parts.append("%s")
+        if field in _COMPUTED_FIELDS:
+            positions.append(_COMPUTED_FIELDS[field])
+            continue
+        key = _SUBNET_FIELDS.get(field, field)
+        if key not in subnet_keys:
+            subnet_keys.append(key)
+        positions.append(len(_COMPUTED_FIELDS) + subnet_keys.index(key))
+
+    body = "".join(parts)
+    subnet_values = _tuple_getter(subnet_keys)
+    pick = _tuple_getter(positions)
+
+    def render(subnet, index, iface, name):
+        # Los valores de la subred se leen con un solo itemgetter y se
+        # acomodan en el orden de la plantilla con otro
+        return body % pick((index, index + 1, iface, name) + subnet_values(subnet))
+
+    return render
+
+
+def _get_writer(out, encoding):
+    """
+    Devuelve la función de escritura del destino.
+    Acepta objetos tipo archivo (write) o sockets (sendall).
+    """
+    write = getattr(out, "write", None)
+    if write is not None:
+        return write
+
+    sendall = out.sendall
+    return lambda text: sendall(text.encode(encoding))
+
+
+def iter_cisco_config(vlsm_results, interface_prefix="GigabitEthernet0/",
+                      template=SUBNET_TEMPLATE, header=CONFIG_HEADER,
+                      footer=CONFIG_FOOTER, interfaces=None,
+                      summarize=None, next_hop="Null0", stats=None):
+    """
+    Genera la configuración Cisco IOS de vlsm_results por bloques de texto
+    (encabezado, bloques de CHUNK_SUBNETS subredes, resúmenes y pie), sin
+    construirla completa. Las opciones son las de write_cisco_config();
+    si se pasa el diccionario stats, en stats["subredes"] queda la cantidad
+    de subredes generadas.
+    """
+    if stats is None:
+        stats = {}
+    stats["subredes"] = 0
+    render = compile_template(template)
+    if interfaces is None:
+        interfaces = (f"{interface_prefix}{i}" for i in itertools.count())
+
+    # Rangos de enteros para el resumen, agrupados por red
+    ranges = {} if summarize else None
+    if summarize not in (None, "block", "all"):
+        raise ValueError(f"Modo de resumen no soportado: {summarize}")
+
+    yield header
+
+    chunk = []
+    for i, (subnet, iface) in enumerate(zip(vlsm_results, interfaces)):
+        # Si la subred no tiene nombre se genera uno automáticamente
+        name = subnet.get("nombre_red") or f"SUBRED_{i}"
+        chunk.append(render(subnet, i, iface, name))
+        stats["subredes"] += 1
+        if ranges is not None:
+            key = (subnet.get("nombre_red"), subnet.get("ip_base")) if summarize == "block" else None
+            ranges.setdefault(key, []).append(subnet_range(subnet))
+        if len(chunk) >= CHUNK_SUBNETS:
+            yield "".join(chunk)
+            chunk.clear()
+
+    if chunk:
+        yield "".join(chunk)
+
+    if ranges:
+        summaries = []
+        for key, block_ranges in ranges.items():
+            nombre_red = key[0] if key else None
+            summaries.extend(summary_records(summarize_ranges(block_ranges), nombre_red))
+        yield from _summary_route_chunks(summaries, next_hop)
+
+    yield footer
+
+
+@tracing.traced("cisco.write")
+def write_cisco_config(vlsm_results, out, interface_prefix="GigabitEthernet0/",
+                       template=SUBNET_TEMPLATE, header=CONFIG_HEADER,
+                       footer=CONFIG_FOOTER, encoding="utf-8", interfaces=None,
+                       summarize=None, next_hop="Null0"):
+    """
+    Escribe la configuración Cisco IOS de vlsm_results en out por bloques.
+
+    vlsm_results: cualquier iterable de diccionarios de subred (lista de
+                  calculate_vlsm(), generador, lectura de archivo, etc.).
+    out: archivo en modo texto, buffer o socket.
+    interface_prefix: prefijo base de las interfaces.
+    template: plantilla por subred (ver SUBNET_TEMPLATE).
+    header / footer: texto al inicio y al final de la configuración.
+    interfaces: iterable opcional con el nombre de interfaz de cada subred;
+                si no se indica se usa interface_prefix + índice.
+    summarize: "block" agrega rutas resumidas por red, "all" un resumen de
+               todo el plan; None no agrega rutas.
+    next_hop: destino de las rutas resumidas (Null0 descarta el tráfico
+              que no coincide con una subred más específica).
+
+    Retorna la cantidad de subredes escritas.
+    """
+    write = _get_writer(out, encoding)
+    stats = {}
+    for text in iter_cisco_config(vlsm_results, interface_prefix, template, header, footer,
+                                  interfaces, summarize, next_hop, stats):
+        write(text)
+    return stats["subredes"]
+
+
+def _summary_route_chunks(summaries, next_hop):
+    """Genera el texto de la sección de rutas resumidas."""
+    lines = [
+        "! -------------------------------\n",
+        "! Rutas resumidas\n",
+        "! -------------------------------\n",
+    ]
+    last_name = None
+    for summary in summaries:
+        name = summary.get("nombre_red")
+        if name and name != last_name:
+            lines.append(f"! Red: {name}\n")
+        last_name = name
+        lines.append(
+            f"ip route {summary['direccionamiento_de_red']} {summary['mascara_decimal']} {next_hop}\n"
+        )
+    lines.append("\n")
+    yield "".join(lines)
+
+
+def _write_summary_routes(summaries, write, next_hop):
+    """Escribe la sección de rutas resumidas con la función write."""
+    for text in _summary_route_chunks(summaries, next_hop):
+        write(text)
+
+
+def write_summary_routes(summaries, out, next_hop="Null0", encoding="utf-8"):
+    """
+    Escribe en out las rutas resumidas calculadas por
+    summarization.summarize_vlsm().
+    """
+    _write_summary_routes(summaries, _get_writer(out, encoding), next_hop)
+
+
+def save_cisco_config(vlsm_results, path, **options):
+    """
+    Escribe la configuración directamente en el archivo indicado por path.
+    Acepta las mismas opciones que write_cisco_config().
+    """
+    with open(path, "w", encoding=options.get("encoding", "utf-8"), buffering=1 << 20) as f:
+        return write_cisco_config(vlsm_results, f, **options)
+
+
+def generate_cisco_config(vlsm_results, interface_prefix="GigabitEthernet0/", summarize=None):
     """
     Recibe la lista de subredes generadas por calculate_vlsm()
     y construye la configuración Cisco IOS correspondiente.
 
     vlsm_results: lista de diccionarios con información de cada subred.
     interface_prefix: prefijo base de las interfaces (por ejemplo: "GigabitEthernet0/")
+    summarize: None, "block" o "all" para agregar rutas resumidas
     """
 
-    # Lista donde se guardarán todas las líneas del archivo final de configuración
-    lines = []
+    # Se reutiliza el generador por bloques sobre un buffer en memoria
+    buffer = io.StringIO()
+    write_cisco_config(vlsm_results, buffer, interface_prefix, summarize=summarize)
+    return buffer.getvalue()
 
-    # Encabezado estético estilo Cisco
-    lines.append("! =======================================")
-    lines.append("! CONFIGURACIÓN GENERADA POR COMPILADOR VLSM")
-    lines.append("! Compatible con Cisco IOS")
-    lines.append("! =======================================\n")
 
-    # Recorremos todas las subredes generadas por el VLSM
-    for i, subnet in enumerate(vlsm_results):
+# Encabezado y pie de la configuración incremental
+DELTA_HEADER = (
+    "! =======================================\n"
+    "! CAMBIOS INCREMENTALES GENERADOS POR COMPILADOR VLSM\n"
+    "! Compatible con Cisco IOS\n"
+    "! =======================================\n"
+    "\n"
+)
 
-        # Construcción del nombre de interfaz usando el índice
-        # Ejemplo: GigabitEthernet0/0, GigabitEthernet0/1...
-        iface = f"{interface_prefix}{i}"
+DELTA_FOOTER = "! FIN DE CAMBIOS"
 
-        # Extraemos la IP de red asignada a la subred
-        ip = subnet["direccionamiento_de_red"]
 
-        # Máscara en formato decimal (255.255.255.x)
-        mask = subnet["mascara_decimal"]
+def _subnet_keys(vlsm_results):
+    """
+    Genera (clave, subred) con una clave estable para cada subred: red
+    (nombre o IP base), hosts solicitados y ocurrencia de esa cantidad de
+    hosts dentro de la red. Agregar, quitar o redimensionar una subred no
+    cambia la clave de las demás.
+    """
+    seen = {}
+    for subnet in vlsm_results:
+        network = subnet.get("nombre_red") or subnet.get("ip_base")
+        base = (network, subnet["hosts_solicitados"])
+        seen[base] = seen.get(base, 0) + 1
+        yield base + (seen[base],), subnet
+
 
-        # Nombre amigable de la subred.
-        # Si no existe, se genera uno automáticamente.
+def _index_subnets(vlsm_results, interface_prefix, interfaces=None):
+    """
+    Construye el diccionario clave -> (interfaz, nombre, ip, máscara). Sin
+    interfaces se usa la misma asignación que write_cisco_config().
+    """
+    if interfaces is None:
+        interfaces = (f"{interface_prefix}{i}" for i in itertools.count())
+    index = {}
+    for i, ((key, subnet), iface) in enumerate(zip(_subnet_keys(vlsm_results), interfaces)):
         name = subnet.get("nombre_red") or f"SUBRED_{i}"
+        index[key] = (iface, name, subnet["direccionamiento_de_red"], subnet["mascara_decimal"])
+    return index
+
+
+def write_cisco_delta(old_results, new_results, out, interface_prefix="GigabitEthernet0/",
+                      header=DELTA_HEADER, footer=DELTA_FOOTER, encoding="utf-8",
+                      old_interfaces=None):
+    """
+    Escribe solo los comandos IOS necesarios para pasar de la configuración
+    de old_results a la de new_results.
+
+    Las subredes se emparejan con una clave estable (ver _subnet_keys) en
+    un diccionario (O(n)) y cada subred emparejada conserva su interfaz.
+    Una subred redimensionada toma la interfaz de la subred que desaparece
+    de la misma red; solo las subredes restantes reciben interfaces que el
+    plan anterior no usaba. Se compara el nombre, la IP y la máscara. Primero se liberan las
+    direcciones que cambian o desaparecen y después se asignan las nuevas,
+    para que IOS no rechace direcciones que se traslapan con las anteriores.
+
+    new_results se recorre dos veces (liberación y asignación); si es un
+    iterador se convierte en lista. Los comandos se escriben por bloques
+    conforme se generan, igual que en write_cisco_config().
+
+    old_interfaces: interfaz de cada subred de old_results, si no es la
+                    asignación de write_cisco_config() (por ejemplo, la de
+                    un delta anterior).
+
+    Retorna un diccionario con el conteo de interfaces agregadas,
+    modificadas, eliminadas y sin cambios, y en 'interfaces' la interfaz de
+    cada subred de new_results.
+    """
+    write = _get_writer(out, encoding)
+    previous = _index_subnets(old_results, interface_prefix, old_interfaces)
+    if iter(new_results) is new_results:
+        new_results = list(new_results)
 
-        # Comentarios informativos que acompañan a cada bloque de configuración
-        lines.append(f"! -------------------------------")
-        lines.append(f"! Subred: {name}")
-        lines.append(f"! Hosts solicitados: {subnet['hosts_solicitados']}")
-        lines.append(f"! Hosts disponibles: {subnet['hosts_encontrados']}")
-        lines.append(f"! -------------------------------")
+    summary = {"agregadas": 0, "modificadas": 0, "eliminadas": 0, "sin_cambios": 0,
+               "interfaces": []}
+    chunk = []
 
-        # Entramos a la configuración de la interfaz correspondiente
-        lines.append(f"interface {iface}")
+    def emit(section, text):
+        if section is not None:
+            write(section)
+        chunk.append(text)
+        if len(chunk) >= CHUNK_SUBNETS:
+            write("".join(chunk))
+            chunk.clear()
 
-        # Se asigna la descripción con el nombre de la subred
-        lines.append(f" description {name}")
+    def flush(end):
+        if chunk:
+            write("".join(chunk))
+            chunk.clear()
+        if end:
+            write("\n")
 
-        # Asignación de la IP y la máscara en Cisco IOS
-        lines.append(f" ip address {ip} {mask}")
+    write(header)
 
-        # Habilitar la interfaz (si está apagada)
-        lines.append(" no shutdown")
+    # Liberación: direcciones que cambian y subredes que desaparecen
+    section = "! --- Liberación de direcciones ---\n"
+    matched = set()
+    # Subredes sin pareja por red, en orden, para emparejar redimensionadas
+    unmatched = {}
+    for key, subnet in _subnet_keys(new_results):
+        old = previous.get(key)
+        if old is None:
+            unmatched.setdefault(key[0], []).append(
+                (key, subnet["direccionamiento_de_red"], subnet["mascara_decimal"]))
+            continue
+        matched.add(key)
+        if old[2:] != (subnet["direccionamiento_de_red"], subnet["mascara_decimal"]):
+            emit(section, f"interface {old[0]}\n no ip address\n exit\n")
+            section = None
+    resized = {}
+    for key, old in previous.items():
+        if key in matched:
+            continue
+        if unmatched.get(key[0]):
+            new_key, ip, mask = unmatched[key[0]].pop(0)
+            resized[new_key] = old
+            if old[2:] != (ip, mask):
+                emit(section, f"interface {old[0]}\n no ip address\n exit\n")
+                section = None
+        else:
+            summary["eliminadas"] += 1
+            emit(section,
+                 f"interface {old[0]}\n"
+                 " no description\n"
+                 " no ip address\n"
+                 " shutdown\n"
+                 " exit\n")
+            section = None
+    flush(section is None)
 
-        # Salimos del modo configuración de interfaz
+    # Asignación: las subredes nuevas usan interfaces libres del plan anterior
+    used = {old[0] for old in previous.values()}
+    fresh = (iface for iface in (f"{interface_prefix}{i}" for i in itertools.count())
+             if iface not in used)
+    section = "! --- Asignación de direcciones ---\n"
+    for i, (key, subnet) in enumerate(_subnet_keys(new_results)):
+        name = subnet.get("nombre_red") or f"SUBRED_{i}"
+        ip = subnet["direccionamiento_de_red"]
+        mask = subnet["mascara_decimal"]
+        old = previous.get(key) or resized.get(key)
+
+        if old is None:
+            # Interfaz nueva: configuración completa
+            iface = next(fresh)
+            summary["agregadas"] += 1
+            summary["interfaces"].append(iface)
+            emit(section,
+                 f"interface {iface}\n"
+                 f" description {name}\n"
+                 f" ip address {ip} {mask}\n"
+                 " no shutdown\n"
+                 " exit\n")
+            section = None
+            continue
+
+        iface = old[0]
+        summary["interfaces"].append(iface)
+        if old[1:] == (name, ip, mask):
+            summary["sin_cambios"] += 1
+            continue
+
+        summary["modificadas"] += 1
+        lines = [f"interface {iface}\n"]
+        if old[1] != name:
+            lines.append(f" description {name}\n")
+        if old[2:] != (ip, mask):
+            lines.append(f" ip address {ip} {mask}\n")
         lines.append(" exit\n")
+        emit(section, "".join(lines))
+        section = None
+    flush(section is None)
+
+    write(footer)
+    return summary
 
-    # Sección final del archivo
-    lines.append("! FIN DE CONFIGURACIÓN")
 
-    # Convertimos la lista en un string separado por saltos de línea
-    return "\n".join(lines)
\ No newline at end of file
+def generate_cisco_delta(old_results, new_results, interface_prefix="GigabitEthernet0/"):
+    """
+    Devuelve como string la configuración incremental entre dos planes VLSM.
+    """
+    buffer = io.StringIO()
+    write_cisco_delta(old_results, new_results, buffer, interface_prefix)
+    return buffer.getvalue()
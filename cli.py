@@ -0,0 +1,367 @@
+# cli.py
+
+"""
+Compilador por lotes sin interfaz gráfica.
+
+Compila uno o varios planes (archivos, directorios o patrones glob) con el
+mismo pipeline que la GUI (pipeline.compile_plan) repartiendo los archivos
+en un pool de procesos, y escribe los artefactos pedidos en
+<salida>/<nombre del plan>/.
+
+Los diagnósticos se emiten en stdout como JSON Lines, un objeto por línea:
+    {"tipo": "diagnostico", "archivo": ..., "fase": ..., "mensaje": ...}
+    {"tipo": "resultado", "archivo": ..., "ok": ..., "bloques": ...,
+     "subredes": ..., "artefactos": [...], "segundos": ...}
+
+Con --mem-profile el resultado incluye "memoria", el perfil por fase de
+memprofile.profile_plan(); con --mem-budget METRICA=TAMAÑO (p. ej.
+pico=2GB, bytes_por_token=200) el archivo falla si excede el presupuesto.
+
+Con --cache los planes compilados y sus artefactos de texto se guardan en
+la caché persistente de cache.py, por defecto en ~/.cache/compilador-vlsm
+(--cache-dir o $VLSM_CACHE_DIR eligen otro directorio y también la activan;
+--cache-size la limita); recompilar un plan sin cambios la lee en lugar de
+repetir las fases. Sin esas opciones no se escribe nada fuera de la salida,
+y --no-cache la desactiva aunque $VLSM_CACHE_DIR esté definida. El
+resultado indica con "cache" si el plan salió de la caché.
+
+Si la compilación de un archivo falla por una excepción (también dentro del
+pool), el archivo se reporta con un diagnóstico de fase "interno" y
+"ok": false, y los demás planes siguen compilándose.
+
+Un plan con directivas INCLUDE "archivo"; se compila como programa de
+varias unidades (units.py): cada archivo incluido se compila y guarda en la
+caché por separado y luego se enlaza; el resultado lista las unidades en
+"unidades".
+
+Con --trace ARCHIVO se guarda una traza en formato Chrome trace-event de
+todas las fases (y de cada bloque) y se imprime un resumen en stderr.
+
+Código de salida: 0 si todo compiló, 1 si hubo errores de compilación, de
+artefactos o de presupuesto de memoria, 2 si la invocación es inválida.
+
+Uso:
+    python cli.py planes/ --cisco --asm --format csv parquet -o salida -j 4
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from pipeline import compile_plan, plan_errors
+
+# Extensión de los planes al recorrer directorios
+PLAN_PATTERN = "*.vlsm"
+
+EXIT_OK = 0
+EXIT_ERRORS = 1
+EXIT_USAGE = 2
+
+
+def find_plans(inputs, pattern=PLAN_PATTERN):
+    """
+    Expande archivos, directorios y patrones glob a una lista ordenada de
+    rutas de planes, sin duplicados.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(glob.glob(os.path.join(item, "**", pattern), recursive=True))
+        elif glob.has_magic(item):
+            paths.extend(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        else:
+            paths.append(item)
+    return sorted(set(paths))
+
+
+def plan_name(path):
+    """Nombre del plan: el archivo sin extensión."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def compile_file(path, artifacts=(), out_root=None, mem_profile=False, mem_budgets=None,
+                 trace=False, cache_dir=None, cache_size=None, unit_jobs=1):
+    """
+    Compila un plan y escribe sus artefactos. Se ejecuta dentro del pool.
+
+    mem_profile: compila con memprofile.profile_plan() (incluye los back
+                 ends de texto pedidos) y agrega el reporte al resultado.
+    mem_budgets: presupuestos de memoria; implican mem_profile.
+    trace: traza la compilación; los eventos y contadores se regresan en
+           result["traza"] para combinarlos en el proceso principal.
+    cache_dir: directorio de la caché persistente (None: sin caché). El
+               perfil de memoria siempre compila sin caché.
+    cache_size: tamaño máximo de la caché, en bytes.
+    unit_jobs: procesos para compilar las unidades incluidas con INCLUDE.
+
+    Retorna (diagnosticos, resultado) con los diccionarios que se emiten
+    como JSON.
+    """
+    if trace:
+        import tracing
+        tracer = tracing.start_tracing()
+        try:
+            diagnostics, result = compile_file(path, artifacts, out_root, mem_profile, mem_budgets,
+                                               cache_dir=cache_dir, cache_size=cache_size,
+                                               unit_jobs=unit_jobs)
+        finally:
+            tracing.stop_tracing()
+        result["traza"] = {"eventos": tracer.events, "contadores": tracer.counters}
+        return diagnostics, result
+
+    start = time.perf_counter()
+    result = {"tipo": "resultado", "archivo": path, "ok": False, "bloques": 0,
+              "subredes": 0, "artefactos": [], "cache": False, "segundos": 0.0}
+    diagnostics = []
+
+    def diagnostic(phase, message):
+        diagnostics.append({"tipo": "diagnostico", "archivo": path,
+                            "fase": phase, "mensaje": message})
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        diagnostic("entrada", f"No se pudo leer el archivo: {e}")
+        result["segundos"] = time.perf_counter() - start
+        return diagnostics, result
+
+    texts = None
+    if mem_profile or mem_budgets:
+        from artifacts import TEXT_ARTIFACTS
+        from memprofile import MemoryBudgetExceeded, profile_plan
+        try:
+            plan, result["memoria"] = profile_plan(
+                code, [name for name in artifacts if name in TEXT_ARTIFACTS], mem_budgets,
+                link_includes=True
+            )
+        except MemoryBudgetExceeded as e:
+            diagnostic("memoria", f"Presupuesto de memoria excedido: {e}")
+            result["memoria"] = e.report
+            result["segundos"] = time.perf_counter() - start
+            return diagnostics, result
+    elif cache_dir:
+        from cache import PlanCache, compile_cached
+        cache = PlanCache(cache_dir, cache_size)
+        plan, texts, result["cache"] = compile_cached(code, artifacts, cache, link_includes=True)
+    else:
+        plan = compile_plan(code, link_includes=True)
+
+    if plan['includes']:
+        # El archivo incluye otros: se compilan sus unidades y se enlazan
+        from units import compile_program
+        root = os.path.normpath(path)
+        plan, units = compile_program(root, unit_jobs, cache_dir, cache_size, plans={root: plan})
+        units[root]["cache"] = result["cache"]
+        result["unidades"] = [{"archivo": unit["ruta"], "cache": unit["cache"]}
+                              for unit in units.values()]
+        texts = None
+    for phase, message in plan_errors(plan):
+        diagnostic(phase, message)
+    if not plan['blocks'] and not diagnostics:
+        diagnostic("sintactico", "El plan no contiene bloques.")
+
+    result["bloques"] = len(plan['blocks'])
+    result["subredes"] = len(plan['vlsm_results'] or [])
+    result["ok"] = plan['ok']
+
+    # Con errores de compilación no se genera ningún artefacto
+    if plan['ok'] and artifacts:
+        from artifacts import emit_artifacts
+        out_dir = os.path.join(out_root, plan_name(path))
+        for report in emit_artifacts(plan, artifacts, out_dir, texts=texts):
+            result["artefactos"].append({
+                "artefacto": report["artefacto"],
+                "archivo": report["archivo"],
+                "estado": report["estado"],
+            })
+            if report["estado"] == "error":
+                result["ok"] = False
+                diagnostic("artefactos", f"{report['artefacto']}: {report['error']}")
+
+    result["segundos"] = time.perf_counter() - start
+    return diagnostics, result
+
+
+def failed_file(path, error):
+    """
+    (diagnosticos, resultado) de un archivo cuya compilación lanzó una
+    excepción, con la misma forma que los de compile_file().
+    """
+    diagnostics = [{"tipo": "diagnostico", "archivo": path, "fase": "interno",
+                    "mensaje": f"Error interno al compilar: {type(error).__name__}: {error}"}]
+    result = {"tipo": "resultado", "archivo": path, "ok": False, "bloques": 0,
+              "subredes": 0, "artefactos": [], "cache": False, "segundos": 0.0}
+    return diagnostics, result
+
+
+def _emit(record, out):
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def run(paths, artifacts=(), out_root="salida", jobs=None, out=None,
+        mem_profile=False, mem_budgets=None, tracer=None, cache_dir=None, cache_size=None):
+    """
+    Compila todos los planes y emite los diagnósticos conforme terminan.
+    Si se pasa tracer (tracing.Tracer), cada archivo se traza y sus eventos
+    se combinan en él. cache_dir y cache_size van a compile_file().
+    Una excepción al compilar un archivo se reporta como resultado fallido
+    de ese archivo (failed_file()).
+    Retorna la lista de resultados (en orden de terminación).
+    """
+    out = out or sys.stdout
+    results = []
+    options = (artifacts, out_root, mem_profile, mem_budgets, tracer is not None,
+               cache_dir, cache_size)
+
+    def report(diagnostics, result):
+        trace = result.pop("traza", None)
+        if trace is not None:
+            tracer.merge(trace["eventos"], trace["contadores"])
+        for record in diagnostics:
+            _emit(record, out)
+        _emit(result, out)
+        results.append(result)
+
+    if jobs == 1 or len(paths) == 1:
+        # Sin pool: evita el costo de arrancar procesos en lotes pequeños;
+        # las unidades incluidas sí pueden repartirse en procesos
+        for path in paths:
+            try:
+                outcome = compile_file(path, *options, unit_jobs=jobs)
+            except Exception as e:
+                outcome = failed_file(path, e)
+            report(*outcome)
+        return results
+
+    # concurrent.futures carga multiprocessing; solo se importa si hay pool
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(compile_file, path, *options): path for path in paths}
+        for future in as_completed(futures):
+            # Un trabajador que falla (o un pool roto) no detiene el lote
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = failed_file(futures[future], e)
+            report(*outcome)
+    return results
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Compilador VLSM por lotes (sin interfaz gráfica).",
+        epilog="Los diagnósticos se escriben en stdout como JSON Lines.",
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="archivos de plan, directorios o patrones glob")
+    parser.add_argument("-o", "--output", default="salida",
+                        help="directorio raíz de los artefactos (default: salida)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="procesos del pool (default: número de CPUs)")
+    parser.add_argument("--pattern", default=PLAN_PATTERN,
+                        help=f"patrón de archivos al recorrer directorios (default: {PLAN_PATTERN})")
+    parser.add_argument("--cisco", action="store_true", help="configuración Cisco IOS")
+    parser.add_argument("--asm", action="store_true", help="código ensamblador 8086")
+    parser.add_argument("--asm-packed", action="store_true", help="ensamblador con tabla empaquetada")
+    parser.add_argument("--ir", action="store_true", help="código intermedio optimizado")
+    parser.add_argument("--format", nargs="+", default=[], metavar="FORMATO",
+                        choices=["csv", "jsonl", "arrow", "parquet", "xlsx"],
+                        help="formatos tabulares: csv, jsonl, arrow, parquet, xlsx")
+    parser.add_argument("--mem-profile", action="store_true",
+                        help="mide la memoria de cada fase con tracemalloc")
+    parser.add_argument("--mem-budget", action="append", default=[], metavar="METRICA=TAMAÑO",
+                        help="presupuesto de memoria, p. ej. pico=2GB o pico_vlsm=500MB (repetible)")
+    parser.add_argument("--trace", metavar="ARCHIVO",
+                        help="guarda una traza Chrome trace-event (JSON) de la compilación")
+    parser.add_argument("--cache", action="store_true",
+                        help="usa la caché persistente de planes compilados "
+                             "(en $VLSM_CACHE_DIR o ~/.cache/compilador-vlsm)")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                        help="directorio de la caché de planes compilados; implica --cache")
+    parser.add_argument("--cache-size", default="512MB", metavar="TAMAÑO",
+                        help="tamaño máximo de la caché (default: 512MB)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="compila sin la caché persistente aunque $VLSM_CACHE_DIR esté definida")
+    return parser
+
+
+def parse_budgets(specs):
+    """Convierte ["pico=2GB", ...] al diccionario de presupuestos de memprofile."""
+    from memprofile import parse_size
+    budgets = {}
+    for spec in specs:
+        metric, sep, size = spec.partition("=")
+        if not sep or not metric.strip():
+            raise ValueError(f"Presupuesto inválido: {spec} (se esperaba METRICA=TAMAÑO)")
+        budgets[metric.strip()] = parse_size(size)
+    return budgets
+
+
+def selected_artifacts(args):
+    """Artefactos pedidos con las banderas, en el orden de artifacts.py."""
+    artifacts = [name for name, flag in (("cisco", args.cisco), ("asm", args.asm),
+                                         ("asm_packed", args.asm_packed), ("ir", args.ir))
+                 if flag]
+    return artifacts + list(dict.fromkeys(args.format))
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs debe ser al menos 1")
+
+    try:
+        mem_budgets = parse_budgets(args.mem_budget)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # La caché persistente es opcional: solo con --cache, --cache-dir o $VLSM_CACHE_DIR
+    from cache import CACHE_ENV, DEFAULT_CACHE_DIR
+    cache_dir = cache_size = None
+    if not args.no_cache and (args.cache or args.cache_dir or os.environ.get(CACHE_ENV)):
+        from memprofile import parse_size
+        cache_dir = args.cache_dir or os.environ.get(CACHE_ENV) or DEFAULT_CACHE_DIR
+        try:
+            cache_size = parse_size(args.cache_size)
+        except ValueError as e:
+            parser.error(str(e))
+
+    paths = find_plans(args.inputs, args.pattern)
+    if not paths:
+        print("No se encontraron planes para compilar.", file=sys.stderr)
+        return EXIT_USAGE
+
+    artifacts = selected_artifacts(args)
+    if artifacts:
+        # Cada plan escribe en <salida>/<nombre>; dos planes no pueden compartirlo
+        names = {}
+        for path in paths:
+            other = names.setdefault(plan_name(path), path)
+            if other != path:
+                print(f"Los planes {other} y {path} escribirían en el mismo directorio.",
+                      file=sys.stderr)
+                return EXIT_USAGE
+
+    tracer = None
+    if args.trace:
+        import tracing
+        tracer = tracing.Tracer()
+
+    results = run(paths, artifacts, args.output, args.jobs,
+                  mem_profile=args.mem_profile, mem_budgets=mem_budgets, tracer=tracer,
+                  cache_dir=cache_dir, cache_size=cache_size)
+
+    if tracer is not None:
+        tracer.write_chrome_trace(args.trace)
+        print(tracer.summary(), file=sys.stderr)
+    return EXIT_OK if all(result["ok"] for result in results) else EXIT_ERRORS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
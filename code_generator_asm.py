@@ -1,5 +1,6 @@
 # code_generator_asm.py
-from vlsm_calc import calculate_vlsm
+from vlsm_calc import calculate_vlsm, ipaddress_module
+import tracing
 
 class ASMCodeGenerator:
     """
@@ -15,6 +16,7 @@ class ASMCodeGenerator:
         self.hosts_list = []
         self.global_subinterface_counter = 1
         
+    @tracing.traced("asm.generate")
     def generate(self):
         """
         Procesa las instrucciones IR y genera código ensamblador 8086.
@@ -199,6 +201,355 @@ class ASMCodeGenerator:
         self.output.append("")
         self.output.append("RET")
 
+class PackedASMCodeGenerator(ASMCodeGenerator):
+    """
+    Variante del generador 8086 que no guarda el texto de la configuración.
+    La sección de datos solo contiene una tabla empaquetada con la dirección
+    de red (32 bits), el prefijo y el nombre de cada bloque; las rutinas en
+    ensamblador calculan la máscara, la primera IP utilizable y el formato
+    decimal con puntos en tiempo de ejecución.
+
+    El archivo ROUTER.CFG resultante es idéntico al de ASMCodeGenerator.
+    """
+    # Tipos de registro de la tabla
+    REG_FIN = 0
+    REG_TEXTO = 1
+    REG_BLOQUE = 2
+    REG_SUBRED = 3
+    REG_CIERRE = 4
+
+    INTERFACE_BASE = "GigabitEthernet0/0"
+
+    def _generate_subnet_config(self):
+        """Genera los registros empaquetados de las subredes de un bloque."""
+        try:
+            vlsm_results = calculate_vlsm(
+                self.base_ip,
+                self.base_mask,
+                self.hosts_list,
+                self.current_block
+            )
+        except Exception as e:
+            return [f"! Error: {e}"]
+
+        ipaddress = ipaddress_module()
+        records = [(self.REG_BLOQUE, str(self.current_block))]
+        for subnet in vlsm_results:
+            network = int(ipaddress.IPv4Address(subnet['direccionamiento_de_red']))
+            prefix = int(subnet['nueva_mascara'].lstrip('/'))
+            records.append((self.REG_SUBRED, network, prefix))
+        records.append((self.REG_CIERRE,))
+        return records
+
+    def _db_string(self, record_type, text):
+        """Devuelve las líneas DB de un registro con cadena terminada en 0."""
+        escaped = self._escape_string(text)
+        if not escaped:
+            return [f"    DB {record_type}, 0"]
+        chunks = [escaped[j:j+70] for j in range(0, len(escaped), 70)]
+        lines = [f"    DB {record_type}, '{chunks[0]}'"]
+        for chunk in chunks[1:]:
+            lines.append(f"    DB '{chunk}'")
+        lines.append("    DB 0")
+        return lines
+
+    def _build_asm_program(self, config_lines):
+        """Construye el programa 8086 con la tabla empaquetada y sus rutinas."""
+        out = self.output
+        iface = self.INTERFACE_BASE
+
+        out.append("; ========================================")
+        out.append("; Generador de Configuracion de Router")
+        out.append("; Compilador VLSM - Codigo Ensamblador 8086")
+        out.append("; Version con tabla empaquetada de subredes")
+        out.append("; ========================================")
+        out.append("; INSTRUCCIONES:")
+        out.append("; 1. Compilar con EMU8086 (F5)")
+        out.append("; 2. Ejecutar en modo Emulador (F6)")
+        out.append("; 3. Presionar RUN (F9)")
+        out.append("; 4. El archivo router_config.cfg se creara")
+        out.append("; ========================================")
+        out.append("")
+        out.append("ORG 100h              ; Programa .COM")
+        out.append("")
+        out.append("; Saltar la seccion de datos")
+        out.append("JMP inicio")
+        out.append("")
+        out.append("; === SECCION DE DATOS ===")
+        out.append("")
+        out.append("; Mensajes del sistema")
+        out.append("msg_inicio DB 'Generando configuracion del router...', 0Dh, 0Ah, '$'")
+        out.append("msg_exito DB 'Configuracion generada exitosamente!', 0Dh, 0Ah")
+        out.append("          DB 'Archivo: ROUTER.CFG', 0Dh, 0Ah, '$'")
+        out.append("msg_error DB 'Error al crear archivo', 0Dh, 0Ah, '$'")
+        out.append("nombre_archivo DB 'ROUTER.CFG', 0")
+        out.append("handle DW ?")
+        out.append("")
+        out.append("; Variables de trabajo")
+        out.append("ptr_tabla DW ?          ; Registro actual de la tabla")
+        out.append("nombre_bloque DW ?      ; Nombre del bloque actual")
+        out.append("contador_sub DW 1       ; Indice de subred dentro del bloque")
+        out.append("contador_vlan DW 1      ; Contador global de subinterfaces")
+        out.append("red_baja DW ?           ; Direccion de red (16 bits bajos)")
+        out.append("red_alta DW ?           ; Direccion de red (16 bits altos)")
+        out.append("prefijo DB ?            ; Longitud del prefijo")
+        out.append("ip_tmp DW 0, 0          ; IP que se esta formateando")
+        out.append("buffer_num DB 20 DUP(?) ; Digitos de numeros e IPs")
+        out.append("")
+        out.append("; Fragmentos de texto fijos")
+        out.append("crlf DB 0Dh, 0Ah, 0")
+        out.append(f"txt_sub1 DB '!', 0Dh, 0Ah, 'interface {iface}.', 0")
+        out.append("txt_sub2 DB 0Dh, 0Ah, ' description ', 0")
+        out.append("txt_sub3 DB '_sub', 0")
+        out.append("txt_sub4 DB 0Dh, 0Ah, ' encapsulation dot1Q ', 0")
+        out.append("txt_sub5 DB 0Dh, 0Ah, ' ip address ', 0")
+        out.append("txt_espacio DB ' ', 0")
+        out.append("txt_sub6 DB 0Dh, 0Ah, ' no shutdown', 0Dh, 0Ah, 'exit', 0Dh, 0Ah, 0")
+        out.append(f"txt_cierre DB '!', 0Dh, 0Ah, 'interface {iface}', 0Dh, 0Ah")
+        out.append("           DB ' no shutdown', 0Dh, 0Ah, 'exit', 0Dh, 0Ah, 0")
+        out.append("")
+        out.append("; Tabla de configuracion")
+        out.append(f";   {self.REG_TEXTO} = linea de texto (terminada en 0)")
+        out.append(f";   {self.REG_BLOQUE} = inicio de bloque (nombre terminado en 0)")
+        out.append(f";   {self.REG_SUBRED} = subred (red de 32 bits little-endian, prefijo)")
+        out.append(f";   {self.REG_CIERRE} = cierre de la interfaz principal")
+        out.append(f";   {self.REG_FIN} = fin de tabla")
+        out.append("tabla_config:")
+
+        for record in config_lines:
+            if isinstance(record, str):
+                out.extend(self._db_string(self.REG_TEXTO, record))
+            elif record[0] == self.REG_BLOQUE:
+                out.extend(self._db_string(self.REG_BLOQUE, record[1]))
+            elif record[0] == self.REG_SUBRED:
+                network_bytes = ", ".join(str(b) for b in record[1].to_bytes(4, "little"))
+                out.append(f"    DB {self.REG_SUBRED}, {network_bytes}, {record[2]}")
+            else:
+                out.append(f"    DB {self.REG_CIERRE}")
+        out.append(f"    DB {self.REG_FIN}")
+
+        out.append("")
+        out.append("; === SECCION DE CODIGO ===")
+        out.append("")
+        out.append("inicio:")
+        out.append("    ; Mostrar mensaje inicial")
+        out.append("    MOV DX, OFFSET msg_inicio")
+        out.append("    MOV AH, 09h")
+        out.append("    INT 21h")
+        out.append("")
+        out.append("    ; Crear archivo ROUTER.CFG")
+        out.append("    MOV AH, 3Ch          ; Funcion crear archivo")
+        out.append("    MOV CX, 0            ; Atributos normales")
+        out.append("    MOV DX, OFFSET nombre_archivo")
+        out.append("    INT 21h")
+        out.append("    JC error_archivo     ; Si CF=1, hubo error")
+        out.append("    MOV handle, AX       ; Guardar handle")
+        out.append("")
+        out.append("    ; Recorrer la tabla de configuracion")
+        out.append("    CLD")
+        out.append("    MOV SI, OFFSET tabla_config")
+        out.append("siguiente_registro:")
+        out.append("    LODSB")
+        out.append(f"    CMP AL, {self.REG_TEXTO}")
+        out.append("    JNE no_texto")
+        out.append("    CALL escribir_cadena")
+        out.append("    CALL escribir_crlf")
+        out.append("    JMP siguiente_registro")
+        out.append("no_texto:")
+        out.append(f"    CMP AL, {self.REG_BLOQUE}")
+        out.append("    JNE no_bloque")
+        out.append("    MOV nombre_bloque, SI")
+        out.append("    CALL saltar_cadena")
+        out.append("    MOV contador_sub, 1")
+        out.append("    JMP siguiente_registro")
+        out.append("no_bloque:")
+        out.append(f"    CMP AL, {self.REG_SUBRED}")
+        out.append("    JNE no_subred")
+        out.append("    CALL escribir_subred")
+        out.append("    JMP siguiente_registro")
+        out.append("no_subred:")
+        out.append(f"    CMP AL, {self.REG_CIERRE}")
+        out.append("    JNE fin_tabla")
+        out.append("    MOV ptr_tabla, SI")
+        out.append("    MOV SI, OFFSET txt_cierre")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV SI, ptr_tabla")
+        out.append("    JMP siguiente_registro")
+        out.append("")
+        out.append("fin_tabla:")
+        out.append("    ; Cerrar archivo")
+        out.append("    MOV AH, 3Eh")
+        out.append("    MOV BX, handle")
+        out.append("    INT 21h")
+        out.append("")
+        out.append("    ; Mostrar mensaje de exito")
+        out.append("    MOV DX, OFFSET msg_exito")
+        out.append("    MOV AH, 09h")
+        out.append("    INT 21h")
+        out.append("    JMP fin")
+        out.append("")
+        out.append("error_archivo:")
+        out.append("    MOV DX, OFFSET msg_error")
+        out.append("    MOV AH, 09h")
+        out.append("    INT 21h")
+        out.append("")
+        out.append("fin:")
+        out.append("    ; Terminar programa")
+        out.append("    MOV AH, 4Ch")
+        out.append("    INT 21h")
+        out.append("")
+        out.append("; === RUTINAS ===")
+        out.append("")
+        out.append("; Escribe una subred: SI apunta a la red (4 bytes) y al prefijo")
+        out.append("escribir_subred:")
+        out.append("    LODSW")
+        out.append("    MOV red_baja, AX")
+        out.append("    LODSW")
+        out.append("    MOV red_alta, AX")
+        out.append("    LODSB")
+        out.append("    MOV prefijo, AL")
+        out.append("    MOV ptr_tabla, SI")
+        out.append("    MOV SI, OFFSET txt_sub1")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV AX, contador_vlan")
+        out.append("    CALL escribir_decimal")
+        out.append("    MOV SI, OFFSET txt_sub2")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV SI, nombre_bloque")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV SI, OFFSET txt_sub3")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV AX, contador_sub")
+        out.append("    CALL escribir_decimal")
+        out.append("    MOV SI, OFFSET txt_sub4")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV AX, contador_vlan")
+        out.append("    CALL escribir_decimal")
+        out.append("    MOV SI, OFFSET txt_sub5")
+        out.append("    CALL escribir_cadena")
+        out.append("    ; Primera IP utilizable = red + 1 (suma de 32 bits)")
+        out.append("    MOV AX, red_baja")
+        out.append("    MOV DX, red_alta")
+        out.append("    ADD AX, 1")
+        out.append("    ADC DX, 0")
+        out.append("    CALL escribir_ip")
+        out.append("    MOV SI, OFFSET txt_espacio")
+        out.append("    CALL escribir_cadena")
+        out.append("    MOV CL, prefijo")
+        out.append("    CALL calcular_mascara")
+        out.append("    CALL escribir_ip")
+        out.append("    MOV SI, OFFSET txt_sub6")
+        out.append("    CALL escribir_cadena")
+        out.append("    INC contador_vlan")
+        out.append("    INC contador_sub")
+        out.append("    MOV SI, ptr_tabla")
+        out.append("    RET")
+        out.append("")
+        out.append("; Mascara de CL bits en DX:AX (un bit 1 por iteracion)")
+        out.append("calcular_mascara:")
+        out.append("    XOR AX, AX")
+        out.append("    XOR DX, DX")
+        out.append("    XOR CH, CH")
+        out.append("    JCXZ cm_fin")
+        out.append("cm_bucle:")
+        out.append("    STC")
+        out.append("    RCR DX, 1")
+        out.append("    RCR AX, 1")
+        out.append("    LOOP cm_bucle")
+        out.append("cm_fin:")
+        out.append("    RET")
+        out.append("")
+        out.append("; Escribe DX:AX en formato decimal con puntos")
+        out.append("escribir_ip:")
+        out.append("    MOV ip_tmp, AX")
+        out.append("    MOV ip_tmp+2, DX")
+        out.append("    MOV DI, OFFSET buffer_num")
+        out.append("    MOV AL, BYTE PTR ip_tmp+3")
+        out.append("    CALL poner_octeto")
+        out.append("    MOV AL, BYTE PTR ip_tmp+2")
+        out.append("    CALL poner_octeto")
+        out.append("    MOV AL, BYTE PTR ip_tmp+1")
+        out.append("    CALL poner_octeto")
+        out.append("    MOV AL, BYTE PTR ip_tmp")
+        out.append("    CALL poner_octeto")
+        out.append("    DEC DI               ; Quitar el ultimo punto")
+        out.append("    JMP escribir_buffer")
+        out.append("")
+        out.append("; Agrega el octeto AL y un punto en DI")
+        out.append("poner_octeto:")
+        out.append("    XOR AH, AH")
+        out.append("    CALL poner_decimal")
+        out.append("    MOV BYTE PTR [DI], '.'")
+        out.append("    INC DI")
+        out.append("    RET")
+        out.append("")
+        out.append("; Escribe AX en decimal")
+        out.append("escribir_decimal:")
+        out.append("    MOV DI, OFFSET buffer_num")
+        out.append("    CALL poner_decimal")
+        out.append("    JMP escribir_buffer")
+        out.append("")
+        out.append("; Agrega los digitos decimales de AX en DI")
+        out.append("poner_decimal:")
+        out.append("    MOV BX, 10")
+        out.append("    XOR CX, CX")
+        out.append("pd_dividir:")
+        out.append("    XOR DX, DX")
+        out.append("    DIV BX")
+        out.append("    PUSH DX")
+        out.append("    INC CX")
+        out.append("    CMP AX, 0")
+        out.append("    JNE pd_dividir")
+        out.append("pd_sacar:")
+        out.append("    POP DX")
+        out.append("    ADD DL, '0'")
+        out.append("    MOV [DI], DL")
+        out.append("    INC DI")
+        out.append("    LOOP pd_sacar")
+        out.append("    RET")
+        out.append("")
+        out.append("; Escribe buffer_num hasta DI")
+        out.append("escribir_buffer:")
+        out.append("    MOV DX, OFFSET buffer_num")
+        out.append("    MOV CX, DI")
+        out.append("    SUB CX, DX")
+        out.append("    JMP escribir_bytes")
+        out.append("")
+        out.append("; Escribe 0Dh, 0Ah")
+        out.append("escribir_crlf:")
+        out.append("    MOV DX, OFFSET crlf")
+        out.append("    MOV CX, 2")
+        out.append("    JMP escribir_bytes")
+        out.append("")
+        out.append("; Escribe la cadena terminada en 0 de SI y deja SI despues del 0")
+        out.append("escribir_cadena:")
+        out.append("    MOV DX, SI")
+        out.append("    CALL saltar_cadena")
+        out.append("    MOV CX, SI")
+        out.append("    SUB CX, DX")
+        out.append("    DEC CX               ; Sin contar el 0")
+        out.append("    ; Continua en escribir_bytes")
+        out.append("")
+        out.append("; Escribe CX bytes desde DX (CX=0 truncaria el archivo)")
+        out.append("escribir_bytes:")
+        out.append("    JCXZ eb_fin")
+        out.append("    MOV AH, 40h")
+        out.append("    MOV BX, handle")
+        out.append("    INT 21h")
+        out.append("    JNC eb_fin")
+        out.append("    JMP error_archivo")
+        out.append("eb_fin:")
+        out.append("    RET")
+        out.append("")
+        out.append("; Avanza SI hasta despues del 0 final de la cadena")
+        out.append("saltar_cadena:")
+        out.append("    LODSB")
+        out.append("    CMP AL, 0")
+        out.append("    JNE saltar_cadena")
+        out.append("    RET")
+        out.append("")
+        out.append("RET")
+
 def generate_asm_code(ir_instructions):
     """
     Genera código ensamblador 8086 desde IR.
@@ -206,6 +557,13 @@ def generate_asm_code(ir_instructions):
     generator = ASMCodeGenerator(ir_instructions)
     return generator.generate()
 
+def generate_packed_asm_code(ir_instructions):
+    """
+    Genera código ensamblador 8086 con tabla empaquetada de subredes desde IR.
+    """
+    generator = PackedASMCodeGenerator(ir_instructions)
+    return generator.generate()
+
 def save_asm_to_file(code, filename="router_config.asm"):
     """
     Guarda el código ensamblador en un archivo .asm
@@ -0,0 +1,497 @@
+# daemon.py
+
+"""
+Servidor local de compilación con cachés calientes.
+
+CompileServer escucha en un socket Unix o en un puerto TCP de localhost y
+compila planes en un pool de procesos (o hilos) que vive lo mismo que el
+servidor: los módulos ya están importados, los patrones del lexer compilados
+y cada trabajador conserva un LRU de resultados VLSM por bloque. El servidor
+además guarda en un LRU las respuestas de planes ya compilados (por hash del
+texto y de los artefactos pedidos) y agrupa solicitudes idénticas en curso.
+Con cache_dir los trabajadores usan también la caché persistente de
+cache.py, que se comparte con cli.py y sobrevive a los reinicios.
+
+Protocolo: JSON Lines, una solicitud por línea y una respuesta por línea con
+el mismo "id". Una conexión puede enviar varias solicitudes sin esperar; las
+respuestas llegan conforme terminan.
+
+    {"id": 1, "op": "compilar", "codigo": "IP ...;", "artefactos": ["cisco", "asm"]}
+    {"id": 2, "op": "compilar", "codigo": "...", "artefactos": ["csv"], "salida": "/ruta"}
+    {"id": 3, "op": "metricas"}
+    {"id": 4, "op": "ping"}
+
+Sin "salida", los artefactos de texto (cisco, asm, asm_packed, ir) se
+regresan en la respuesta; con "salida" se escriben con
+artifacts.emit_artifacts() (se admiten también los tabulares) y se regresan
+los reportes. "salida" solo se acepta si el servidor arrancó con
+--output-root, y debe quedar dentro de ese directorio (relativa a él o
+absoluta) después de resolver enlaces simbólicos: cualquier proceso local
+puede conectarse al servidor. Los errores de la solicitud (incluida una
+línea más larga que MAX_LINE_BYTES) se responden con {"error": ...}.
+El servidor recibe solo texto, sin ruta, así que un plan con INCLUDE se
+compila con un diagnóstico de enlace y sin artefactos.
+
+Uso:
+    python daemon.py serve --socket /tmp/vlsm.sock --workers 4 --output-root ~/planes/salida
+    python daemon.py compile plan.vlsm --socket /tmp/vlsm.sock --artifacts cisco asm
+    python daemon.py metrics --socket /tmp/vlsm.sock
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+from pipeline import plan_errors
+
+# Tamaño máximo de una línea del protocolo (un plan completo cabe en una)
+MAX_LINE_BYTES = 64 << 20
+
+# Latencias recientes que se usan para los percentiles de las métricas
+LATENCY_WINDOW = 4096
+
+# Plan pequeño que cada trabajador compila al arrancar
+WARMUP_PLAN = "IP 192.168.0.0 MASK /24 HOSTS 50,20,10 NAME Calentamiento;"
+
+
+class LRUCache:
+    """
+    Caché LRU acotada por número de entradas, segura entre hilos.
+    Expone get() y asignación por clave, como espera calculate_plan_vlsm().
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ---- lado del trabajador ----
+
+# Cachés del proceso de trabajo (se crean en _init_worker)
+_worker_vlsm_cache = None
+_worker_plan_cache = None
+
+
+def _init_worker(vlsm_cache_size, cache_dir=None, cache_size=None):
+    global _worker_vlsm_cache, _worker_plan_cache
+    _worker_vlsm_cache = LRUCache(vlsm_cache_size)
+    compile_job(WARMUP_PLAN, ("cisco", "asm"))
+    if cache_dir:
+        from cache import PlanCache
+        _worker_plan_cache = PlanCache(cache_dir, cache_size)
+
+
+def compile_job(code, artifacts=(), out_dir=None):
+    """
+    Compila un plan dentro del pool y regresa la respuesta (sin "id").
+    Con errores de compilación no se genera ningún artefacto.
+    """
+    from artifacts import emit_artifacts
+    from cache import compile_cached
+
+    start = time.perf_counter()
+    plan, texts, hit = compile_cached(code, artifacts, _worker_plan_cache, _worker_vlsm_cache)
+    response = {
+        "ok": plan['ok'],
+        "diagnosticos": [{"fase": phase, "mensaje": message} for phase, message in plan_errors(plan)],
+        "bloques": len(plan['blocks']),
+        "subredes": len(plan['vlsm_results'] or []),
+        "artefactos": {},
+        "cache_disco": hit,
+    }
+
+    if plan['ok'] and artifacts:
+        if out_dir:
+            for report in emit_artifacts(plan, artifacts, out_dir, texts=texts):
+                response["artefactos"][report["artefacto"]] = {
+                    "archivo": report["archivo"],
+                    "estado": report["estado"],
+                    "error": report["error"],
+                }
+                if report["estado"] == "error":
+                    response["ok"] = False
+        else:
+            response["artefactos"] = texts
+
+    response["segundos"] = time.perf_counter() - start
+    return response
+
+
+# ---- servidor ----
+
+class ServerMetrics:
+    """Contadores y latencias del servidor."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.completed = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency, error=False):
+        self.completed += 1
+        if error:
+            self.errors += 1
+        self.latencies.append(latency)
+
+    def snapshot(self):
+        uptime = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+        return {
+            "uptime_s": uptime,
+            "solicitudes": self.requests,
+            "completadas": self.completed,
+            "errores": self.errors,
+            "en_curso": self.in_flight,
+            "aciertos_cache": self.cache_hits,
+            "fallos_cache": self.cache_misses,
+            "agrupadas": self.coalesced,
+            "rendimiento_rps": self.completed / uptime if uptime else 0.0,
+            "latencia_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else None,
+            },
+        }
+
+
+class CompileServer:
+    """
+    Servidor asyncio de compilación.
+
+    workers: tamaño del pool (default: número de CPUs).
+    use_processes: pool de procesos (default) o de hilos.
+    plan_cache_size: respuestas de planes que se conservan en el servidor.
+    vlsm_cache_size: bloques VLSM memorizados por trabajador.
+    cache_dir, cache_size: caché persistente de cache.py (None: sin ella).
+    output_root: único directorio donde las solicitudes con "salida" pueden
+                 escribir (None: "salida" no se acepta).
+    """
+
+    def __init__(self, workers=None, use_processes=True, plan_cache_size=256, vlsm_cache_size=65536,
+                 cache_dir=None, cache_size=None, output_root=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.vlsm_cache_size = vlsm_cache_size
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.output_root = os.path.realpath(output_root) if output_root else None
+        self.plans = LRUCache(plan_cache_size)
+        self.inflight = {}
+        self.metrics = ServerMetrics()
+        self.executor = None
+        self.server = None
+        self.socket_path = None
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Arranca el pool y el servidor; con path usa un socket Unix.
+        Retorna la dirección (ruta del socket o (host, puerto)).
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        self.executor = pool_class(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.vlsm_cache_size, self.cache_dir, self.cache_size))
+        # Arranca los trabajadores antes de aceptar conexiones
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, compile_job, WARMUP_PLAN)
+                               for _ in range(self.workers)))
+
+        if path:
+            if os.path.exists(path):
+                os.remove(path)
+            self.server = await asyncio.start_unix_server(self._handle, path=path, limit=MAX_LINE_BYTES)
+            self.socket_path = path
+            return path
+        self.server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_BYTES)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    async def _handle(self, reader, writer):
+        """Atiende una conexión; cada solicitud se resuelve en su propia tarea."""
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Línea más larga que el límite: se responde y se cierra,
+                    # porque el resto de la línea ya no se puede separar
+                    self.metrics.requests += 1
+                    self.metrics.record(0.0, True)
+                    await self._send(writer, lock, {
+                        "error": f"Solicitud de más de {MAX_LINE_BYTES} bytes.", "id": None
+                    })
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            # Conexión cerrada por el cliente
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, lock, response):
+        """Escribe una respuesta JSON Lines en la conexión."""
+        data = (json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8")
+        async with lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def _respond(self, line, writer, lock):
+        start = time.perf_counter()
+        self.metrics.requests += 1
+        self.metrics.in_flight += 1
+        request_id = None
+        error = False
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("La solicitud debe ser un objeto JSON.")
+            request_id = request.get("id")
+            response = await self.dispatch(request)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+            error = True
+        finally:
+            self.metrics.in_flight -= 1
+        self.metrics.record(time.perf_counter() - start, error)
+
+        await self._send(writer, lock, dict(response, id=request_id))
+
+    async def dispatch(self, request):
+        op = request.get("op", "compilar")
+        if op == "ping":
+            return {"ok": True}
+        if op == "metricas":
+            snapshot = self.metrics.snapshot()
+            snapshot["planes_en_cache"] = len(self.plans)
+            return snapshot
+        if op == "compilar":
+            if not isinstance(request.get("codigo"), str):
+                raise ValueError('Falta "codigo" (texto del plan).')
+            out_dir = request.get("salida")
+            if out_dir is not None:
+                out_dir = self.output_dir(out_dir)
+            return await self.compile(request["codigo"], request.get("artefactos", []), out_dir)
+        raise ValueError(f"Operación desconocida: {op}")
+
+    def output_dir(self, out_dir):
+        """
+        Ruta real de "salida" dentro de output_root.
+        Lanza ValueError si no hay output_root o si la ruta sale de él.
+        """
+        if self.output_root is None:
+            raise ValueError('"salida" no está habilitada; arranca el servidor con --output-root.')
+        if not isinstance(out_dir, str) or not out_dir:
+            raise ValueError('"salida" debe ser una ruta.')
+        real = os.path.realpath(os.path.join(self.output_root, out_dir))
+        if os.path.commonpath([real, self.output_root]) != self.output_root:
+            raise ValueError(f'"salida" debe estar dentro de {self.output_root}.')
+        return real
+
+    async def compile(self, code, artifacts=(), out_dir=None):
+        """Compila un plan usando la caché de planes y el pool."""
+        from artifacts import TABLE_ARTIFACTS, TEXT_ARTIFACTS
+
+        artifacts = tuple(dict.fromkeys(artifacts))
+        allowed = set(TEXT_ARTIFACTS) | (set(TABLE_ARTIFACTS) if out_dir else set())
+        unknown = [name for name in artifacts if name not in allowed]
+        if unknown:
+            raise ValueError(f"Artefactos no soportados: {', '.join(unknown)}")
+
+        loop = asyncio.get_running_loop()
+        if out_dir:
+            # Escribe archivos: no se guarda en caché (emit_artifacts ya omite
+            # los archivos sin cambios)
+            return await loop.run_in_executor(self.executor, compile_job, code, artifacts, out_dir)
+
+        digest = hashlib.sha256(code.encode("utf-8"))
+        digest.update("\0".join(artifacts).encode("utf-8"))
+        key = digest.hexdigest()
+
+        cached = self.plans.get(key)
+        if cached is not None:
+            self.metrics.cache_hits += 1
+            return dict(cached, cache=True)
+        self.metrics.cache_misses += 1
+
+        # Solicitudes idénticas en curso comparten una sola compilación
+        future = self.inflight.get(key)
+        if future is not None:
+            self.metrics.coalesced += 1
+            return dict(await asyncio.shield(future), cache=True)
+
+        future = loop.run_in_executor(self.executor, compile_job, code, artifacts, None)
+        self.inflight[key] = future
+        try:
+            response = await future
+        finally:
+            del self.inflight[key]
+        self.plans[key] = response
+        return dict(response, cache=False)
+
+
+# ---- cliente ----
+
+def request(payload, path=None, host="127.0.0.1", port=None, timeout=60.0):
+    """Envía una solicitud al servidor y regresa la respuesta (cliente síncrono)."""
+    import socket
+
+    if path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(path)
+    else:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    with sock:
+        sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        chunks = []
+        while True:
+            chunk = sock.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    return json.loads(b"".join(chunks))
+
+
+async def serve(path=None, host="127.0.0.1", port=0, **options):
+    """Arranca un CompileServer y atiende hasta recibir SIGINT/SIGTERM."""
+    import signal
+
+    server = CompileServer(**options)
+    address = await server.start(path, host, port)
+    print(f"Servidor de compilación escuchando en {address}", file=sys.stderr)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    serving = asyncio.ensure_future(server.serve_forever())
+    try:
+        await stop.wait()
+    finally:
+        serving.cancel()
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de compilación VLSM.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_address(sub):
+        sub.add_argument("--socket", help="ruta del socket Unix")
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=8765)
+
+    serve_cmd = commands.add_parser("serve", help="arranca el servidor")
+    add_address(serve_cmd)
+    serve_cmd.add_argument("--workers", type=int, default=None)
+    serve_cmd.add_argument("--threads", action="store_true", help="pool de hilos en lugar de procesos")
+    serve_cmd.add_argument("--plan-cache", type=int, default=256)
+    serve_cmd.add_argument("--cache-dir", help="caché persistente de planes compilados")
+    serve_cmd.add_argument("--output-root",
+                           help='directorio donde las solicitudes con "salida" pueden escribir')
+
+    compile_cmd = commands.add_parser("compile", help="compila un plan en el servidor")
+    add_address(compile_cmd)
+    compile_cmd.add_argument("plan")
+    compile_cmd.add_argument("--artifacts", nargs="*", default=[],
+                             help="cisco, asm, asm_packed, ir (y tabulares con --salida)")
+    compile_cmd.add_argument("--salida", help="escribe los artefactos en este directorio "
+                                              "(dentro del --output-root del servidor)")
+
+    metrics_cmd = commands.add_parser("metrics", help="muestra las métricas del servidor")
+    add_address(metrics_cmd)
+
+    args = parser.parse_args(argv)
+    address = {"path": args.socket, "host": args.host, "port": args.port}
+
+    if args.command == "serve":
+        asyncio.run(serve(args.socket, args.host, args.port, workers=args.workers,
+                          use_processes=not args.threads, plan_cache_size=args.plan_cache,
+                          cache_dir=args.cache_dir, output_root=args.output_root))
+        return 0
+
+    if args.command == "compile":
+        with open(args.plan, "r", encoding="utf-8") as f:
+            payload = {"id": 1, "op": "compilar", "codigo": f.read(), "artefactos": args.artifacts}
+        if args.salida:
+            payload["salida"] = os.path.abspath(args.salida)
+        response = request(payload, **address)
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+        return 0 if response.get("ok") else 1
+
+    print(json.dumps(request({"id": 1, "op": "metricas"}, **address), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+# deploy.py
+
+"""
+Envío concurrente de configuraciones a dispositivos Cisco con asyncio.
+
+ConfigDeployer abre conexiones TCP a cada equipo (reutilizándolas con un
+pool), limita cuántos envíos corren a la vez, transmite la configuración
+línea por línea, reintenta ante errores o tiempos de espera y reporta la
+latencia de cada dispositivo.
+
+El protocolo es el de una sesión de consola simplificada:
+    servidor -> "<hostname>#"
+    cliente  -> "configure terminal", líneas de configuración, "end"
+    servidor -> "% OK <n> lineas" y de nuevo "<hostname>#"
+
+La configuración de cada dispositivo se toma de 'config' (texto, lista o
+iterador de líneas), 'config_path' (archivo) o 'config_factory' (función
+que regresa un iterable de líneas en cada intento; cisco_config_lines()
+transmite la salida de cisco_generator sin construir el texto completo).
+Una línea "end" dentro de la configuración cerraría la sesión antes de
+tiempo, así que se rechaza sin reintentar.
+
+MockIOSServer implementa el lado del dispositivo sobre asyncio y aplica lo
+recibido a un vm.IOSDevice, para probar la carga sin equipos reales.
+"""
+
+import asyncio
+import io
+import random
+import time
+
+from vm import IOSDevice, parse_ioscfg
+
+# Cada cuántas líneas se espera a que se vacíe el buffer de escritura
+DRAIN_LINES = 256
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones (reader, writer) abiertas, indexadas por (host, puerto).
+    """
+
+    def __init__(self, max_idle_per_host=2):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}
+        self.opened = 0
+        self.reused = 0
+
+    async def acquire(self, host, port, timeout):
+        """Devuelve una conexión libre o abre una nueva y lee el prompt."""
+        idle = self._idle.get((host, port))
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.reused += 1
+                return reader, writer
+            writer.close()
+
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        self.opened += 1
+        try:
+            await asyncio.wait_for(reader.readline(), timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    def release(self, host, port, conn, reusable=True):
+        """Regresa una conexión al pool o la cierra si ya no sirve."""
+        reader, writer = conn
+        idle = self._idle.setdefault((host, port), [])
+        if reusable and not writer.is_closing() and len(idle) < self.max_idle_per_host:
+            idle.append(conn)
+        else:
+            writer.close()
+
+    async def close(self):
+        """Cierra todas las conexiones libres."""
+        writers = [writer for idle in self._idle.values() for _, writer in idle]
+        self._idle.clear()
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+def cisco_config_lines(vlsm_results, **options):
+    """
+    Genera línea por línea la configuración de
+    cisco_generator.iter_cisco_config() (acepta sus mismas opciones), para
+    usarla como 'config_factory':
+
+        {"host": ..., "port": ..., "config_factory": lambda: cisco_config_lines(results)}
+    """
+    from cisco_generator import iter_cisco_config
+
+    pending = ""
+    for text in iter_cisco_config(vlsm_results, **options):
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _config_lines(device):
+    """
+    Líneas de configuración de un dispositivo del inventario, para un
+    intento: 'config_factory' se llama de nuevo, 'config_path' se vuelve a
+    abrir y 'config' se recorre otra vez (ver ConfigDeployer.push).
+    """
+    if "config_factory" in device:
+        return device["config_factory"]()
+    if "config_path" in device:
+        return open(device["config_path"], "r", encoding="utf-8")
+    config = device["config"]
+    if isinstance(config, str):
+        return io.StringIO(config)
+    return config
+
+
+class ConfigDeployer:
+    """
+    Motor de envío de configuraciones.
+
+    concurrency: máximo de dispositivos atendidos al mismo tiempo.
+    timeout: segundos máximos para conectar y para recibir la confirmación.
+    retries: reintentos adicionales por dispositivo.
+    backoff: espera base entre reintentos (se duplica en cada intento).
+    """
+
+    def __init__(self, concurrency=50, timeout=10.0, retries=2, backoff=0.2, pool=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = pool or ConnectionPool()
+
+    async def _send(self, device):
+        """Un intento de envío; retorna la cantidad de líneas enviadas."""
+        host, port = device["host"], device["port"]
+        conn = await self.pool.acquire(host, port, self.timeout)
+        reader, writer = conn
+        reusable = False
+        try:
+            writer.write(b"configure terminal\n")
+            count = 0
+            source = _config_lines(device)
+            try:
+                for line in source:
+                    line = line.rstrip("\r\n")
+                    if line.strip() == "end":
+                        raise ValueError(f"Línea {count + 1}: 'end' dentro de la configuración")
+                    writer.write(line.encode("utf-8") + b"\n")
+                    count += 1
+                    if count % DRAIN_LINES == 0:
+                        await asyncio.wait_for(writer.drain(), self.timeout)
+            finally:
+                if hasattr(source, "close"):
+                    source.close()
+            writer.write(b"end\n")
+            await asyncio.wait_for(writer.drain(), self.timeout)
+
+            reply = await asyncio.wait_for(reader.readline(), self.timeout)
+            if not reply.startswith(b"% OK"):
+                raise ConnectionError(f"Respuesta inesperada: {reply.decode(errors='replace').strip()!r}")
+            # Prompt que deja la sesión lista para el siguiente envío
+            await asyncio.wait_for(reader.readline(), self.timeout)
+            reusable = True
+            return count
+        finally:
+            self.pool.release(host, port, conn, reusable)
+
+    async def push(self, device, semaphore=None):
+        """
+        Envía la configuración a un dispositivo con reintentos.
+        Retorna un diccionario con hostname, ok, intentos, lineas,
+        latencia (segundos) y error.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        config = device.get("config")
+        if config is not None and not isinstance(config, (str, list, tuple)):
+            # Un iterador se agotaría en el primer intento
+            device = dict(device, config=list(config))
+        result = {
+            "hostname": device.get("hostname", f"{device['host']}:{device['port']}"),
+            "ok": False,
+            "intentos": 0,
+            "lineas": 0,
+            "latencia": 0.0,
+            "error": None,
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                result["intentos"] = attempt + 1
+                try:
+                    result["lineas"] = await self._send(device)
+                    result["ok"] = True
+                    result["error"] = None
+                    break
+                except ValueError as e:
+                    # Configuración inválida: reintentar no cambia nada
+                    result["error"] = f"{type(e).__name__}: {e}"
+                    break
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.backoff * 2 ** attempt)
+            result["latencia"] = time.perf_counter() - start
+        return result
+
+    async def deploy(self, devices):
+        """Envía las configuraciones de todos los dispositivos en paralelo."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self.push(device, semaphore) for device in devices))
+
+    async def close(self):
+        await self.pool.close()
+
+
+def summarize_results(results, elapsed=None):
+    """
+    Resumen de un despliegue: dispositivos exitosos y fallidos, reintentos
+    y percentiles de latencia en segundos.
+    """
+    latencies = sorted(r["latencia"] for r in results)
+
+    def percentile(p):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    summary = {
+        "dispositivos": len(results),
+        "exitosos": sum(1 for r in results if r["ok"]),
+        "fallidos": sum(1 for r in results if not r["ok"]),
+        "reintentos": sum(r["intentos"] - 1 for r in results),
+        "lineas": sum(r["lineas"] for r in results),
+        "latencia_p50": percentile(0.50),
+        "latencia_p95": percentile(0.95),
+        "latencia_max": latencies[-1] if latencies else 0.0,
+    }
+    if elapsed is not None:
+        summary["segundos"] = elapsed
+    return summary
+
+
+def deploy_configs(devices, **options):
+    """
+    Versión síncrona: envía las configuraciones y retorna los resultados.
+    Acepta las mismas opciones que ConfigDeployer.
+    """
+    async def run():
+        deployer = ConfigDeployer(**options)
+        try:
+            return await deployer.deploy(devices)
+        finally:
+            await deployer.close()
+
+    return asyncio.run(run())
+
+
+class MockIOSServer:
+    """
+    Dispositivo IOS simulado sobre asyncio.
+
+    latency: segundos de espera antes de confirmar cada configuración.
+    failure_rate: probabilidad de cortar la conexión en lugar de confirmar,
+                  para probar los reintentos.
+    """
+
+    def __init__(self, hostname="Router", host="127.0.0.1", port=0,
+                 latency=0.0, failure_rate=0.0, seed=None):
+        self.hostname = hostname
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.device = IOSDevice(hostname)
+        self.sessions = 0
+        self.commits = 0
+        self._random = random.Random(seed)
+        self._server = None
+
+    async def start(self):
+        """Inicia el servidor; si port era 0 se asigna uno libre."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader, writer):
+        self.sessions += 1
+        prompt = f"{self.hostname}#\n".encode()
+        pending = None
+        try:
+            writer.write(prompt)
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+                if line.strip() == "configure terminal":
+                    pending = []
+                elif line.strip() == "end" and pending is not None:
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    if self._random.random() < self.failure_rate:
+                        break
+                    parse_ioscfg(pending, self.device)
+                    self.commits += 1
+                    writer.write(f"% OK {len(pending)} lineas\n".encode() + prompt)
+                    pending = None
+                elif pending is not None:
+                    pending.append(line)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
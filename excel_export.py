@@ -1,12 +1,84 @@
 # excel_export.py
-import openpyxl
-from tkinter import filedialog, messagebox
+
+def _sheet_headers(subred):
+    """
+    Encabezados de una hoja: número de subred y las claves de la subred,
+    sin las que identifican a la red.
+    """
+    return ["Subred"] + [k for k in subred.keys() if k not in ["ip_base", "nombre_red"]]
+
+# Filas de datos por hoja: Excel admite 1,048,576 filas y la primera es el
+# encabezado
+MAX_SHEET_ROWS = 1048575
+
+def write_excel(file_path, vlsm_records, max_rows=MAX_SHEET_ROWS):
+    """
+    Exporta los resultados del cálculo VLSM a un archivo de Excel (.xlsx)
+    sin interfaz gráfica. Cada red se guarda en una hoja diferente.
+
+    vlsm_records puede ser cualquier iterable de subredes; se recorre una
+    sola vez con el modo write-only de openpyxl y solo hay una hoja abierta
+    a la vez (cada hoja abierta ocupa un archivo temporal), así que la
+    memoria no crece con el número de filas ni de redes.
+
+    Las subredes de una red se esperan consecutivas, como las produce
+    calculate_vlsm(). Si una red vuelve a aparecer más adelante, o si pasa
+    de max_rows filas, sus filas siguen en otra hoja con sufijo
+    ("Red X (2)") y la numeración de subredes continúa.
+
+    Retorna la cantidad de subredes escritas.
+    Lanza ValueError si no hay datos para exportar.
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+
+    # Por red: [hojas abiertas hasta ahora, última subred numerada]
+    networks = {}
+    sheet = None
+    current_key = None
+    keys = None
+    sheet_rows = 0
+    count = 0
+
+    for subred in vlsm_records:
+        # Agrupa las subredes por nombre de red o IP base
+        group_key = subred.get("nombre_red") or subred["ip_base"]
+        if group_key != current_key or sheet_rows >= max_rows:
+            if sheet is not None:
+                # Libera el archivo temporal de la hoja antes de abrir otra
+                sheet.close()
+            state = networks.setdefault(group_key, [0, 0])
+            state[0] += 1
+            title = f"Red {group_key}" if state[0] == 1 else f"Red {group_key} ({state[0]})"
+            sheet = workbook.create_sheet(title=title)
+            headers = _sheet_headers(subred)
+            sheet.append(headers)
+            keys = headers[1:]
+            current_key = group_key
+            sheet_rows = 0
+
+        state[1] += 1
+        sheet.append([state[1]] + [subred[key] for key in keys])
+        sheet_rows += 1
+        count += 1
+
+    if not count:
+        raise ValueError("No hay datos para exportar.")
+
+    workbook.save(file_path)
+    return count
 
 def export_to_excel(vlsm_data):
     """
     Exporta los resultados del cálculo VLSM a un archivo de Excel (.xlsx).
     Cada red se guarda en una hoja diferente.
+
+    Envoltura gráfica de write_excel(): solo pide la ruta y muestra los
+    mensajes al usuario.
     """
+    from tkinter import filedialog, messagebox
+
     if not vlsm_data:
         messagebox.showerror("Error", "No hay datos para exportar.")
         return
@@ -21,31 +93,5 @@ def export_to_excel(vlsm_data):
     if not file_path:
         return  # Usuario canceló
 
-    workbook = openpyxl.Workbook()
-    workbook.remove(workbook.active)
-
-    # Agrupa las subredes por nombre de red o IP base
-    grouped = {}
-    for subred in vlsm_data:
-        group_key = subred.get("nombre_red") or subred["ip_base"]
-        if group_key not in grouped:
-            grouped[group_key] = []
-        grouped[group_key].append(subred)
-
-    for nombre_red, subredes in grouped.items():
-        # Crea una hoja por cada red
-        sheet = workbook.create_sheet(title=f"Red {nombre_red}")
-
-        headers = ["Subred"] + [k for k in subredes[0].keys() if k not in ["ip_base", "nombre_red"]]
-        for col_num, header in enumerate(headers, 1):
-            sheet.cell(row=1, column=col_num, value=header)
-
-        for row_num, subred in enumerate(subredes, start=2):
-            sheet.cell(row=row_num, column=1, value=row_num - 1)
-            col_index = 2
-            for key in headers[1:]:
-                sheet.cell(row=row_num, column=col_index, value=subred[key])
-                col_index += 1
-
-    workbook.save(file_path)
+    write_excel(file_path, vlsm_data)
     messagebox.showinfo("Exportar a Excel", "Datos exportados exitosamente.")
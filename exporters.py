@@ -0,0 +1,198 @@
+# exporters.py
+
+"""
+Exportadores tabulares de resultados VLSM.
+
+Todos comparten la misma interfaz: write(path, records) recibe cualquier
+iterable de subredes (los diccionarios de calculate_vlsm()), lo recorre una
+sola vez escribiendo por bloques y retorna la cantidad de filas escritas.
+
+    csv      CSV con una columna por clave de la subred
+    jsonl    JSON Lines, un objeto por subred
+    arrow    Archivo Arrow IPC con columnas de direcciones enteras (pyarrow)
+    parquet  Parquet con las mismas columnas que arrow (pyarrow)
+    xlsx     Excel, a través de excel_export.write_excel()
+"""
+
+import abc
+import csv
+import itertools
+import json
+from operator import itemgetter
+
+from summarization import ip_to_int
+
+# Columnas en el orden en que calculate_vlsm() construye cada subred
+VLSM_FIELDS = [
+    "hosts_solicitados",
+    "hosts_encontrados",
+    "direccionamiento_de_red",
+    "nueva_mascara",
+    "mascara_decimal",
+    "primera_ip_utilizable",
+    "ultima_ip_utilizable",
+    "direccion_de_broadcast",
+    "ip_base",
+    "nombre_red",
+]
+
+# Filas que se acumulan antes de cada escritura
+BATCH_ROWS = 65536
+
+
+def _batches(records, size=BATCH_ROWS):
+    """Divide un iterable en listas de hasta size elementos."""
+    iterator = iter(records)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class VLSMExporter(abc.ABC):
+    """
+    Interfaz común de los exportadores.
+    Las subclases definen name, extension y write(); una subclase sin
+    write() no se puede instanciar.
+    """
+    name = None
+    extension = None
+
+    @abc.abstractmethod
+    def write(self, path, records):
+        """Escribe records en path y retorna la cantidad de filas."""
+
+
+class CSVExporter(VLSMExporter):
+    name = "csv"
+    extension = ".csv"
+
+    def write(self, path, records):
+        row = itemgetter(*VLSM_FIELDS)
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(VLSM_FIELDS)
+            for batch in _batches(records):
+                writer.writerows(map(row, batch))
+                count += len(batch)
+        return count
+
+
+class JSONLinesExporter(VLSMExporter):
+    name = "jsonl"
+    extension = ".jsonl"
+
+    def write(self, path, records):
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        count = 0
+        with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            for batch in _batches(records):
+                f.write("".join(dumps(record) + "\n" for record in batch))
+                count += len(batch)
+        return count
+
+
+class ArrowExporter(VLSMExporter):
+    """
+    Exportador columnar. Las direcciones se guardan como enteros de 32 bits
+    sin signo y el prefijo como entero de 8 bits, en lotes de BATCH_ROWS.
+    Requiere pyarrow.
+    """
+    name = "arrow"
+    extension = ".arrow"
+
+    @staticmethod
+    def _pyarrow():
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("El exportador requiere pyarrow (pip install pyarrow).") from None
+        return pyarrow
+
+    def schema(self, pa):
+        return pa.schema([
+            ("nombre_red", pa.string()),
+            ("ip_base", pa.uint32()),
+            ("red", pa.uint32()),
+            ("prefijo", pa.uint8()),
+            ("primera_ip", pa.uint32()),
+            ("ultima_ip", pa.uint32()),
+            ("broadcast", pa.uint32()),
+            ("hosts_solicitados", pa.int64()),
+            ("hosts_encontrados", pa.int64()),
+        ])
+
+    def _record_batch(self, pa, schema, batch):
+        columns = [
+            [s.get("nombre_red") for s in batch],
+            [ip_to_int(s["ip_base"]) for s in batch],
+            [ip_to_int(s["direccionamiento_de_red"]) for s in batch],
+            [int(s["nueva_mascara"].lstrip("/")) for s in batch],
+            [ip_to_int(s["primera_ip_utilizable"]) for s in batch],
+            [ip_to_int(s["ultima_ip_utilizable"]) for s in batch],
+            [ip_to_int(s["direccion_de_broadcast"]) for s in batch],
+            [s["hosts_solicitados"] for s in batch],
+            [s["hosts_encontrados"] for s in batch],
+        ]
+        return pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+    def _open_writer(self, pa, path, schema):
+        import pyarrow.ipc
+        return pyarrow.ipc.new_file(path, schema)
+
+    def write(self, path, records):
+        pa = self._pyarrow()
+        schema = self.schema(pa)
+        count = 0
+        writer = self._open_writer(pa, path, schema)
+        try:
+            for batch in _batches(records):
+                writer.write_batch(self._record_batch(pa, schema, batch))
+                count += len(batch)
+        finally:
+            writer.close()
+        return count
+
+
+class ParquetExporter(ArrowExporter):
+    name = "parquet"
+    extension = ".parquet"
+
+    def _open_writer(self, pa, path, schema):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(path, schema)
+
+
+class ExcelExporter(VLSMExporter):
+    name = "xlsx"
+    extension = ".xlsx"
+
+    def write(self, path, records):
+        from excel_export import write_excel
+        return write_excel(path, records)
+
+
+EXPORTERS = {
+    exporter.name: exporter
+    for exporter in (CSVExporter, JSONLinesExporter, ArrowExporter, ParquetExporter, ExcelExporter)
+}
+
+
+def get_exporter(fmt):
+    """Devuelve una instancia del exportador para el formato indicado."""
+    try:
+        return EXPORTERS[fmt]()
+    except KeyError:
+        raise ValueError(
+            f"Formato de exportación no soportado: {fmt}. Opciones: {', '.join(EXPORTERS)}"
+        ) from None
+
+
+def export_records(fmt, path, records):
+    """Exporta records en el formato fmt; retorna la cantidad de filas."""
+    return get_exporter(fmt).write(path, records)
@@ -1,15 +1,41 @@
 # gui.py
+import queue
+import threading
 import tkinter as tk
+from collections import Counter
 from tkinter import ttk, font, scrolledtext, messagebox, filedialog
 
 from lexer import VLSMLexer
-from parser import VLSMParser
-from semantic import VLSMSemanticAnalyzer
-from vlsm_calc import calculate_vlsm
-from excel_export import export_to_excel
-from utils import TextLineNumbers
-from intermediate_code import IntermediateCodeGenerator
-from code_generator_asm import generate_asm_code
+from utils import TextLineNumbers, VirtualTreeview, DerivationTreeView
+from pipeline import compile_plan, CompileCancelled, PHASES
+
+# Los back ends (ensamblador, Excel, artefactos) se importan en su primer uso
+# para que la ventana abra sin cargar openpyxl ni los generadores.
+
+# Fases que se muestran en la barra de progreso (las del pipeline + ASM)
+COMPILE_PHASES = PHASES + ["asm"]
+PHASE_LABELS = {
+    "lexico": "Análisis léxico",
+    "sintactico": "Análisis sintáctico",
+    "arbol": "Árbol de derivación",
+    "semantico": "Análisis semántico",
+    "vlsm": "Cálculo VLSM",
+    "ir": "Código intermedio",
+    "asm": "Código ensamblador",
+    "artefactos": "Escribiendo artefactos",
+}
+
+# Artefactos que escribe el botón "Generar artefactos"
+GUI_ARTIFACTS = ["cisco", "asm", "ir", "xlsx"]
+
+# Cada cuántos milisegundos se revisa la cola del hilo de compilación
+POLL_MS = 50
+
+# Palabras reservadas que se resaltan en el editor (tipos de token del lexer)
+RESERVED_WORDS = ['IP', 'MASK', 'HOSTS', 'NAME', 'INCLUDE']
+
+# Espera tras la última tecla antes de volver a resaltar
+HIGHLIGHT_DELAY_MS = 150
 
 class VLSMApp:
     def __init__(self, root):
@@ -62,6 +88,16 @@ class VLSMApp:
         self.tokens = []
         self.derivation_tree = []
 
+        # Resaltado diferido: líneas editadas pendientes y callback de after()
+        self.highlight_lexer = VLSMLexer()
+        self.highlight_job = None
+        self.dirty_lines = set()
+
+        # Compilación en segundo plano
+        self.compile_id = 0
+        self.compiling = False
+        self.cancel_event = None
+
     # ------------------
     # UI Builders
     # ------------------
@@ -79,13 +115,25 @@ class VLSMApp:
             tf, wrap=tk.WORD, width=60, height=8, font=self.monospace, background="#fafdff"
         )
         self.input_text.pack(side="left", fill=tk.BOTH, expand=1)
-        self.input_text.bind("<KeyRelease>", lambda e: [self.linenumbers.redraw(), self.highlight_reserved_words()])
+        self.input_text.bind("<KeyRelease>", self._on_key_release)
+        self.input_text.config(yscrollcommand=self._on_input_scroll)
         self.linenumbers.attach(self.input_text)
+        for word in RESERVED_WORDS:
+            self.input_text.tag_config(word, foreground="#0074D9", font=("Consolas", 11, "bold"))
 
         btn_frame = ttk.Frame(parent)
         btn_frame.pack(pady=8)
         ttk.Button(btn_frame, text="Analizar", command=self.analyze, width=16).pack(side=tk.LEFT, padx=8)
         ttk.Button(btn_frame, text="Exportar a Excel", command=self.export_to_excel, width=18).pack(side=tk.LEFT, padx=8)
+        ttk.Button(btn_frame, text="Generar artefactos", command=self.generate_artifacts, width=20).pack(side=tk.LEFT, padx=8)
+
+        progress_frame = ttk.Frame(parent)
+        progress_frame.pack(pady=(0, 4))
+        self.progress = ttk.Progressbar(progress_frame, mode="determinate", length=320,
+                                        maximum=len(COMPILE_PHASES))
+        self.progress.pack(side=tk.LEFT, padx=8)
+        self.status_label = ttk.Label(progress_frame, text="", width=36)
+        self.status_label.pack(side=tk.LEFT, padx=8)
 
         ttk.Separator(parent, orient="horizontal").pack(fill=tk.X, padx=10, pady=5)
 
@@ -115,11 +163,9 @@ class VLSMApp:
         self.sub_notebook.add(self.tab_reserved, text="Tabla de palabras reservadas")
         self.sub_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        # Tabla virtual: solo crea filas para la página visible
         cols_tok = ("Tipo", "Valor", "Línea", "Posición")
-        self.tv_tokens = ttk.Treeview(self.tab_tokens, columns=cols_tok, show='headings', height=12)
-        for c in cols_tok:
-            self.tv_tokens.heading(c, text=c)
-            self.tv_tokens.column(c, anchor="center", width=130)
+        self.tv_tokens = VirtualTreeview(self.tab_tokens, columns=cols_tok, column_width=130, height=12)
         self.tv_tokens.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         cols_res = ("Palabra", "Cantidad")
@@ -130,9 +176,9 @@ class VLSMApp:
         self.tv_reserved.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def _build_tree_area(self, parent):
-        self.tree_notebook = ttk.Notebook(parent)
-        self.tree_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.tree_tabs = []
+        # Una sola vista para todos los bloques; solo dibuja lo visible
+        self.tree_view = DerivationTreeView(parent)
+        self.tree_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def _build_intermediate_area(self, parent):
         frame = ttk.LabelFrame(parent, text="Código Intermedio Generado")
@@ -253,31 +299,168 @@ class VLSMApp:
     # Analysis pipeline
     # ------------------
     def analyze(self):
+        # Una compilación anterior que siga en curso se descarta
+        self.cancel_compile()
+
         # Reset UI bits
         self.hide_error_popup()
         self.output_text.config(state=tk.NORMAL)
         self.output_text.delete("1.0", tk.END)
+        self.output_text.config(state=tk.DISABLED)
         self.vlsm_data = None
         self.tokens = []
-        for tab in getattr(self, 'tree_tabs', []):
-            self.tree_notebook.forget(tab)
-        self.tree_tabs = []
+        self.tree_view.clear()
 
         code = self.input_text.get("1.0", tk.END).strip()
         if not code:
             messagebox.showwarning("Advertencia", "Por favor, introduce un código para analizar.")
             return
 
-        # LEXICAL
-        lexer = VLSMLexer()
-        tokens, lex_errors = lexer.tokenize(code)
+        self._start_worker(self._compile_worker, code)
+
+    def _start_worker(self, target, code, *args):
+        """
+        Ejecuta target(code, compile_id, cancel_event, results, *args) en un
+        hilo de trabajo. Los widgets solo se tocan desde el hilo principal,
+        al leer la cola con root.after (ver _poll_compile).
+        """
+        self.input_text.edit_modified(False)
+        self.compile_id += 1
+        self.compiling = True
+        self.cancel_event = threading.Event()
+        results = queue.Queue()
+        worker = threading.Thread(
+            target=target,
+            args=(code, self.compile_id, self.cancel_event, results) + args,
+            daemon=True
+        )
+        self.progress.config(value=0)
+        self.status_label.config(text="Compilando...")
+        worker.start()
+        self.root.after(POLL_MS, self._poll_compile, self.compile_id, results)
+
+    @staticmethod
+    def _compile_worker(code, compile_id, cancel_event, results):
+        """
+        Ejecuta el pipeline fuera del hilo de Tk. No toca widgets: todo se
+        comunica con mensajes (tipo, compile_id, ...) en la cola results.
+        """
+        def progress(phase):
+            results.put(("progreso", compile_id, phase))
+
+        try:
+            plan = compile_plan(code, progress=progress, cancel_event=cancel_event)
+
+            progress("asm")
+            if cancel_event.is_set():
+                raise CompileCancelled("Compilación cancelada")
+            try:
+                from code_generator_asm import generate_asm_code
+                asm_code = generate_asm_code(plan['ir'])
+            except Exception as e:
+                asm_code = f"Error generando código ensamblador:\n{e}"
+
+            results.put(("listo", compile_id, plan, asm_code))
+        except CompileCancelled:
+            results.put(("cancelado", compile_id))
+        except Exception as e:
+            results.put(("error", compile_id, e))
+
+    @staticmethod
+    def _artifacts_worker(code, compile_id, cancel_event, results, out_dir):
+        """
+        Compila el plan y escribe GUI_ARTIFACTS en out_dir fuera del hilo de
+        Tk. Responde ("artefactos", compile_id, reportes); reportes es
+        None si el plan tiene errores.
+        """
+        def progress(phase):
+            results.put(("progreso", compile_id, phase))
+
+        try:
+            plan = compile_plan(code, progress=progress, cancel_event=cancel_event)
+            reports = None
+            if plan['ok']:
+                progress("artefactos")
+                if cancel_event.is_set():
+                    raise CompileCancelled("Compilación cancelada")
+                from artifacts import emit_artifacts
+                reports = emit_artifacts(plan, GUI_ARTIFACTS, out_dir)
+            results.put(("artefactos", compile_id, reports))
+        except CompileCancelled:
+            results.put(("cancelado", compile_id))
+        except Exception as e:
+            results.put(("error", compile_id, e))
+
+    def _poll_compile(self, compile_id, results):
+        """Procesa los mensajes del hilo de compilación en el hilo principal."""
+        if compile_id != self.compile_id:
+            return  # Compilación reemplazada por otra
+
+        try:
+            while True:
+                message = results.get_nowait()
+                kind = message[0]
+                if kind == "progreso":
+                    phase = message[2]
+                    # Los artefactos ocupan el último paso, igual que el ASM
+                    step = COMPILE_PHASES.index(phase) if phase in COMPILE_PHASES else len(PHASES)
+                    self.progress.config(value=step)
+                    self.status_label.config(text=f"{PHASE_LABELS[phase]}...")
+                    continue
+
+                self.compiling = False
+                if kind == "listo":
+                    self.progress.config(value=len(COMPILE_PHASES))
+                    self.status_label.config(text="Compilación terminada")
+                    self._show_results(message[2], message[3])
+                elif kind == "artefactos":
+                    self._show_artifact_reports(message[2])
+                elif kind == "cancelado":
+                    self.progress.config(value=0)
+                    self.status_label.config(text="Compilación cancelada")
+                else:
+                    self.status_label.config(text="Error en la compilación")
+                    self.show_error_popup(f"Error inesperado durante la compilación:\n{message[2]}")
+                return
+        except queue.Empty:
+            pass
+
+        self.root.after(POLL_MS, self._poll_compile, compile_id, results)
+
+    def cancel_compile(self):
+        """Cancela la compilación en curso, si existe."""
+        if self.compiling and self.cancel_event is not None:
+            self.cancel_event.set()
+            self.compiling = False
+            self.compile_id += 1
+            self.progress.config(value=0)
+            self.status_label.config(text="Compilación cancelada")
+
+    def _on_key_release(self, event=None):
+        self.linenumbers.redraw()
+        self.dirty_lines.add(int(self.input_text.index(tk.INSERT).split(".")[0]))
+        self.schedule_highlight()
+        # Editar el texto invalida la compilación en curso
+        if self.compiling and self.input_text.edit_modified():
+            self.cancel_compile()
+
+    def _show_results(self, plan, asm_code):
+        """Muestra en los widgets el resultado de una compilación."""
+        tokens = plan['tokens']
+        lex_errors = plan['lex_errors']
+        blocks = plan['blocks']
+        syntax_errors = plan['syntax_errors']
+        semantic_errors = plan['semantic_errors']
+        link_errors = plan['link_errors']
+
         self.tokens = tokens
 
-        # Show lexical header & tokens
-        self.output_text.insert(tk.END, "=== ANÁLISIS LÉXICO ===\n")
-        for token in tokens:
-            token_type, value, line, col = token
-            self.output_text.insert(tk.END, f"Token: {token_type} Valor: {value} (Línea {line}, Posición {col})\n")
+        # La salida se arma en una lista y se inserta en una sola llamada
+        output = ["=== ANÁLISIS LÉXICO ===\n"]
+        output.extend(
+            f"Token: {token_type} Valor: {value} (Línea {line}, Posición {col})\n"
+            for token_type, value, line, col in tokens
+        )
         self.populate_tables()
 
         error_text = ""
@@ -287,16 +470,9 @@ class VLSMApp:
                 error_text += f"{err}\n"
             error_text += "\n"
 
-        # SYNTAX
-        parser = VLSMParser(tokens)
-        blocks = parser.parse()
-        syntax_errors = parser.errors
-
         # Build tree (parse_with_tree)
-        parser2 = VLSMParser(tokens)
-        tree_blocks = parser2.parse_with_tree()
-        self.derivation_tree = tree_blocks
-        self.draw_tree(tree_blocks)
+        self.derivation_tree = plan['tree']
+        self.draw_tree(plan['tree'])
 
         if syntax_errors:
             error_text += "=== ERRORES SINTÁCTICOS ===\n"
@@ -305,9 +481,8 @@ class VLSMApp:
             error_text += "\n"
 
         # SEMANTIC
-        semantic_errors = []
         if not lex_errors and not syntax_errors:
-            self.output_text.insert(tk.END, "\n=== ANÁLISIS SINTÁCTICO ===\n")
+            output.append("\n=== ANÁLISIS SINTÁCTICO ===\n")
             for i, block in enumerate(blocks, start=1):
                 resumen = (
                     f"Red #{i}:\n"
@@ -316,11 +491,7 @@ class VLSMApp:
                     f" \tHosts requeridos: {block['num_hosts']}\n"
                     f" \tNombre: {block.get('name', 'Sin nombre')}\n"
                 )
-                self.output_text.insert(tk.END, resumen)
-
-            analyzer = VLSMSemanticAnalyzer(blocks)
-            if not analyzer.analyze():
-                semantic_errors = analyzer.errors
+                output.append(resumen)
 
             if semantic_errors:
                 error_text += "=== ERRORES SEMÁNTICOS ===\n"
@@ -328,89 +499,63 @@ class VLSMApp:
                     error_text += f"{err}\n"
                 error_text += "\n"
 
+        # El editor no tiene archivo de origen: los INCLUDE no se enlazan
+        if link_errors:
+            error_text += "=== ERRORES DE ENLACE ===\n"
+            for err in link_errors:
+                error_text += f"{err}\n"
+            error_text += "\n"
+
         # Decide what to show
         if error_text:
             # Show errors in the bottom sliding panel (full width)
             self.show_error_popup(error_text)
             self.vlsm_data = None
-        else:
-            # No errors: compute VLSM and show nicely formatted output
-            if blocks and not lex_errors and not syntax_errors and not semantic_errors:
-                self.output_text.insert(tk.END, "\n=== CÁLCULO VLSM ===\n")
-                all_results = []
-                for block in blocks:
-                    results = calculate_vlsm(block['ip_address'], block['subnet_mask'],
-                                            block['num_hosts'], block.get('name'))
-                    all_results.extend(results)
-
-                self.vlsm_data = all_results
-
-                for res in all_results:
-                    salida = (
-                        f"Hosts solicitados: {res['hosts_solicitados']}\n"
-                        f"Hosts encontrados: {res['hosts_encontrados']}\n"
-                        f"Dirección de red: {res['direccionamiento_de_red']}\n"
-                        f"Nueva máscara: {res['nueva_mascara']}\n"
-                        f"Máscara decimal: {res['mascara_decimal']}\n"
-                        f"Primera IP utilizable: {res['primera_ip_utilizable']}\n"
-                        f"Última IP utilizable: {res['ultima_ip_utilizable']}\n"
-                        f"Dirección de broadcast: {res['direccion_de_broadcast']}\n"
-                        "--------------------------------------\n"
-                    )
-                    self.output_text.insert(tk.END, salida)
+        elif plan['vlsm_results'] is not None:
+            # No errors: show nicely formatted VLSM output
+            output.append("\n=== CÁLCULO VLSM ===\n")
+            self.vlsm_data = plan['vlsm_results']
+
+            for res in self.vlsm_data:
+                salida = (
+                    f"Hosts solicitados: {res['hosts_solicitados']}\n"
+                    f"Hosts encontrados: {res['hosts_encontrados']}\n"
+                    f"Dirección de red: {res['direccionamiento_de_red']}\n"
+                    f"Nueva máscara: {res['nueva_mascara']}\n"
+                    f"Máscara decimal: {res['mascara_decimal']}\n"
+                    f"Primera IP utilizable: {res['primera_ip_utilizable']}\n"
+                    f"Última IP utilizable: {res['ultima_ip_utilizable']}\n"
+                    f"Dirección de broadcast: {res['direccion_de_broadcast']}\n"
+                    "--------------------------------------\n"
+                )
+                output.append(salida)
 
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, "".join(output))
         self.output_text.config(state=tk.DISABLED)
 
         # === CÓDIGO INTERMEDIO ===
-        try:
-            generator = IntermediateCodeGenerator(blocks)
-            intermediate_result = generator.generate()
-
-            self.text_intermediate.config(state=tk.NORMAL)
-            self.text_intermediate.delete("1.0", tk.END)
-            self.text_intermediate.insert(tk.END, "=== CÓDIGO INTERMEDIO ===\n")
-
-            if isinstance(intermediate_result, list):
-                for instr in intermediate_result:
-                    self.text_intermediate.insert(tk.END, str(instr) + "\n")
-            else:
-                self.text_intermediate.insert(tk.END, str(intermediate_result))
-
-            self.text_intermediate.config(state=tk.DISABLED)
-
-        except Exception as e:
-            self.text_intermediate.config(state=tk.NORMAL)
-            self.text_intermediate.delete("1.0", tk.END)
-            self.text_intermediate.insert(tk.END, f"Error generando código intermedio:\n{e}")
-            self.text_intermediate.config(state=tk.DISABLED)
+        self.text_intermediate.config(state=tk.NORMAL)
+        self.text_intermediate.delete("1.0", tk.END)
+        self.text_intermediate.insert(tk.END, "=== CÓDIGO INTERMEDIO ===\n")
+        self.text_intermediate.insert(tk.END, "\n".join(str(i) for i in plan['ir']))
+        self.text_intermediate.config(state=tk.DISABLED)
 
         # === CÓDIGO ENSAMBLADOR ===
-        try:
-            optimized_instructions = generator.optimizer.optimize(generator.emitter.instructions)
-            asm_code = generate_asm_code(optimized_instructions)
-            
-            self.text_asm_code.config(state=tk.NORMAL)
-            self.text_asm_code.delete("1.0", tk.END)
-            self.text_asm_code.insert(tk.END, asm_code)
-            self.text_asm_code.config(state=tk.DISABLED)
-
-        except Exception as e:
-            self.text_asm_code.config(state=tk.NORMAL)
-            self.text_asm_code.delete("1.0", tk.END)
-            self.text_asm_code.insert(tk.END, f"Error generando código ensamblador:\n{e}")
-            self.text_asm_code.config(state=tk.DISABLED)
+        self.text_asm_code.config(state=tk.NORMAL)
+        self.text_asm_code.delete("1.0", tk.END)
+        self.text_asm_code.insert(tk.END, asm_code)
+        self.text_asm_code.config(state=tk.DISABLED)
 
     # ------------------
     # Tables & helpers
     # ------------------
     def _cleanup_analysis(self):
-        for i in self.tv_tokens.get_children():
-            self.tv_tokens.delete(i)
+        self.tv_tokens.clear()
         for i in self.tv_reserved.get_children():
             self.tv_reserved.delete(i)
-        for tab in getattr(self, 'tree_tabs', []):
-            self.tree_notebook.forget(tab)
-        self.tree_tabs = []
+        self.tree_view.clear()
         self.vlsm_data = None
 
         if hasattr(self, "text_intermediate"):
@@ -425,10 +570,46 @@ class VLSMApp:
 
     def export_to_excel(self):
         if self.vlsm_data:
+            from excel_export import export_to_excel
             export_to_excel(self.vlsm_data)
         else:
             messagebox.showerror("Error", "No hay datos válidos para exportar. Realiza un análisis exitoso primero.")
 
+    def generate_artifacts(self):
+        """
+        Compila el plan y escribe en paralelo todos los artefactos en una
+        carpeta, en el mismo hilo de trabajo que analyze().
+        """
+        code = self.input_text.get("1.0", tk.END).strip()
+        if not code:
+            messagebox.showwarning("Advertencia", "Por favor, introduce un código para analizar.")
+            return
+
+        out_dir = filedialog.askdirectory(title="Carpeta para los artefactos")
+        if not out_dir:
+            return
+
+        self.cancel_compile()
+        self._start_worker(self._artifacts_worker, code, out_dir)
+
+    def _show_artifact_reports(self, reports):
+        """Muestra el resultado de generate_artifacts()."""
+        if reports is None:
+            self.progress.config(value=0)
+            self.status_label.config(text="El plan tiene errores")
+            messagebox.showerror("Error", "El plan tiene errores. Realiza un análisis exitoso primero.")
+            return
+
+        self.progress.config(value=len(COMPILE_PHASES))
+        self.status_label.config(text="Artefactos generados")
+        resumen = []
+        for report in reports:
+            linea = f"{report['artefacto']}: {report['estado']} ({report['segundos']:.3f} s)"
+            if report['error']:
+                linea += f"\n  {report['error']}"
+            resumen.append(linea)
+        messagebox.showinfo("Artefactos", "\n".join(resumen))
+
     def save_asm_code(self):
         """Guarda el código ensamblador en un archivo .asm"""
         content = self.text_asm_code.get("1.0", tk.END).strip()
@@ -501,193 +682,73 @@ class VLSMApp:
         messagebox.showinfo("Éxito", "Código ensamblador copiado al portapapeles.\n\nPuedes pegarlo en EMU8086.")
             
     def populate_tables(self):
-        # tokens table
-        for i in self.tv_tokens.get_children():
-            self.tv_tokens.delete(i)
+        # tokens table (las tuplas del lexer ya son las filas)
+        self.tv_tokens.set_rows(self.tokens)
         for i in self.tv_reserved.get_children():
             self.tv_reserved.delete(i)
 
-        if self.tokens:
-            for token in self.tokens:
-                token_type, value, line, col = token
-                self.tv_tokens.insert('', tk.END, values=(token_type, value, line, col))
-
-        # reserved counts
-        reserved_words = ['IP', 'MASK', 'HOSTS', 'NAME']
-        text = self.input_text.get("1.0", tk.END).upper()
-        counts = {word: text.count(word) for word in reserved_words if text.count(word) > 0}
-        for word, count in counts.items():
-            self.tv_reserved.insert('', tk.END, values=(word, count))
+        # reserved counts, a partir de los tipos de token
+        counts = Counter(token[0] for token in self.tokens)
+        for word in RESERVED_WORDS:
+            if counts[word] > 0:
+                self.tv_reserved.insert('', tk.END, values=(word, counts[word]))
 
     # ------------------
     # Highlighting & line numbers
     # ------------------
+    def _on_input_scroll(self, first, last):
+        # Al desplazarse aparecen líneas nuevas: se numeran y se resaltan
+        self.input_text.vbar.set(first, last)
+        self.linenumbers.redraw()
+        self.schedule_highlight()
+
+    def schedule_highlight(self):
+        """Reprograma el resaltado; solo corre tras HIGHLIGHT_DELAY_MS sin cambios."""
+        if self.highlight_job is not None:
+            self.root.after_cancel(self.highlight_job)
+        self.highlight_job = self.root.after(HIGHLIGHT_DELAY_MS, self.highlight_reserved_words)
+
+    def _visible_lines(self):
+        first = int(self.input_text.index("@0,0").split(".")[0])
+        last = int(self.input_text.index(f"@0,{self.input_text.winfo_height()}").split(".")[0])
+        return range(first, last + 1)
+
     def highlight_reserved_words(self):
-        reserved_words = ['IP', 'MASK', 'HOSTS', 'NAME']
-        for word in reserved_words:
-            self.input_text.tag_remove(word, "1.0", tk.END)
-        for word in reserved_words:
-            start_index = '1.0'
-            while True:
-                start_index = self.input_text.search(word, start_index, tk.END, nocase=True)
-                if not start_index:
-                    break
-                end_index = f"{start_index}+{len(word)}c"
-                self.input_text.tag_add(word, start_index, end_index)
-                self.input_text.tag_config(word, foreground="#0074D9", font=("Consolas", 11, "bold"))
-                start_index = end_index
+        """
+        Resalta las palabras reservadas de las líneas visibles y de las
+        editadas desde el último resaltado, usando los tokens del lexer.
+        """
+        self.highlight_job = None
+        total = int(self.input_text.index("end-1c").split(".")[0])
+        lines = sorted(line for line in self.dirty_lines.union(self._visible_lines())
+                       if line <= total)
+        self.dirty_lines.clear()
+
+        # Agrupa las líneas en tramos contiguos y tokeniza cada tramo
+        i = 0
+        while i < len(lines):
+            first = last = lines[i]
+            i += 1
+            while i < len(lines) and lines[i] == last + 1:
+                last = lines[i]
+                i += 1
+            self._highlight_range(first, last)
+
+    def _highlight_range(self, first, last):
+        start, end = f"{first}.0", f"{last}.end"
+        for word in RESERVED_WORDS:
+            self.input_text.tag_remove(word, start, end)
+        tokens, _ = self.highlight_lexer.tokenize(self.input_text.get(start, end))
+        for token_type, value, line, col in tokens:
+            if token_type in RESERVED_WORDS:
+                line += first - 1
+                self.input_text.tag_add(token_type, f"{line}.{col}", f"{line}.{col + len(value)}")
 
     # ------------------
-    # Tree drawing (one tab per parsed tree)
+    # Tree drawing (all parsed trees in one virtual view)
     # ------------------
     def draw_tree(self, tree):
-        # Clear old tabs
-        for tab in getattr(self, 'tree_tabs', []):
-            self.tree_notebook.forget(tab)
-        self.tree_tabs = []
-
-        if not tree:
-            return
-
-        V_SPACING = 60
-        H_SPACING = 90
-        FONT = ("Segoe UI", 11, "bold")
-        LEAF_FONT = ("Segoe UI", 10, "normal")
-        NODE_BG = "#e3eafc"
-        NODE_BORDER = "#5b9bd5"
-        ROOT_BG = "#d1f2eb"
-        ROOT_BORDER = "#148f77"
-        LEAF_BG = "#fff9e3"
-        LEAF_BORDER = "#f4d03f"
-
-        def get_subtree_width(node):
-            label, children = node if isinstance(node, tuple) and isinstance(node[1], list) else (node[0], None)
-            if children and len(children) > 0:
-                widths = [get_subtree_width(child) for child in children]
-                return max(sum(widths), H_SPACING * len(children))
-            else:
-                return H_SPACING
-
-        def get_tree_height(node, depth=1):
-            label, children = node if isinstance(node, tuple) and isinstance(node[1], list) else (node[0], None)
-            if children and len(children) > 0:
-                return max(get_tree_height(child, depth+1) for child in children)
-            else:
-                return depth
-
-        for idx, block in enumerate(tree, 1):
-            tab = ttk.Frame(self.tree_notebook)
-            self.tree_tabs.append(tab)
-            self.tree_notebook.add(tab, text=f"Árbol {idx}")
-
-            tree_width = get_subtree_width(block)
-            tree_height = get_tree_height(block)
-            canvas_width = max(500, tree_width + 100)
-            canvas_height = max(250, tree_height * V_SPACING + 80)
-
-            x_scroll = tk.Scrollbar(tab, orient="horizontal")
-            y_scroll = tk.Scrollbar(tab, orient="vertical")
-            canvas = tk.Canvas(tab, bg="#fafdff",
-                                width=canvas_width, height=canvas_height,
-                                xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set,
-                                highlightthickness=0)
-            x_scroll.config(command=canvas.xview)
-            y_scroll.config(command=canvas.yview)
-            canvas.grid(row=0, column=0, sticky="nsew")
-            y_scroll.grid(row=0, column=1, sticky="ns")
-            x_scroll.grid(row=1, column=0, sticky="ew")
-            tab.grid_rowconfigure(0, weight=1)
-            tab.grid_columnconfigure(0, weight=1)
-
-            def draw_node(node, x, y, is_root=False):
-                label, children = (
-                    node if isinstance(node, tuple) and isinstance(node[1], list)
-                    else (node[0], None)
-                )
-
-                NODE_RADIUS_Y = 24
-                LINE_COLOR = "#4a6fa5"
-                LINE_WIDTH = 3
-                RED_LEN = 15
-
-                if children and len(children) > 0:
-                    parent_red_start_y = y + NODE_RADIUS_Y
-                    parent_red_end_y = parent_red_start_y + RED_LEN
-
-                    SMALL_LINE = 15
-
-                    canvas.create_line(x, parent_red_start_y, x, parent_red_end_y, width=2, fill="#4a6fa5", capstyle=tk.ROUND)
-
-                    child_y = y + V_SPACING
-                    child_edge_top_y = child_y - NODE_RADIUS_Y
-
-                    widths = [get_subtree_width(child) for child in children]
-                    total_width = sum(widths)
-                    effective_width = max(total_width, H_SPACING * len(children))
-                    start_x = x - effective_width // 2
-                    child_centers = []
-                    current_x = start_x
-
-                    for i, child in enumerate(children):
-                        w = widths[i]
-                        effective_w = max(w, H_SPACING)
-                        child_x = current_x + effective_w // 2
-                        child_centers.append(child_x)
-                        current_x += effective_w
-
-                    canvas.create_line(x, parent_red_end_y, x, child_edge_top_y, width=LINE_WIDTH, fill=LINE_COLOR, capstyle=tk.ROUND)
-
-                    if len(child_centers) > 0:
-                        canvas.create_line(child_centers[0], child_edge_top_y, child_centers[-1], child_edge_top_y, width=LINE_WIDTH, fill=LINE_COLOR, capstyle=tk.ROUND)
-
-                    for child_x in child_centers:
-                        canvas.create_line(child_x, child_edge_top_y, child_x, child_edge_top_y + SMALL_LINE, width=2, fill="#4a6fa5", capstyle=tk.ROUND)
-
-                    for i, child in enumerate(children):
-                        draw_node(child, child_centers[i], child_y, is_root=False)
-
-                if is_root:
-                    bg, border = ROOT_BG, ROOT_BORDER
-                elif children and len(children) > 0:
-                    bg, border = NODE_BG, NODE_BORDER
-                else:
-                    bg, border = LEAF_BG, LEAF_BORDER
-
-                if children:
-                    text = f"<{label}>"
-                    font = FONT
-                    if label == "HOSTS_LIST":
-                        y_draw = y + 15
-                    else:
-                        y_draw = y
-                else:
-                    # leaf label structure: ('NUMBER', '5') or ('IDENTIFIER', 'Escuela')
-                    text = str(node[1]) if isinstance(node, tuple) else str(node)
-                    font = LEAF_FONT
-                    y_draw = y + 15
-
-                bbox = canvas.create_text(x, y_draw, text=text, font=font, fill="#222", anchor="c")
-                bb = canvas.bbox(bbox)
-                canvas.delete(bbox)
-
-                pad_x, pad_y = 18, 14
-                x0, y0 = bb[0] - pad_x, bb[1] - pad_y
-                x1, y1 = bb[2] + pad_x, bb[3] + pad_y
-
-                min_width = 80
-                current_width = x1 - x0
-                if current_width < min_width:
-                    diff = (min_width - current_width) / 2
-                    x0 -= diff
-                    x1 += diff
-
-                canvas.create_oval(x0, y0, x1, y1, fill=bg, outline=border, width=2)
-                canvas.create_text(x, y_draw, text=text, font=font, fill="#222", anchor="c")
-
-            root_x = canvas_width // 2
-            root_y = 40
-            draw_node(block, root_x, root_y, is_root=True)
-            canvas.config(scrollregion=(0, 0, canvas_width, canvas_height))
+        self.tree_view.set_tree(tree)
 
 # Run guard for debugging directly
 if __name__ == "__main__":
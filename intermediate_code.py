@@ -1,12 +1,16 @@
 from ir import IREmitter
 from optimizer import IROptimizer
+import tracing
 
 class IntermediateCodeGenerator:
     def __init__(self, blocks):
         self.blocks = blocks
         self.emitter = IREmitter()
         self.optimizer = IROptimizer()
+        # Instrucciones optimizadas de la última llamada a generate()
+        self.optimized_ir = []
 
+    @tracing.traced("ir.generate")
     def generate(self):
         """
         Genera el código intermedio.
@@ -35,6 +39,6 @@ class IntermediateCodeGenerator:
             self.emitter.emit("END_BLOCK", name, None, None)
 
         ir = self.emitter.instructions
-        optimized_ir = self.optimizer.optimize(ir)
+        self.optimized_ir = self.optimizer.optimize(ir)
 
-        return "\n".join(str(i) for i in optimized_ir)
+        return "\n".join(str(i) for i in self.optimized_ir)
@@ -1,14 +1,18 @@
 # lexer.py
 import re
 
+import tracing
+
 class VLSMLexer:
     def __init__(self):
         # Define los patrones de tokens y su tipo
         self.tokens = [
-            (r'\bIP\b', 'IP'),
-            (r'\bMASK\b', 'MASK'),
-            (r'\bHOSTS\b', 'HOSTS'),
-            (r'\bNAME\b', 'NAME'),
+            (r'IP\b', 'IP'),
+            (r'MASK\b', 'MASK'),
+            (r'HOSTS\b', 'HOSTS'),
+            (r'NAME\b', 'NAME'),
+            (r'INCLUDE\b', 'INCLUDE'),
+            (r'"[^"\n]*"', 'STRING'),
             (r'[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+', 'IP_ADDRESS'),
             (r'/\d+', 'SUBNET_MASK'),
             (r'\d+', 'NUMBER'),
@@ -17,27 +21,40 @@ class VLSMLexer:
             (r';', 'FIN_SENTENCIA'),
             (r'\s+', None),
         ]
+        # Los patrones se compilan una sola vez y se aplican por posición
+        # sobre el texto completo, sin recortar la cadena en cada token.
+        # Las palabras reservadas no llevan \b inicial: antes cada patrón se
+        # aplicaba al resto de la cadena, donde el inicio siempre es frontera.
+        self.compiled = [(re.compile(pattern), token_type) for pattern, token_type in self.tokens]
+        self.fragment = re.compile(r'\S+')
 
     def tokenize(self, code):
         """
         Convierte el código fuente en una lista de tokens y errores léxicos.
         """
+        with tracing.span("lexer.tokenize", bytes=len(code)):
+            tokens, errors = self._tokenize(code)
+        tracing.counter("tokens", len(tokens))
+        tracing.counter("errores_lexicos", len(errors))
+        return tokens, errors
+
+    def _tokenize(self, code):
         tokens, errors = [], []
         line_num, col_num, last_type = 1, 0, None
-        while code:
+        pos, length = 0, len(code)
+        while pos < length:
             match = None
-            for pattern, token_type in self.tokens:
-                regex = re.compile(pattern)
-                match = regex.match(code)
+            for regex, token_type in self.compiled:
+                match = regex.match(code, pos)
                 if match:
                     text = match.group(0)
-                    lines = text.split("\n")
-                    if len(lines) > 1:
-                        line_num += len(lines) - 1
-                        col_num = len(lines[-1])
+                    newlines = text.count("\n")
+                    if newlines:
+                        line_num += newlines
+                        col_num = len(text) - text.rfind("\n") - 1
                     else:
                         col_num += len(text)
-                    code = code[len(text):]
+                    pos = match.end()
                     if token_type:
                         start = col_num - len(text)
                         # Solo acepta IDENTIFIER si el token anterior fue NAME
@@ -49,8 +66,8 @@ class VLSMLexer:
                     break
             if not match:
                 # Si no hay coincidencia, reporta error y avanza
-                fragment = code.split()[0] if code.strip() else code
+                fragment = self.fragment.match(code, pos).group(0)
                 errors.append(f"Token no reconocido en línea {line_num}, pos {col_num}: {fragment}")
-                code = code[len(fragment):]
+                pos += len(fragment)
                 col_num += len(fragment)
         return tokens, errors
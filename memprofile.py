@@ -0,0 +1,214 @@
+# memprofile.py
+
+"""
+Perfil de memoria por fase del compilador.
+
+profile_plan() compila un plan con tracemalloc activo y, al terminar cada
+fase de pipeline.compile_plan() (y de los back ends pedidos), registra:
+
+    retenido       bytes que la fase deja vivos (diferencia de memoria actual)
+    pico           pico de la fase por encima de la memoria al iniciarla
+    actual         memoria trazada total al terminar la fase
+    objetos        asignaciones vivas al terminar la fase (aprox. objetos)
+
+Con esos datos calcula bytes por token (léxico), por bloque (sintáctico) y
+por subred (VLSM). Los presupuestos (budgets) se revisan al cerrar cada fase
+y al final; si alguno se excede se lanza MemoryBudgetExceeded.
+
+Presupuestos disponibles (en bytes):
+    pico, retenido                        totales de la corrida
+    pico_<fase>, retenido_<fase>          por fase (p. ej. pico_vlsm)
+    bytes_por_token, bytes_por_bloque, bytes_por_subred
+"""
+
+import tracemalloc
+
+from pipeline import compile_plan
+
+# Unidades aceptadas por parse_size()
+SIZE_UNITS = {"": 1, "B": 1, "K": 1 << 10, "KB": 1 << 10, "KIB": 1 << 10,
+              "M": 1 << 20, "MB": 1 << 20, "MIB": 1 << 20,
+              "G": 1 << 30, "GB": 1 << 30, "GIB": 1 << 30}
+
+# Métrica por unidad: (nombre, fase que la produce, conteo del plan)
+PER_UNIT_METRICS = [
+    ("bytes_por_token", "lexico", "tokens"),
+    ("bytes_por_bloque", "sintactico", "bloques"),
+    ("bytes_por_subred", "vlsm", "subredes"),
+]
+
+
+class MemoryBudgetExceeded(Exception):
+    """Se lanza cuando una métrica de memoria supera su presupuesto."""
+    def __init__(self, violations, report=None):
+        self.violations = violations
+        self.report = report
+        super().__init__("; ".join(
+            f"{metric}: {format_size(value)} > {format_size(budget)}"
+            for metric, value, budget in violations
+        ))
+
+
+def parse_size(text):
+    """Convierte '512MB', '2GiB' o '1048576' a bytes."""
+    text = str(text).strip().upper()
+    number = text.rstrip("BKMGI")
+    unit = text[len(number):]
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except (KeyError, ValueError):
+        raise ValueError(f"Tamaño inválido: {text}") from None
+
+
+def format_size(value):
+    for unit, size in (("GiB", 1 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if abs(value) >= size:
+            return f"{value / size:.1f} {unit}"
+    return f"{value:.0f} B"
+
+
+class PhaseMemoryTracker:
+    """
+    Registra la memoria de fases consecutivas. begin(fase) cierra la fase
+    anterior; finish() cierra la última.
+    """
+    def __init__(self, budgets=None, count_objects=True):
+        self.budgets = budgets or {}
+        self.count_objects = count_objects
+        self.phases = []
+        self.current = None
+        self.start_bytes = 0
+
+    def begin(self, phase):
+        self.finish()
+        self.current = phase
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def finish(self):
+        if self.current is None:
+            return
+        # El pico se lee antes de tomar la instantánea, que también asigna memoria
+        current, peak = tracemalloc.get_traced_memory()
+        record = {
+            "fase": self.current,
+            "retenido": current - self.start_bytes,
+            "pico": peak - self.start_bytes,
+            "actual": current,
+            "pico_absoluto": peak,
+            "objetos": None,
+        }
+        if self.count_objects:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            record["objetos"] = sum(stat.count for stat in snapshot.statistics("filename"))
+            del snapshot
+        self.phases.append(record)
+        self.current = None
+
+        violations = []
+        for metric in ("pico", "retenido"):
+            budget = self.budgets.get(f"{metric}_{record['fase']}")
+            if budget is not None and record[metric] > budget:
+                violations.append((f"{metric}_{record['fase']}", record[metric], budget))
+        if violations:
+            raise MemoryBudgetExceeded(violations)
+
+
+def _check_totals(report, budgets):
+    violations = []
+    for metric in ("pico", "retenido"):
+        budget = budgets.get(metric)
+        if budget is not None and report[metric] > budget:
+            violations.append((metric, report[metric], budget))
+    for metric, _, _ in PER_UNIT_METRICS:
+        budget = budgets.get(metric)
+        value = report["por_unidad"].get(metric)
+        if budget is not None and value is not None and value > budget:
+            violations.append((metric, value, budget))
+    if violations:
+        raise MemoryBudgetExceeded(violations, report)
+
+
+def profile_plan(code, backends=(), budgets=None, count_objects=True, link_includes=False):
+    """
+    Compila code midiendo la memoria de cada fase.
+
+    backends: artefactos de texto de artifacts.TEXT_ARTIFACTS ("asm",
+              "cisco", ...) que se generan y miden después del pipeline.
+    budgets: diccionario métrica -> bytes (ver el docstring del módulo).
+    link_includes: se pasa a compile_plan().
+
+    Retorna (plan, reporte). Lanza MemoryBudgetExceeded si se excede algún
+    presupuesto; el reporte parcial queda en la excepción.
+    """
+    budgets = budgets or {}
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracker = PhaseMemoryTracker(budgets, count_objects)
+
+    try:
+        try:
+            plan = compile_plan(code, progress=tracker.begin, link_includes=link_includes)
+            tracker.finish()
+
+            if backends:
+                from artifacts import TEXT_ARTIFACTS, NEEDS_VLSM
+                outputs = []
+                for name in backends:
+                    if name in NEEDS_VLSM and not plan['vlsm_results']:
+                        continue
+                    tracker.begin(name)
+                    # El texto se conserva hasta el final para medir lo retenido
+                    outputs.append(TEXT_ARTIFACTS[name][1](plan))
+                    tracker.finish()
+
+            current, _ = tracemalloc.get_traced_memory()
+        except MemoryBudgetExceeded as e:
+            e.report = {"fases": tracker.phases}
+            raise
+    finally:
+        if not started:
+            tracemalloc.stop()
+
+    counts = {
+        "tokens": len(plan['tokens']),
+        "bloques": len(plan['blocks']),
+        "subredes": len(plan['vlsm_results'] or []),
+        "instrucciones_ir": len(plan['ir']),
+    }
+    phases = {record["fase"]: record for record in tracker.phases}
+    per_unit = {}
+    for metric, phase, count_key in PER_UNIT_METRICS:
+        if phase in phases and counts[count_key]:
+            per_unit[metric] = phases[phase]["retenido"] / counts[count_key]
+
+    report = {
+        "fases": tracker.phases,
+        "pico": max((record["pico_absoluto"] for record in tracker.phases), default=0) - baseline,
+        "retenido": current - baseline,
+        "conteos": counts,
+        "por_unidad": per_unit,
+    }
+    _check_totals(report, budgets)
+    return plan, report
+
+
+def format_report(report):
+    """Tabla de texto con el reporte de profile_plan()."""
+    lines = [f"{'fase':<12} {'retenido':>12} {'pico':>12} {'actual':>12} {'objetos':>10}"]
+    for record in report["fases"]:
+        objects = "-" if record["objetos"] is None else f"{record['objetos']:,}"
+        lines.append(
+            f"{record['fase']:<12} {format_size(record['retenido']):>12} "
+            f"{format_size(record['pico']):>12} {format_size(record['actual']):>12} {objects:>10}"
+        )
+    if "pico" in report:
+        lines.append(f"pico total: {format_size(report['pico'])}   "
+                     f"retenido total: {format_size(report['retenido'])}")
+        for metric, value in report["por_unidad"].items():
+            lines.append(f"{metric}: {value:,.1f}")
+    return "\n".join(lines)
@@ -1,4 +1,7 @@
+import tracing
+
 class IROptimizer:
+    @tracing.traced("ir.optimize")
     def optimize(self, instructions):
         optimized = []
         last = None
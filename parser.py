@@ -1,5 +1,6 @@
 # parser.py
 from lexer import VLSMLexer
+import tracing
 
 class VLSMParser:
     def __init__(self, tokens):
@@ -7,25 +8,33 @@ class VLSMParser:
         self.tokens = tokens
         self.pos = 0
         self.errors = []
+        # Directivas INCLUDE encontradas por parse(), en orden
+        self.includes = []
 
     def parse(self):
         """
         Analiza la lista de tokens y construye los bloques sintácticos.
         """
         results = []
-        while self.pos < len(self.tokens):
-            try:
-                results.append(self.parse_block())
-            except SyntaxError as e:
-                self.errors.append(str(e))
-                self.synchronize()
+        with tracing.span("parser.parse", tokens=len(self.tokens)):
+            while self.pos < len(self.tokens):
+                try:
+                    if self.tokens[self.pos][0] == 'INCLUDE':
+                        self.includes.append(self.parse_include())
+                    else:
+                        results.append(self.parse_block())
+                except SyntaxError as e:
+                    self.errors.append(str(e))
+                    self.synchronize()
+        tracing.counter("bloques", len(results))
+        tracing.counter("errores_sintacticos", len(self.errors))
         return results
 
     def synchronize(self):
         """
-        Avanza hasta el siguiente bloque IP para recuperarse de errores.
+        Avanza hasta el siguiente bloque IP (o INCLUDE) para recuperarse de errores.
         """
-        while self.pos < len(self.tokens) and self.tokens[self.pos][0] != 'IP':
+        while self.pos < len(self.tokens) and self.tokens[self.pos][0] not in ('IP', 'INCLUDE'):
             self.pos += 1
 
     def parse_block(self):
@@ -55,6 +64,19 @@ class VLSMParser:
             'name': name
         }
 
+    def parse_include(self):
+        """
+        Analiza una directiva INCLUDE "archivo"; y regresa la ruta incluida
+        (sin comillas) con su línea.
+        """
+        line = self.tokens[self.pos][2]
+        self.expect('INCLUDE')
+        path = self.expect('STRING')[1:-1]
+        if not path.strip():
+            raise SyntaxError(f"INCLUDE requiere un nombre de archivo en línea {line}")
+        self.expect('FIN_SENTENCIA')
+        return {'archivo': path, 'linea': line}
+
     def parse_hosts(self):
         """
         Analiza la lista de hosts solicitados (puede ser una lista separada por comas).
@@ -96,13 +118,18 @@ class VLSMParser:
         results = []
         current_pos = self.pos 
         self.pos = 0
-        while self.pos < len(self.tokens):
-            try:
-                node = self.parse_block_tree()
-                results.append(node)
-                self.tree.append(node)
-            except SyntaxError:
-                self.synchronize() 
+        with tracing.span("parser.parse_with_tree", tokens=len(self.tokens)):
+            while self.pos < len(self.tokens):
+                try:
+                    # Las directivas INCLUDE no forman parte del árbol
+                    if self.tokens[self.pos][0] == 'INCLUDE':
+                        self.parse_include()
+                        continue
+                    node = self.parse_block_tree()
+                    results.append(node)
+                    self.tree.append(node)
+                except SyntaxError:
+                    self.synchronize() 
         self.pos = current_pos
         return results
 
@@ -0,0 +1,186 @@
+# pipeline.py
+
+"""
+Pipeline completo del compilador sin interfaz gráfica.
+
+compile_plan() ejecuta las mismas fases que VLSMApp.analyze:
+léxico -> sintáctico (bloques y árbol) -> semántico -> VLSM -> IR optimizado,
+y regresa un diccionario con el resultado de cada fase. Los back ends
+(Cisco, ASM, exportadores) trabajan después sobre ese plan compilado.
+
+La compilación puede reportar el avance de cada fase y cancelarse entre
+fases (o entre bloques durante el cálculo VLSM) con un threading.Event,
+lo que permite ejecutarla en un hilo de trabajo desde la GUI.
+"""
+
+from lexer import VLSMLexer
+from parser import VLSMParser
+from semantic import VLSMSemanticAnalyzer
+from vlsm_calc import calculate_vlsm
+from intermediate_code import IntermediateCodeGenerator
+import tracing
+
+# Versión del compilador; cambia cuando cambia la salida de alguna fase
+COMPILER_VERSION = "1.1"
+
+# Fases de compile_plan(), en orden
+PHASES = ["lexico", "sintactico", "arbol", "semantico", "vlsm", "ir"]
+
+
+class CompileCancelled(Exception):
+    """Se lanza cuando se cancela una compilación en curso."""
+    pass
+
+
+def _check_cancel(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise CompileCancelled("Compilación cancelada")
+
+
+def plan_key(code, link_includes=False):
+    """
+    Clave de un plan compilado: hash del texto, de COMPILER_VERSION y de
+    link_includes. Dos planes con la misma clave tienen los mismos
+    resultados; compile_plan() la guarda en plan['key'].
+    """
+    import hashlib
+    digest = hashlib.sha256(f"{COMPILER_VERSION}\0{int(link_includes)}\0".encode())
+    digest.update(code.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def vlsm_cache_key(block):
+    """Clave de un bloque para memorizar su cálculo VLSM."""
+    return (block['ip_address'], block['subnet_mask'], tuple(block['num_hosts']), block.get('name'))
+
+
+def calculate_block_vlsm(block):
+    """
+    Calcula las subredes de un bloque dentro de la fase VLSM, con su span
+    vlsm.bloque y el contador de subredes.
+    """
+    with tracing.span("vlsm.bloque", nombre=block.get('name'), subredes=len(block['num_hosts'])):
+        results = calculate_vlsm(block['ip_address'], block['subnet_mask'],
+                                 block['num_hosts'], block.get('name'))
+    tracing.counter("subredes", len(results))
+    return results
+
+
+def calculate_plan_vlsm(blocks, cancel_event=None, cache=None):
+    """
+    Calcula las subredes de todos los bloques, en orden.
+
+    cache: objeto opcional con get(clave) y asignación por clave (un dict o
+           un LRU) donde se memorizan los resultados de cada bloque; las
+           subredes memorizadas se comparten y no deben modificarse.
+    """
+    all_results = []
+    for block in blocks:
+        _check_cancel(cancel_event)
+        results = None
+        if cache is not None:
+            key = vlsm_cache_key(block)
+            results = cache.get(key)
+        if results is None:
+            results = calculate_block_vlsm(block)
+            if cache is not None:
+                cache[key] = results
+        all_results.extend(results)
+    return all_results
+
+
+@tracing.traced("pipeline.compile_plan")
+def compile_plan(code, progress=None, cancel_event=None, vlsm_cache=None, link_includes=False):
+    """
+    Compila el texto de un plan y regresa un diccionario con:
+        tokens, lex_errors, blocks, syntax_errors, tree, semantic_errors,
+        vlsm_results (None si hubo errores), ir (instrucciones optimizadas),
+        includes (directivas INCLUDE del texto, sin resolver; ver units.py),
+        link_errors, ok (True si no hubo errores), key (plan_key()).
+
+    progress: función opcional que recibe el nombre de cada fase (PHASES)
+              justo antes de ejecutarla.
+    cancel_event: threading.Event opcional; si se activa, la compilación
+                  se detiene con CompileCancelled.
+    vlsm_cache: caché opcional de resultados VLSM por bloque
+                (ver calculate_plan_vlsm).
+    link_includes: True si quien llama enlaza los INCLUDE con units.py.
+                   Si es False, cada INCLUDE es un error de enlace: el plan
+                   compilado no tendría las redes de los archivos incluidos.
+    """
+    def phase(name):
+        _check_cancel(cancel_event)
+        if progress is not None:
+            progress(name)
+
+    plan = {
+        'tokens': [],
+        'lex_errors': [],
+        'blocks': [],
+        'syntax_errors': [],
+        'tree': [],
+        'semantic_errors': [],
+        'link_errors': [],
+        'vlsm_results': None,
+        'ir': [],
+        'includes': [],
+        'ok': False,
+        'key': plan_key(code, link_includes),
+    }
+
+    # LEXICAL
+    phase("lexico")
+    lexer = VLSMLexer()
+    tokens, lex_errors = lexer.tokenize(code)
+    plan['tokens'] = tokens
+    plan['lex_errors'] = lex_errors
+
+    # SYNTAX
+    phase("sintactico")
+    parser = VLSMParser(tokens)
+    blocks = parser.parse()
+    plan['blocks'] = blocks
+    plan['syntax_errors'] = parser.errors
+    plan['includes'] = parser.includes
+
+    phase("arbol")
+    plan['tree'] = VLSMParser(tokens).parse_with_tree()
+
+    # SEMANTIC
+    phase("semantico")
+    if not lex_errors and not parser.errors:
+        analyzer = VLSMSemanticAnalyzer(blocks)
+        if not analyzer.analyze():
+            plan['semantic_errors'] = analyzer.errors
+
+    if parser.includes and not link_includes:
+        plan['link_errors'] = [
+            f"Línea {include['linea']}: INCLUDE \"{include['archivo']}\" no se puede resolver aquí; "
+            f"compila el archivo con cli.py o watch.py para enlazar los archivos incluidos."
+            for include in parser.includes
+        ]
+
+    plan['ok'] = bool(blocks) and not (lex_errors or parser.errors or plan['semantic_errors']
+                                       or plan['link_errors'])
+
+    # VLSM
+    phase("vlsm")
+    if plan['ok']:
+        plan['vlsm_results'] = calculate_plan_vlsm(blocks, cancel_event, vlsm_cache)
+
+    # IR (se genera aunque haya errores, igual que en la GUI)
+    phase("ir")
+    generator = IntermediateCodeGenerator(blocks)
+    generator.generate()
+    plan['ir'] = generator.optimized_ir
+
+    return plan
+
+
+def plan_errors(plan):
+    """Lista de todos los errores del plan, con la fase de cada uno."""
+    errors = []
+    for phase, key in (("lexico", 'lex_errors'), ("sintactico", 'syntax_errors'),
+                       ("semantico", 'semantic_errors'), ("enlace", 'link_errors')):
+        errors.extend((phase, message) for message in plan.get(key, []))
+    return errors
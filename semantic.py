@@ -1,7 +1,8 @@
 # semantic.py
-import ipaddress
 import math
 from ir import IREmitter
+import tracing
+from vlsm_calc import ipaddress_module
 
 class VLSMSemanticAnalyzer:
     def __init__(self, blocks):
@@ -14,8 +15,12 @@ class VLSMSemanticAnalyzer:
         Analiza todos los bloques y acumula errores semánticos.
         """
         self.errors = []
-        for block in self.blocks:
-            self._validate_block(block)
+        with tracing.span("semantic.analyze", bloques=len(self.blocks)):
+            for block in self.blocks:
+                with tracing.span("semantic.bloque", nombre=block.get('name'),
+                                  subredes=len(block['num_hosts'])):
+                    self._validate_block(block)
+        tracing.counter("errores_semanticos", len(self.errors))
         return not bool(self.errors)
 
     def _validate_block(self, block):
@@ -26,6 +31,8 @@ class VLSMSemanticAnalyzer:
         - Hosts positivos
         - Espacio suficiente para subredes
         """
+        ipaddress = ipaddress_module()
+
         ip_addr_str = block['ip_address']
         cidr_str = block['subnet_mask']
         hosts_list = block['num_hosts']
@@ -0,0 +1,196 @@
+# sharding.py
+
+"""
+Reparto de un plan VLSM entre varios routers.
+
+generate_cisco_config() asume un único equipo con una interfaz por subred.
+Este módulo recibe un inventario de dispositivos con su capacidad de
+interfaces y subinterfaces, asigna los bloques de subredes a cada equipo
+con una estrategia first-fit decreasing y genera la configuración de cada
+uno en procesos paralelos, en archivos separados.
+
+Ejemplo de inventario:
+    [
+        {"hostname": "R1", "interfaces": 4},
+        {"hostname": "R2", "interfaces": 2, "subinterfaces": 100,
+         "interface_prefix": "GigabitEthernet0/"},
+    ]
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cisco_generator import CONFIG_HEADER, CONFIG_FOOTER, SUBNET_TEMPLATE, write_cisco_config
+
+# Bloque de cada subred cuando el equipo usa subinterfaces 802.1Q
+SUBINTERFACE_TEMPLATE = (
+    "! -------------------------------\n"
+    "! Subred: {name}\n"
+    "! Hosts solicitados: {hosts_solicitados}\n"
+    "! Hosts disponibles: {hosts_encontrados}\n"
+    "! -------------------------------\n"
+    "interface {iface}\n"
+    " description {name}\n"
+    " encapsulation dot1Q {vlan}\n"
+    " ip address {ip} {mask}\n"
+    " no shutdown\n"
+    " exit\n"
+    "\n"
+)
+
+# Las subinterfaces de un equipo usan las VLAN 1..N (dot1Q admite 1-4094)
+MAX_VLANS = 4094
+
+
+def device_capacity(device):
+    """
+    Cantidad de subredes que admite un dispositivo del inventario.
+    Con subinterfaces, cada interfaz física admite 'subinterfaces' subredes,
+    hasta MAX_VLANS por equipo (una VLAN por subinterfaz).
+    """
+    interfaces = device.get("interfaces", 0)
+    subinterfaces = device.get("subinterfaces", 0)
+    if not subinterfaces:
+        return interfaces
+    return min(interfaces * subinterfaces, MAX_VLANS)
+
+
+def _group_blocks(vlsm_results):
+    """
+    Agrupa las subredes consecutivas de un mismo bloque (nombre e IP base),
+    para intentar dejar cada red completa en un solo equipo.
+    """
+    blocks = []
+    last_key = None
+    for subnet in vlsm_results:
+        key = (subnet.get("nombre_red"), subnet.get("ip_base"))
+        if key != last_key:
+            blocks.append([])
+            last_key = key
+        blocks[-1].append(subnet)
+    return blocks
+
+
+def assign_subnets(vlsm_results, inventory):
+    """
+    Asigna las subredes a los dispositivos del inventario.
+
+    Los bloques se ordenan de mayor a menor y cada uno se coloca en el
+    primer equipo con espacio suficiente (first-fit decreasing). Si un
+    bloque no cabe completo en ningún equipo, se reparte entre los que
+    tienen más espacio libre.
+
+    Retorna una lista de shards (uno por dispositivo usado) con las claves
+    hostname, interface_prefix, subinterfaces y subnets.
+    Lanza ValueError si la capacidad total del inventario no alcanza.
+    """
+    if not inventory:
+        raise ValueError("El inventario de dispositivos está vacío.")
+
+    free = [device_capacity(device) for device in inventory]
+    assigned = [[] for _ in inventory]
+
+    blocks = _group_blocks(vlsm_results)
+    total = sum(len(block) for block in blocks)
+    if total > sum(free):
+        raise ValueError(
+            f"El inventario admite {sum(free)} subredes pero el plan tiene {total}."
+        )
+
+    for block in sorted(blocks, key=len, reverse=True):
+        for idx, space in enumerate(free):
+            if space >= len(block):
+                assigned[idx].extend(block)
+                free[idx] -= len(block)
+                break
+        else:
+            # El bloque no cabe completo: se reparte empezando por el
+            # equipo con más espacio libre
+            pending = block
+            for idx in sorted(range(len(free)), key=free.__getitem__, reverse=True):
+                if not pending:
+                    break
+                take = pending[:free[idx]]
+                assigned[idx].extend(take)
+                free[idx] -= len(take)
+                pending = pending[len(take):]
+
+    shards = []
+    for device, subnets in zip(inventory, assigned):
+        if subnets:
+            shards.append({
+                "hostname": device["hostname"],
+                "interface_prefix": device.get("interface_prefix", "GigabitEthernet0/"),
+                "subinterfaces": device.get("subinterfaces", 0),
+                "subnets": subnets,
+            })
+    return shards
+
+
+def _shard_interfaces(shard):
+    """
+    Nombres de interfaz de cada subred del shard y lista de interfaces
+    físicas que deben habilitarse (solo con subinterfaces).
+    """
+    prefix = shard["interface_prefix"]
+    per_port = shard["subinterfaces"]
+    count = len(shard["subnets"])
+
+    if not per_port:
+        return [f"{prefix}{i}" for i in range(count)], []
+
+    names = [f"{prefix}{i // per_port}.{i + 1}" for i in range(count)]
+    parents = [f"{prefix}{port}" for port in range((count + per_port - 1) // per_port)]
+    return names, parents
+
+
+def render_shard(shard, path):
+    """
+    Escribe en path la configuración de un dispositivo.
+    Se ejecuta dentro de los procesos de trabajo de render_shards().
+    """
+    start = time.perf_counter()
+    interfaces, parents = _shard_interfaces(shard)
+
+    header = f"{CONFIG_HEADER}hostname {shard['hostname']}\n!\n"
+    footer = "".join(f"interface {parent}\n no shutdown\n exit\n\n" for parent in parents)
+    footer += CONFIG_FOOTER
+    template = SUBINTERFACE_TEMPLATE if shard["subinterfaces"] else SUBNET_TEMPLATE
+
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        count = write_cisco_config(
+            shard["subnets"], f, template=template, header=header,
+            footer=footer, interfaces=interfaces
+        )
+
+    return {
+        "hostname": shard["hostname"],
+        "archivo": path,
+        "subredes": count,
+        "segundos": time.perf_counter() - start,
+    }
+
+
+def render_shards(shards, output_dir, max_workers=None, extension=".ioscfg"):
+    """
+    Genera en paralelo un archivo de configuración por dispositivo dentro
+    de output_dir. Retorna un reporte por dispositivo (ver render_shard()).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, f"{shard['hostname']}{extension}") for shard in shards]
+
+    if len(shards) <= 1 or max_workers == 1:
+        return [render_shard(shard, path) for shard, path in zip(shards, paths)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(render_shard, shards, paths))
+
+
+def shard_cisco_config(vlsm_results, inventory, output_dir, max_workers=None):
+    """
+    Asigna las subredes al inventario y genera la configuración de cada
+    dispositivo en output_dir.
+    """
+    shards = assign_subnets(vlsm_results, inventory)
+    return render_shards(shards, output_dir, max_workers)
@@ -0,0 +1,97 @@
+# summarization.py
+
+"""
+Resumen de rutas a partir de resultados VLSM.
+
+Convierte cada subred en un rango de enteros [red, broadcast + 1), ordena
+y une los rangos contiguos o traslapados, y descompone cada rango unido en
+el conjunto mínimo de prefijos CIDR que lo cubre exactamente. El costo es
+O(n log n) por el ordenamiento.
+"""
+
+
+def ip_to_int(ip):
+    """Convierte una IP en formato decimal con puntos a entero de 32 bits."""
+    a, b, c, d = ip.split(".")
+    return (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+
+
+def int_to_ip(value):
+    """Convierte un entero de 32 bits a formato decimal con puntos."""
+    return f"{value >> 24 & 255}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+def prefix_to_mask(prefix):
+    """Máscara decimal (255.255.255.x) de una longitud de prefijo."""
+    return int_to_ip((0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF)
+
+
+def summarize_ranges(ranges):
+    """
+    Recibe rangos (inicio, fin) semiabiertos y retorna la lista mínima de
+    prefijos (red, longitud) que cubre exactamente su unión.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    prefixes = []
+    for start, end in merged:
+        while start < end:
+            # El bloque más grande alineado en 'start' que no se pasa de 'end'
+            size = start & -start if start else 1 << 32
+            while size > end - start:
+                size >>= 1
+            prefixes.append((start, 33 - size.bit_length()))
+            start += size
+    return prefixes
+
+
+def subnet_range(subnet):
+    """Rango [red, broadcast + 1) de una subred calculada por calculate_vlsm()."""
+    return (
+        ip_to_int(subnet["direccionamiento_de_red"]),
+        ip_to_int(subnet["direccion_de_broadcast"]) + 1,
+    )
+
+
+def summary_records(prefixes, nombre_red=None):
+    """
+    Convierte prefijos (red, longitud) en diccionarios con las mismas claves
+    que usan los resultados de calculate_vlsm().
+    """
+    return [
+        {
+            "direccionamiento_de_red": int_to_ip(network),
+            "nueva_mascara": f"/{prefix}",
+            "mascara_decimal": prefix_to_mask(prefix),
+            "nombre_red": nombre_red,
+        }
+        for network, prefix in prefixes
+    ]
+
+
+def summarize_vlsm(vlsm_results, per_block=True):
+    """
+    Calcula las rutas resumidas de un plan VLSM.
+
+    per_block=True resume cada red (nombre e IP base) por separado;
+    per_block=False resume todas las subredes del plan juntas.
+    Retorna una lista de diccionarios de resumen (ver summary_records()).
+    """
+    if not per_block:
+        return summary_records(summarize_ranges(subnet_range(s) for s in vlsm_results))
+
+    groups = {}
+    for subnet in vlsm_results:
+        key = (subnet.get("nombre_red"), subnet.get("ip_base"))
+        groups.setdefault(key, []).append(subnet_range(subnet))
+
+    summaries = []
+    for (nombre_red, _), ranges in groups.items():
+        summaries.extend(summary_records(summarize_ranges(ranges), nombre_red))
+    return summaries
@@ -0,0 +1,35 @@
+# tests/test_artifacts.py
+
+import tracing
+from artifacts import _table_key, emit_artifacts
+from pipeline import compile_plan
+
+PLAN = "IP 192.168.0.0 MASK /24 HOSTS 50, 20 NAME Oficina;"
+
+
+def test_table_key_uses_plan_key():
+    plan = compile_plan(PLAN)
+    assert _table_key("csv", plan) == _table_key("csv", compile_plan(PLAN))
+    assert _table_key("csv", plan) != _table_key("jsonl", plan)
+    assert _table_key("csv", plan) != _table_key("csv", compile_plan(PLAN.replace("20", "21")))
+
+
+def test_unchanged_table_artifact_skipped(tmp_path):
+    reports = emit_artifacts(compile_plan(PLAN), ["csv", "jsonl"], str(tmp_path))
+    assert [report["estado"] for report in reports] == ["escrito", "escrito"]
+    reports = emit_artifacts(compile_plan(PLAN), ["csv", "jsonl"], str(tmp_path))
+    assert [report["estado"] for report in reports] == ["sin_cambios", "sin_cambios"]
+    reports = emit_artifacts(compile_plan(PLAN.replace("20", "21")), ["csv"], str(tmp_path))
+    assert reports[0]["estado"] == "escrito"
+
+
+def test_process_pool_spans_reach_parent_tracer(tmp_path):
+    tracer = tracing.start_tracing()
+    try:
+        reports = emit_artifacts(compile_plan(PLAN), ["cisco", "csv"], str(tmp_path),
+                                 max_workers=2, use_processes=True)
+    finally:
+        tracing.stop_tracing()
+    assert all("traza" not in report for report in reports)
+    names = {event["name"] for event in tracer.events}
+    assert {"artefacto.cisco", "artefacto.csv"} <= names
@@ -0,0 +1,75 @@
+# tests/test_cache.py
+
+import os
+
+import cache as cache_module
+from cache import PlanCache, compile_cached
+
+PLAN = "IP 192.168.0.0 MASK /24 HOSTS 50, 20 NAME Oficina;"
+
+
+def _plan(i):
+    return f"IP 10.{i}.0.0 MASK /24 HOSTS 50, 20 NAME Red{i};"
+
+
+def test_hit_returns_stored_plan_and_texts(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    plan, texts, hit = compile_cached(PLAN, ["cisco"], cache)
+    assert not hit and plan['ok'] and "cisco" in texts
+
+    cached_plan, cached_texts, hit = compile_cached(PLAN, ["cisco"], cache)
+    assert hit
+    assert cached_plan['vlsm_results'] == plan['vlsm_results']
+    assert cached_texts == texts
+
+    # Un artefacto nuevo se genera desde el plan guardado y se agrega a la entrada
+    _, texts, hit = compile_cached(PLAN, ["cisco", "asm"], cache)
+    assert hit and set(texts) == {"cisco", "asm"}
+    assert set(cache.get(cache.key(PLAN))["textos"]) == {"cisco", "asm"}
+    # La clave distingue el modo de enlace
+    assert not compile_cached(PLAN, (), cache, link_includes=True)[2]
+
+
+def test_corrupt_entry_is_removed_and_recompiled(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    compile_cached(PLAN, ["cisco"], cache)
+    path = cache._path(cache.key(PLAN))
+    with open(path, "wb") as f:
+        f.write(b"no es un pickle")
+
+    assert cache.get(cache.key(PLAN)) is None
+    assert not os.path.exists(path)
+    plan, texts, hit = compile_cached(PLAN, ["cisco"], cache)
+    assert not hit and plan['ok'] and texts["cisco"]
+    assert cache.get(cache.key(PLAN)) is not None
+
+    # Una entrada guardada con otra clave tampoco se usa
+    other = cache.key(_plan(1))
+    os.makedirs(os.path.dirname(cache._path(other)), exist_ok=True)
+    os.replace(path, cache._path(other))
+    assert cache.get(other) is None
+    assert not os.path.exists(cache._path(other))
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    keys = []
+    for i in range(3):
+        compile_cached(_plan(i), (), cache)
+        keys.append(cache.key(_plan(i)))
+        os.utime(cache._path(keys[-1]), (1000 + i, 1000 + i))
+
+    # Leer la entrada más antigua la vuelve la más reciente
+    assert cache.get(keys[0]) is not None
+    sizes = [os.path.getsize(cache._path(key)) for key in keys]
+    cache.max_bytes = (sum(sizes) - min(sizes) / 2) / cache_module.EVICT_TARGET
+
+    assert cache.evict() == 1
+    assert [os.path.exists(cache._path(key)) for key in keys] == [True, False, True]
+    assert cache.stats()["entradas"] == 2
+
+
+def test_put_evicts_over_max_bytes(tmp_path):
+    cache = PlanCache(str(tmp_path), max_bytes=1)
+    compile_cached(PLAN, ["cisco"], cache)
+    assert cache.size() == 0
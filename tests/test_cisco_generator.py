@@ -0,0 +1,87 @@
+# tests/test_cisco_generator.py
+
+import pytest
+
+from cisco_generator import SUBNET_TEMPLATE, compile_template
+from sharding import SUBINTERFACE_TEMPLATE
+from vlsm_calc import calculate_vlsm
+
+
+@pytest.mark.parametrize("template", [SUBNET_TEMPLATE, SUBINTERFACE_TEMPLATE])
+def test_compiled_template_matches_format(template):
+    subnet = calculate_vlsm("10.0.0.0", "/24", [50], "A")[0]
+    render = compile_template(template)
+    expected = template.format(**subnet, index=4, vlan=5, iface="Gi0/0.5", name="Sub 5",
+                               ip=subnet["direccionamiento_de_red"], mask=subnet["mascara_decimal"])
+    assert render(subnet, 4, "Gi0/0.5", "Sub 5") == expected
+
+
+def test_compiled_template_edge_cases():
+    assert compile_template("sin campos 100%")({}, 0, "", "") == "sin campos 100%"
+    assert compile_template("{vlan}")({}, 0, "", "") == "1"
+    assert compile_template("{x} {x} {name}")({"x": 7}, 0, "", "n") == "7 7 n"
+    with pytest.raises(KeyError):
+        compile_template("{falta}")({}, 0, "", "")
+    with pytest.raises(ValueError):
+        compile_template("{a.b}")
+    with pytest.raises(ValueError):
+        compile_template("{name:>5}")
+
+
+def _delta(old, new):
+    import io
+    from cisco_generator import write_cisco_delta
+    buffer = io.StringIO()
+    summary = write_cisco_delta(old, new, buffer)
+    return summary, buffer.getvalue()
+
+
+def test_delta_inserted_subnet_adds_one_interface():
+    old = calculate_vlsm("10.0.0.0", "/24", [50, 20, 10], "A") + calculate_vlsm("10.0.1.0", "/24", [5], "B")
+    # Una subred más grande se inserta antes de las de 20 y 10 hosts
+    new = calculate_vlsm("10.0.0.0", "/24", [50, 30, 20, 10], "A") + calculate_vlsm("10.0.1.0", "/24", [5], "B")
+
+    summary, text = _delta(old, new)
+
+    assert (summary["agregadas"], summary["eliminadas"]) == (1, 0)
+    # Las subredes existentes conservan su interfaz; la nueva usa una libre
+    assert summary["interfaces"] == ["GigabitEthernet0/0", "GigabitEthernet0/4", "GigabitEthernet0/1",
+                                     "GigabitEthernet0/2", "GigabitEthernet0/3"]
+    assert text.count(" no shutdown\n") == 1
+    assert "interface GigabitEthernet0/4\n description A\n ip address 10.0.0.64 255.255.255.224\n" in text
+    # B no cambia: no aparece en el delta
+    assert "GigabitEthernet0/3" not in text
+
+
+def test_delta_appended_and_removed_subnets():
+    old = calculate_vlsm("10.0.0.0", "/24", [50, 20, 10], "A")
+    summary, text = _delta(old, calculate_vlsm("10.0.0.0", "/24", [50, 20, 10, 5], "A"))
+    assert summary["agregadas"] == 1 and summary["sin_cambios"] == 3 and summary["modificadas"] == 0
+
+    summary, text = _delta(old, calculate_vlsm("10.0.0.0", "/24", [50, 10], "A"))
+    assert (summary["eliminadas"], summary["agregadas"], summary["sin_cambios"]) == (1, 0, 1)
+    assert summary["interfaces"] == ["GigabitEthernet0/0", "GigabitEthernet0/2"]
+    assert text.index("interface GigabitEthernet0/1\n no description") < text.index("Asignación")
+
+
+def test_delta_without_changes():
+    plan = calculate_vlsm("10.0.0.0", "/24", [50, 20], "A")
+    summary, text = _delta(plan, iter(list(plan)))
+    assert summary["sin_cambios"] == 2
+    assert "interface" not in text
+
+
+def test_delta_resized_subnet_keeps_its_interface():
+    old = calculate_vlsm("10.0.0.0", "/24", [50, 20, 10], "A")
+
+    # 20 -> 30 hosts: la subred sigue siendo una /27 en la misma dirección
+    summary, text = _delta(old, calculate_vlsm("10.0.0.0", "/24", [50, 30, 10], "A"))
+    assert summary["sin_cambios"] == 3
+    assert "interface" not in text
+
+    # 20 -> 40 hosts: pasa a /26 y la subred de 10 hosts se recorre
+    summary, text = _delta(old, calculate_vlsm("10.0.0.0", "/24", [50, 40, 10], "A"))
+    assert (summary["agregadas"], summary["eliminadas"], summary["modificadas"]) == (0, 0, 2)
+    assert summary["interfaces"] == ["GigabitEthernet0/0", "GigabitEthernet0/1", "GigabitEthernet0/2"]
+    assert "interface GigabitEthernet0/1\n ip address 10.0.0.64 255.255.255.192\n" in text
+    assert text.count(" no ip address\n") == 2
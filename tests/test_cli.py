@@ -0,0 +1,59 @@
+# tests/test_cli.py
+
+import io
+import json
+
+import pytest
+
+import cache
+import cli
+
+PLAN = "IP 192.168.0.0 MASK /24 HOSTS 50, 20 NAME Oficina;"
+
+
+def _plans(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"plan{i}.vlsm"
+        path.write_text(PLAN, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def _failing_compile(code, **options):
+    raise RuntimeError("fallo simulado")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_worker_exception_reported_per_file(tmp_path, monkeypatch, jobs):
+    # Con jobs=2 los trabajadores heredan el parche al bifurcarse el pool
+    monkeypatch.setattr(cli, "compile_plan", _failing_compile)
+    paths = _plans(tmp_path, 2)
+    out = io.StringIO()
+    results = cli.run(paths, jobs=jobs, out=out)
+
+    assert sorted(result["archivo"] for result in results) == paths
+    assert not any(result["ok"] for result in results)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    errors = [r for r in records if r["tipo"] == "diagnostico"]
+    assert sorted(r["archivo"] for r in errors) == paths
+    assert all(r["fase"] == "interno" and "fallo simulado" in r["mensaje"] for r in errors)
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch, capsys):
+    default_dir = tmp_path / "cache"
+    monkeypatch.setattr(cache, "DEFAULT_CACHE_DIR", str(default_dir))
+    monkeypatch.delenv(cache.CACHE_ENV, raising=False)
+    paths = _plans(tmp_path, 1)
+
+    assert cli.main(paths) == cli.EXIT_OK
+    assert not default_dir.exists()
+
+    assert cli.main(paths + ["--cache"]) == cli.EXIT_OK
+    assert default_dir.is_dir()
+
+    env_dir = tmp_path / "env"
+    monkeypatch.setenv(cache.CACHE_ENV, str(env_dir))
+    assert cli.main(paths + ["--no-cache"]) == cli.EXIT_OK
+    assert not env_dir.exists()
+    capsys.readouterr()
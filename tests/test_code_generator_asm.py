@@ -0,0 +1,96 @@
+# tests/test_code_generator_asm.py
+
+import re
+
+from code_generator_asm import ASMCodeGenerator, PackedASMCodeGenerator
+from pipeline import compile_plan
+
+PLAN = """
+IP 192.168.0.0 MASK /24 HOSTS 100, 50, 20 NAME Oficina;
+IP 10.0.0.0 MASK /16 HOSTS 2000, 500, 30, 2 NAME Campus;
+IP 172.16.0.0 MASK /28 HOSTS 6 NAME Enlace;
+"""
+
+_DB_ITEM = re.compile(r"'((?:[^']|'')*)'|\b([0-9A-Fa-f]+h|\d+)\b")
+
+
+def _db_bytes(operands):
+    """Bytes de los operandos de una directiva DB."""
+    data = bytearray()
+    for text, number in _DB_ITEM.findall(operands):
+        if number:
+            data.append(int(number[:-1], 16) if number.endswith("h") else int(number))
+        else:
+            data.extend(text.replace("''", "'").encode("latin-1"))
+    return bytes(data)
+
+
+def _data_labels(asm):
+    """Etiqueta -> bytes de la sección de datos del programa."""
+    labels, current = {}, None
+    data = asm.split("; === SECCION DE CODIGO ===")[0]
+    for line in data.splitlines():
+        start = re.match(r"^(\w+) DB (.*)$", line) or re.match(r"^(\w+):()$", line)
+        more = re.match(r"^\s+DB (.*)$", line)
+        if start:
+            current = start.group(1)
+            labels[current] = _db_bytes(start.group(2))
+        elif more and current:
+            labels[current] += _db_bytes(more.group(1))
+        else:
+            current = None
+    return labels
+
+
+def _run_packed(asm):
+    """
+    Intérprete en Python de las rutinas del programa empaquetado: recorre
+    tabla_config y regresa el texto que se escribiría en ROUTER.CFG.
+    """
+    labels = _data_labels(asm)
+
+    def text(label):
+        return labels[label].split(b"\0")[0]
+
+    def ip(value):
+        return ".".join(str((value >> shift) & 255) for shift in (24, 16, 8, 0)).encode()
+
+    table = labels["tabla_config"]
+    out = bytearray()
+    pos, name, sub, vlan = 0, b"", 1, 1
+    while True:
+        record = table[pos]
+        pos += 1
+        if record == PackedASMCodeGenerator.REG_TEXTO:
+            end = table.index(0, pos)
+            out += table[pos:end] + b"\r\n"
+            pos = end + 1
+        elif record == PackedASMCodeGenerator.REG_BLOQUE:
+            end = table.index(0, pos)
+            name, sub, pos = table[pos:end], 1, end + 1
+        elif record == PackedASMCodeGenerator.REG_SUBRED:
+            network = int.from_bytes(table[pos:pos + 4], "little")
+            prefix = table[pos + 4]
+            pos += 5
+            mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+            out += (text("txt_sub1") + str(vlan).encode() + text("txt_sub2") + name
+                    + text("txt_sub3") + str(sub).encode() + text("txt_sub4") + str(vlan).encode()
+                    + text("txt_sub5") + ip(network + 1) + text("txt_espacio") + ip(mask)
+                    + text("txt_sub6"))
+            vlan += 1
+            sub += 1
+        elif record == PackedASMCodeGenerator.REG_CIERRE:
+            out += text("txt_cierre")
+        else:
+            return out.decode("latin-1")
+
+
+def test_packed_program_writes_baseline_config():
+    plan = compile_plan(PLAN)
+    assert plan['ok']
+
+    baseline = ASMCodeGenerator(plan['ir'])._generate_config()
+    expected = "".join(f"{line}\r\n" for line in baseline)
+
+    assert _run_packed(PackedASMCodeGenerator(plan['ir']).generate()) == expected
+    assert "interface GigabitEthernet0/0.8" in expected
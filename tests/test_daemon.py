@@ -0,0 +1,67 @@
+# tests/test_daemon.py
+
+import asyncio
+import json
+import os
+
+import daemon
+from daemon import CompileServer
+
+PLAN = "IP 192.168.0.0 MASK /24 HOSTS 50, 20 NAME Oficina;"
+
+
+def _exchange(lines, **options):
+    """Arranca un servidor con hilos, envía lines y regresa las respuestas."""
+    async def run():
+        server = CompileServer(workers=1, use_processes=False, **options)
+        host, port = await server.start(host="127.0.0.1", port=0)
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            for line in lines:
+                writer.write(line if isinstance(line, bytes) else (json.dumps(line) + "\n").encode())
+            await writer.drain()
+            responses = []
+            for _ in lines:
+                raw = await asyncio.wait_for(reader.readline(), 30)
+                if not raw:
+                    break
+                responses.append(json.loads(raw))
+            writer.close()
+            return responses
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def _compile(request_id, salida):
+    return {"id": request_id, "op": "compilar", "codigo": PLAN, "artefactos": ["cisco"], "salida": salida}
+
+
+def test_salida_requires_output_root(tmp_path):
+    [response] = _exchange([_compile(1, str(tmp_path))])
+    assert "--output-root" in response["error"]
+    assert not os.listdir(tmp_path)
+
+
+def test_salida_confined_to_output_root(tmp_path):
+    root = tmp_path / "raiz"
+    root.mkdir()
+    outside = tmp_path / "fuera"
+    os.symlink(outside, root / "enlace")
+
+    responses = _exchange([_compile(1, "plan1"), _compile(2, str(outside)),
+                           _compile(3, "../fuera"), _compile(4, "enlace/x")],
+                          output_root=str(root))
+    by_id = {response["id"]: response for response in responses}
+
+    assert by_id[1]["ok"]
+    assert os.path.exists(root / "plan1" / "router_config.ioscfg")
+    for request_id in (2, 3, 4):
+        assert "dentro de" in by_id[request_id]["error"]
+    assert not outside.exists()
+
+
+def test_oversized_line_gets_error_response(monkeypatch):
+    monkeypatch.setattr(daemon, "MAX_LINE_BYTES", 1024)
+    [response] = _exchange([b"{" + b" " * 4096 + b"}\n"])
+    assert "1024 bytes" in response["error"]
@@ -0,0 +1,50 @@
+# tests/test_deploy.py
+
+import asyncio
+
+from cisco_generator import generate_cisco_config
+from deploy import ConfigDeployer, MockIOSServer, cisco_config_lines
+from vlsm_calc import calculate_vlsm
+
+SUBNETS = calculate_vlsm("10.0.0.0", "/24", [50, 20, 10], "A")
+
+
+def _deploy(device_config, **server_options):
+    async def run():
+        async with MockIOSServer(**server_options) as server:
+            deployer = ConfigDeployer(timeout=5, retries=2, backoff=0)
+            try:
+                device = dict(device_config, host=server.host, port=server.port, hostname="R1")
+                result = await deployer.push(device)
+            finally:
+                await deployer.close()
+            return result, server
+    return asyncio.run(run())
+
+
+def test_generator_config_survives_retry():
+    lines = generate_cisco_config(SUBNETS).splitlines()
+    # Con esta semilla el primer intento se corta y el segundo se confirma
+    result, server = _deploy({"config": iter(lines)}, failure_rate=0.5, seed=1)
+
+    assert result["ok"] and result["intentos"] == 2
+    assert result["lineas"] == len(lines)
+    assert server.commits == 1
+    assert len(server.device.interfaces) == 3
+
+
+def test_config_factory_streams_cisco_generator():
+    expected = generate_cisco_config(SUBNETS).splitlines()
+    assert list(cisco_config_lines(SUBNETS)) == expected
+
+    result, server = _deploy({"config_factory": lambda: cisco_config_lines(SUBNETS)})
+    assert result["ok"] and result["lineas"] == len(expected)
+    assert server.device.interfaces["GigabitEthernet0/1"].ip_address == "10.0.0.64"
+
+
+def test_end_inside_config_is_rejected():
+    result, server = _deploy({"config": ["interface Gi0/0", "end", "hostname X"]})
+
+    assert not result["ok"] and result["intentos"] == 1
+    assert "'end'" in result["error"]
+    assert server.commits == 0
@@ -0,0 +1,67 @@
+# tests/test_excel_export.py
+
+import pytest
+
+from excel_export import write_excel
+from vlsm_calc import calculate_vlsm
+
+openpyxl = pytest.importorskip("openpyxl")
+resource = pytest.importorskip("resource")
+
+
+@pytest.fixture
+def fd_limit():
+    """Baja el límite de descriptores de archivo del proceso a 256."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    limit = 256 if hard == resource.RLIM_INFINITY else min(256, hard)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    yield limit
+    resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def _records(networks):
+    for i in range(networks):
+        yield from calculate_vlsm(f"10.{i // 256}.{i % 256}.0", "/24", [50, 20], f"R{i}")
+
+
+def test_more_sheets_than_fd_limit(tmp_path, fd_limit):
+    networks = fd_limit * 2 + 100
+    path = tmp_path / "plan.xlsx"
+
+    assert write_excel(path, _records(networks)) == networks * 2
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert len(workbook.sheetnames) == networks
+    assert workbook.sheetnames[-1] == f"Red R{networks - 1}"
+    workbook.close()
+
+
+def test_repeated_network_gets_suffixed_sheet(tmp_path):
+    records = (calculate_vlsm("10.0.0.0", "/24", [50, 20], "A")
+               + calculate_vlsm("10.0.1.0", "/24", [10], "B")
+               + calculate_vlsm("10.0.2.0", "/24", [5], "A"))
+    path = tmp_path / "plan.xlsx"
+
+    assert write_excel(path, iter(records)) == 4
+
+    workbook = openpyxl.load_workbook(path)
+    assert workbook.sheetnames == ["Red A", "Red B", "Red A (2)"]
+    assert [row[0] for row in workbook["Red A"].values] == ["Subred", 1, 2]
+    # La numeración de la red continúa en su segunda hoja
+    assert [row[0] for row in workbook["Red A (2)"].values] == ["Subred", 3]
+
+
+def test_row_cap_rolls_over_to_continuation_sheet(tmp_path):
+    records = calculate_vlsm("10.0.0.0", "/24", [10, 10, 10, 10, 10], "A")
+    path = tmp_path / "plan.xlsx"
+
+    assert write_excel(path, records, max_rows=2) == 5
+
+    workbook = openpyxl.load_workbook(path)
+    assert workbook.sheetnames == ["Red A", "Red A (2)", "Red A (3)"]
+    assert [row[0] for row in workbook["Red A (3)"].values] == ["Subred", 5]
+
+
+def test_no_records():
+    with pytest.raises(ValueError):
+        write_excel("no-se-escribe.xlsx", [])
@@ -0,0 +1,21 @@
+# tests/test_exporters.py
+
+import pytest
+
+from exporters import EXPORTERS, VLSMExporter, get_exporter
+
+
+def test_exporter_interface_is_abstract():
+    with pytest.raises(TypeError):
+        VLSMExporter()
+
+    class Incompleto(VLSMExporter):
+        name = "incompleto"
+
+    with pytest.raises(TypeError):
+        Incompleto()
+
+
+def test_registered_exporters_are_concrete():
+    for fmt in EXPORTERS:
+        assert isinstance(get_exporter(fmt), VLSMExporter)
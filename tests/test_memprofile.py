@@ -0,0 +1,47 @@
+# tests/test_memprofile.py
+
+import tracemalloc
+
+import pytest
+
+from memprofile import MemoryBudgetExceeded, parse_size, profile_plan
+
+PLAN = "".join(f"IP 10.{i}.0.0 MASK /24 HOSTS 50, 20, 10 NAME Red{i};\n" for i in range(20))
+
+
+def test_phase_budget_violation_stops_at_that_phase():
+    with pytest.raises(MemoryBudgetExceeded) as info:
+        profile_plan(PLAN, budgets={"pico_lexico": 1}, count_objects=False)
+    error = info.value
+    assert [metric for metric, _, _ in error.violations] == ["pico_lexico"]
+    assert [record["fase"] for record in error.report["fases"]] == ["lexico"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_total_and_per_unit_budget_violations_keep_full_report():
+    with pytest.raises(MemoryBudgetExceeded) as info:
+        profile_plan(PLAN, ["cisco"], budgets={"pico": 1, "bytes_por_token": 1},
+                     count_objects=False)
+    error = info.value
+    assert {metric for metric, _, _ in error.violations} == {"pico", "bytes_por_token"}
+    assert all(value > budget for _, value, budget in error.violations)
+    assert error.report["conteos"]["subredes"] == 60
+    assert error.report["fases"][-1]["fase"] == "cisco"
+    assert "pico: " in str(error)
+
+
+def test_budgets_within_limits():
+    plan, report = profile_plan(PLAN, budgets={"pico": parse_size("1GB"),
+                                               "bytes_por_subred": parse_size("1MB")})
+    assert plan['ok']
+    assert report["conteos"]["bloques"] == 20
+    assert all(record["objetos"] is not None for record in report["fases"])
+
+
+def test_parse_size():
+    assert parse_size("2GB") == 2 << 30
+    assert parse_size("512k") == 512 << 10
+    assert parse_size("1.5MiB") == 3 << 19
+    assert parse_size("100") == 100
+    with pytest.raises(ValueError):
+        parse_size("10XB")
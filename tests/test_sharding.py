@@ -0,0 +1,42 @@
+# tests/test_sharding.py
+
+import re
+
+import pytest
+
+from sharding import MAX_VLANS, assign_subnets, device_capacity, shard_cisco_config
+from vlsm_calc import calculate_vlsm
+
+
+def test_capacity_capped_at_vlan_limit():
+    device = {"hostname": "R1", "interfaces": 2, "subinterfaces": 4000}
+    assert device_capacity(device) == MAX_VLANS
+    assert device_capacity({"hostname": "R1", "interfaces": 2, "subinterfaces": 100}) == 200
+    assert device_capacity({"hostname": "R1", "interfaces": 8}) == 8
+
+    # Un plan pequeño cabe aunque el equipo declare más subinterfaces que VLAN
+    shards = assign_subnets(calculate_vlsm("10.0.0.0", "/24", [2], "A"), [device])
+    assert len(shards) == 1 and len(shards[0]["subnets"]) == 1
+
+
+def test_plan_over_capped_capacity():
+    subnets = calculate_vlsm("10.0.0.0", "/8", [2] * (MAX_VLANS + 1), "Carga")
+    with pytest.raises(ValueError):
+        assign_subnets(subnets, [{"hostname": "R1", "interfaces": 2, "subinterfaces": 4000}])
+
+
+def test_vlans_stay_in_range(tmp_path):
+    subnets = calculate_vlsm("10.0.0.0", "/8", [2] * (MAX_VLANS + 10), "Carga")
+    inventory = [
+        {"hostname": "R1", "interfaces": 2, "subinterfaces": 2047},
+        {"hostname": "R2", "interfaces": 1, "subinterfaces": 100},
+    ]
+    reports = shard_cisco_config(subnets, inventory, str(tmp_path), max_workers=1)
+    assert [report["subredes"] for report in reports] == [MAX_VLANS, 10]
+
+    for report in reports:
+        with open(report["archivo"], encoding="utf-8") as f:
+            vlans = [int(vlan) for vlan in re.findall(r"encapsulation dot1Q (\d+)", f.read())]
+        assert len(vlans) == report["subredes"]
+        assert len(set(vlans)) == len(vlans)
+        assert 1 <= min(vlans) and max(vlans) <= MAX_VLANS
@@ -0,0 +1,21 @@
+# tests/test_startup.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import bench_startup
+
+
+@pytest.mark.parametrize("module", bench_startup.CORE_MODULES)
+def test_core_module_skips_forbidden_imports(module):
+    # Solo revisa qué se importa; el tiempo de arranque se mide con
+    # benchmarks/bench_startup.py, no en las pruebas
+    assert bench_startup.forbidden_imports(module) == []
+
+
+def test_forbidden_imports_detected():
+    assert bench_startup.forbidden_imports("ipaddress", ["ipaddress", "tkinter"]) == ["ipaddress"]
@@ -0,0 +1,67 @@
+# tests/test_summarization.py
+
+import random
+
+from summarization import ip_to_int, summarize_ranges, summarize_vlsm
+from vlsm_calc import calculate_vlsm
+
+
+def _covered(prefixes):
+    addresses = set()
+    for network, prefix in prefixes:
+        assert network % (1 << (32 - prefix)) == 0
+        addresses.update(range(network, network + (1 << (32 - prefix))))
+    return addresses
+
+
+def test_adjacent_ranges_merge_into_one_prefix():
+    base = ip_to_int("10.0.0.0")
+    assert summarize_ranges([(base + 128, base + 256), (base, base + 128)]) == [(base, 24)]
+    # Contiguos pero no alineados a un bloque común: dos prefijos
+    assert summarize_ranges([(base + 128, base + 256), (base + 256, base + 384)]) == [
+        (base + 128, 25), (base + 256, 25)]
+
+
+def test_unaligned_range_splits_into_aligned_prefixes():
+    base = ip_to_int("10.0.0.0")
+    assert summarize_ranges([(base + 1, base + 10)]) == [
+        (base + 1, 32), (base + 2, 31), (base + 4, 30), (base + 8, 31)]
+
+
+def test_overlapping_and_whole_space():
+    base = ip_to_int("192.168.0.0")
+    assert summarize_ranges([(base, base + 200), (base + 100, base + 256)]) == [(base, 24)]
+    assert summarize_ranges([(0, 1 << 32)]) == [(0, 0)]
+    assert summarize_ranges([]) == []
+
+
+def test_random_ranges_cover_exactly_and_minimally():
+    rng = random.Random(7)
+    for _ in range(300):
+        ranges = []
+        for _ in range(rng.randint(1, 5)):
+            start = rng.randrange(512)
+            ranges.append((start, start + rng.randint(1, 64)))
+        prefixes = summarize_ranges(ranges)
+
+        expected = set()
+        for start, end in ranges:
+            expected.update(range(start, end))
+        assert _covered(prefixes) == expected
+        # Mínimo: ningún par de prefijos hermanos se podría unir
+        blocks = set(prefixes)
+        for network, prefix in prefixes:
+            size = 1 << (32 - prefix)
+            assert (network ^ size, prefix) not in blocks
+
+
+def test_summarize_vlsm_per_block():
+    results = (calculate_vlsm("10.0.0.0", "/24", [100, 50, 20], "A")
+               + calculate_vlsm("10.0.1.0", "/24", [120, 120], "B"))
+    summaries = summarize_vlsm(results)
+    assert [(s["nombre_red"], s["direccionamiento_de_red"], s["nueva_mascara"]) for s in summaries] == [
+        ("A", "10.0.0.0", "/25"), ("A", "10.0.0.128", "/26"), ("A", "10.0.0.192", "/27"),
+        ("B", "10.0.1.0", "/24")]
+    assert [(s["direccionamiento_de_red"], s["nueva_mascara"])
+            for s in summarize_vlsm(results, per_block=False)] == [
+        ("10.0.0.0", "/25"), ("10.0.0.128", "/26"), ("10.0.0.192", "/27"), ("10.0.1.0", "/24")]
@@ -0,0 +1,23 @@
+# tests/test_tracing.py
+
+import tracing
+from artifacts import TEXT_ARTIFACTS
+from pipeline import compile_plan
+
+PLAN = "\n".join(f"IP 10.0.{i}.0 MASK /24 HOSTS 50,20,10,5 NAME R{i};" for i in range(10))
+
+
+def test_vlsm_block_spans_once_per_block():
+    tracer = tracing.start_tracing()
+    try:
+        plan = compile_plan(PLAN)
+        # Los generadores de ASM recalculan el VLSM de cada bloque
+        for name in ("asm", "asm_packed"):
+            TEXT_ARTIFACTS[name][1](plan)
+    finally:
+        tracing.stop_tracing()
+
+    assert plan['ok']
+    spans = [event for event in tracer.events if event["name"] == "vlsm.bloque"]
+    assert len(spans) == 10
+    assert tracer.counters["subredes"] == 40
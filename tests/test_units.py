@@ -0,0 +1,67 @@
+# tests/test_units.py
+
+import os
+
+from units import compile_program
+
+
+def _write(tmp_path, files):
+    for name, text in files.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    return {name: os.path.normpath(str(tmp_path / name)) for name in files}
+
+
+def test_include_cycle_is_a_link_error(tmp_path):
+    paths = _write(tmp_path, {
+        "a.vlsm": 'INCLUDE "b.vlsm";\nIP 10.0.0.0 MASK /24 HOSTS 10 NAME A;',
+        "b.vlsm": 'INCLUDE "a.vlsm";\nIP 10.0.1.0 MASK /24 HOSTS 10 NAME B;',
+    })
+    plan, units = compile_program(paths["a.vlsm"], jobs=1)
+    assert not plan['ok'] and plan['vlsm_results'] is None
+    assert len(plan['link_errors']) == 1
+    error = plan['link_errors'][0]
+    assert error.startswith(f"{paths['b.vlsm']}, línea 1: inclusión circular: ")
+    assert error.endswith(f"{paths['a.vlsm']} -> {paths['b.vlsm']} -> {paths['a.vlsm']}")
+    assert set(units) == set(paths.values())
+
+
+def test_self_include_is_a_cycle(tmp_path):
+    paths = _write(tmp_path, {"a.vlsm": 'INCLUDE "a.vlsm";\nIP 10.0.0.0 MASK /24 HOSTS 10 NAME A;'})
+    plan, _ = compile_program(paths["a.vlsm"], jobs=1)
+    assert [error.split(": ", 1)[1] for error in plan['link_errors']] == [
+        f"inclusión circular: {paths['a.vlsm']} -> {paths['a.vlsm']}"]
+
+
+def test_overlap_between_units_is_a_link_error(tmp_path):
+    paths = _write(tmp_path, {
+        "a.vlsm": 'INCLUDE "b.vlsm";\nIP 10.0.0.0 MASK /16 HOSTS 100 NAME Central;',
+        "b.vlsm": "IP 10.0.5.0 MASK /24 HOSTS 10 NAME Sucursal;",
+    })
+    plan, _ = compile_program(paths["a.vlsm"], jobs=1)
+    assert not plan['ok'] and plan['vlsm_results'] is None
+    assert plan['link_errors'] == [
+        f"Error de enlace: la red 'Sucursal' (10.0.5.0/24) de {paths['b.vlsm']} se traslapa con "
+        f"la red 'Central' (10.0.0.0/16) de {paths['a.vlsm']}."
+    ]
+
+
+def test_shared_include_linked_once_in_order(tmp_path):
+    paths = _write(tmp_path, {
+        "raiz.vlsm": 'INCLUDE "norte.vlsm";\nINCLUDE "sur.vlsm";\nIP 10.0.0.0 MASK /24 HOSTS 10 NAME Raiz;',
+        "norte.vlsm": 'INCLUDE "comun.vlsm";\nIP 10.1.0.0 MASK /24 HOSTS 10 NAME Norte;',
+        "sur.vlsm": 'INCLUDE "comun.vlsm";\nIP 10.2.0.0 MASK /24 HOSTS 10 NAME Sur;',
+        "comun.vlsm": "IP 10.3.0.0 MASK /24 HOSTS 10 NAME Comun;",
+    })
+    plan, _ = compile_program(paths["raiz.vlsm"], jobs=1)
+    assert plan['ok'] and not plan['link_errors']
+    assert plan['unidades'] == [paths[name] for name in
+                                ("comun.vlsm", "norte.vlsm", "sur.vlsm", "raiz.vlsm")]
+    assert [r['nombre_red'] for r in plan['vlsm_results']] == ["Comun", "Norte", "Sur", "Raiz"]
+    assert plan['key']
+
+
+def test_missing_include_is_a_link_error(tmp_path):
+    paths = _write(tmp_path, {"a.vlsm": 'INCLUDE "falta.vlsm";\nIP 10.0.0.0 MASK /24 HOSTS 10 NAME A;'})
+    plan, _ = compile_program(paths["a.vlsm"], jobs=1)
+    assert not plan['ok']
+    assert "no se pudo incluir 'falta.vlsm'" in plan['link_errors'][0]
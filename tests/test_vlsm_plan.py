@@ -0,0 +1,85 @@
+# tests/test_vlsm_plan.py
+
+import random
+
+import pytest
+
+from vlsm_calc import VLSMPlan, calculate_vlsm
+
+
+def _ip_to_int(text):
+    a, b, c, d = map(int, text.split("."))
+    return a << 24 | b << 16 | c << 8 | d
+
+
+def _random_case(rng):
+    """Red base 10.x.x.x/16 a /24 alineada y una lista HOSTS que suele caber."""
+    prefix = rng.randint(16, 24)
+    network = 10 << 24 | rng.randrange(1 << (prefix - 8)) << (32 - prefix)
+    base = ".".join(str(network >> shift & 255) for shift in (24, 16, 8, 0))
+    size = 1 << (32 - prefix)
+    hosts = [rng.randint(1, max(2, size // 64)) for _ in range(rng.randint(1, 12))]
+    return base, f"/{prefix}", hosts
+
+
+def _random_edits(rng, hosts):
+    indices = rng.sample(range(len(hosts)), rng.randint(1, len(hosts)))
+    return {i: max(1, hosts[i] + rng.randint(-hosts[i], 3 * hosts[i])) for i in indices}
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_what_if_matches_full_recalculation(seed):
+    rng = random.Random(seed)
+    base, mask, hosts = _random_case(rng)
+    plan = VLSMPlan(base, mask, hosts, "Red")
+    assert plan.results == calculate_vlsm(base, mask, hosts, "Red")
+
+    # Varias ediciones encadenadas, cada una contra un cálculo completo
+    for _ in range(3):
+        edits = _random_edits(rng, plan.hosts)
+        new_hosts = list(plan.hosts)
+        for index, value in edits.items():
+            new_hosts[index] = value
+        try:
+            edited, summary = plan.what_if(edits)
+        except ValueError:
+            required = sum(1 << (h + 1).bit_length() for h in new_hosts)
+            assert required > plan.size
+            continue
+        assert edited.results == calculate_vlsm(base, mask, new_hosts, "Red")
+        assert edited.hosts == new_hosts
+        assert not summary["reasignacion_completa"]
+        plan = edited
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_minimal_renumbering_is_a_valid_assignment(seed):
+    rng = random.Random(seed)
+    base, mask, hosts = _random_case(rng)
+    plan = VLSMPlan(base, mask, hosts, "Red")
+    edits = _random_edits(rng, hosts)
+    try:
+        edited, summary = plan.what_if(edits, minimize_renumbering=True)
+    except ValueError:
+        return
+
+    # Mismas subredes (hosts y máscara) que el cálculo completo
+    expected = calculate_vlsm(base, mask, edited.hosts, "Red")
+    key = lambda record: (record["hosts_solicitados"], record["nueva_mascara"])
+    assert sorted(map(key, edited.results)) == sorted(map(key, expected))
+
+    # Alineadas, dentro de la red base y sin traslapes
+    base_int = _ip_to_int(base)
+    previous_end = base_int
+    for record in edited.results:
+        start = _ip_to_int(record["direccionamiento_de_red"])
+        size = 1 << (32 - int(record["nueva_mascara"][1:]))
+        assert start % size == 0 and start >= previous_end
+        previous_end = start + size
+    assert previous_end <= base_int + plan.size
+
+    # Sin reasignación completa, las subredes que no crecen no se mueven
+    if not summary["reasignacion_completa"]:
+        for i, bits in enumerate(edited.bits):
+            if bits <= plan.bits[i]:
+                assert edited.starts[i] == plan.starts[i]
@@ -0,0 +1,97 @@
+# tests/test_vm.py
+
+import builtins
+
+import pytest
+
+import vm
+from summarization import ip_to_int
+from vm import ForwardingTable, IOSConfigPager, parse_ioscfg, run_ioscfg
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "router.ioscfg"
+    path.write_text("".join(f"linea {i}\n" for i in range(10)), encoding="utf-8")
+    return str(path)
+
+
+def test_run_ioscfg_full_and_window(config):
+    full = run_ioscfg(config)
+    assert "Líneas:" not in full
+    assert full.endswith("linea 0\nlinea 1\nlinea 2\nlinea 3\nlinea 4\nlinea 5\n"
+                         "linea 6\nlinea 7\nlinea 8\nlinea 9")
+
+    window = run_ioscfg(config, start_line=3, max_lines=2)
+    assert "Líneas: 4-5 de 10" in window
+    assert window.endswith("linea 3\nlinea 4")
+
+
+def test_run_ioscfg_clamps_start_line(config):
+    assert "Líneas: ninguna desde la 11 de 10" in run_ioscfg(config, start_line=50, max_lines=5)
+    assert "Líneas: 1-2 de 10" in run_ioscfg(config, start_line=-4, max_lines=2)
+
+
+def test_pager_closes_file_when_mmap_fails(config, monkeypatch):
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        f = builtins.open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    def failing_mmap(*args, **kwargs):
+        raise OSError("sin mmap")
+
+    monkeypatch.setattr(vm, "open", tracking_open, raising=False)
+    monkeypatch.setattr(vm.mmap, "mmap", failing_mmap)
+    with pytest.raises(OSError):
+        IOSConfigPager(config)
+    assert opened and opened[0].closed
+
+
+def test_lpm_prefers_longest_prefix_in_any_order():
+    routes = [("10.0.0.0", 8, "corta"), ("10.1.0.0", 16, "media"), ("10.1.2.0", 24, "larga"),
+              ("0.0.0.0", 0, "default")]
+    for ordered in (routes, routes[::-1]):
+        table = ForwardingTable()
+        for network, prefix, iface in ordered:
+            table.add(ip_to_int(network), prefix, iface)
+        assert table.lookup("10.1.2.3") == "larga"
+        assert table.lookup("10.1.3.3") == "media"
+        assert table.lookup("10.2.0.1") == "corta"
+        assert table.lookup("192.168.0.1") == "default"
+        addresses = ["10.1.2.3", "10.1.3.3", "10.2.0.1", "192.168.0.1"]
+        assert table.lookup_many(addresses) == [table.lookup(a) for a in addresses]
+
+
+def test_lpm_same_prefix_last_route_wins():
+    table = ForwardingTable()
+    table.add(ip_to_int("10.0.0.0"), 24, "Gi0/0")
+    # Los bits de host de la red se ignoran: es la misma ruta
+    table.add(ip_to_int("10.0.0.77"), 24, "Gi0/1")
+    assert len(table) == 1
+    assert table.lookup("10.0.0.5") == "Gi0/1"
+    assert table.lookup("10.0.1.5") is None
+
+
+def test_connected_route_wins_tie_with_static():
+    device = parse_ioscfg([
+        "interface Gi0/0",
+        " ip address 10.0.0.1 255.255.255.0",
+        " no shutdown",
+        "exit",
+        "interface Gi0/1",
+        " ip address 10.0.1.1 255.255.255.0",
+        " no shutdown",
+        "exit",
+        "ip route 10.0.0.0 255.255.255.0 10.0.1.254",
+        "ip route 10.0.0.128 255.255.255.128 10.0.1.254",
+        "ip route 172.16.0.0 255.255.0.0 192.0.2.1",
+    ])
+    table = ForwardingTable.from_device(device)
+    # Mismo prefijo: gana la red conectada; prefijo más largo: gana la estática
+    assert table.lookup("10.0.0.5") == "Gi0/0"
+    assert table.lookup("10.0.0.200") == "Gi0/1"
+    # Siguiente salto sin red conectada: la ruta se descarta
+    assert table.lookup("172.16.0.1") is None
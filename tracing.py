@@ -0,0 +1,206 @@
+# tracing.py
+
+"""
+Instrumentación ligera del compilador: spans (intervalos con nombre) y
+contadores.
+
+Las fases del compilador llaman a span() y counter() siempre; mientras no
+haya un Tracer activo, span() regresa un objeto nulo compartido y counter()
+no hace nada, así que el costo es una llamada a función por punto de
+medición. Para medir una compilación:
+
+    tracer = start_tracing()
+    compile_plan(code)
+    stop_tracing()
+    tracer.write_chrome_trace("traza.json")   # chrome://tracing o Perfetto
+    print(tracer.summary())
+
+Los spans por bloque (semantic.bloque, vlsm.bloque) llevan el nombre de la
+red en sus argumentos; summary() lista los bloques más lentos.
+"""
+
+import functools
+import os
+import threading
+import time
+
+# Spans por bloque que summary() ordena para encontrar bloques problemáticos
+BLOCK_SPANS = ("semantic.bloque", "vlsm.bloque")
+
+
+class _NullSpan:
+    """Span que no mide nada; se usa cuando el trazado está desactivado."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+# Tracer activo del proceso (None = trazado desactivado)
+_tracer = None
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer.add_span(self.name, self.start, end, self.args)
+        return False
+
+
+class Tracer:
+    """Acumula spans como eventos completos del formato Chrome trace."""
+    def __init__(self):
+        self.events = []
+        self.counters = {}
+        self.pid = os.getpid()
+
+    def span(self, name, args):
+        return _Span(self, name, args)
+
+    def add_span(self, name, start_ns, end_ns, args=None):
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, events, counters):
+        """Agrega eventos y contadores de otro Tracer (p. ej. de otro proceso)."""
+        self.events.extend(events)
+        for name, value in counters.items():
+            self.count(name, value)
+
+    # ---- exportación ----
+    def chrome_trace(self):
+        """Diccionario en formato Chrome trace-event (JSON)."""
+        events = list(self.events)
+        if events:
+            # Los contadores se reportan una vez, al final de la traza
+            end = max(event["ts"] + event["dur"] for event in events)
+            events.extend({"name": name, "ph": "C", "ts": end, "pid": self.pid,
+                           "args": {name: value}}
+                          for name, value in self.counters.items())
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self, slowest_blocks=10):
+        """Tabla de texto: tiempo por span, contadores y bloques más lentos."""
+        totals = {}
+        for event in self.events:
+            entry = totals.setdefault(event["name"], [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += event["dur"]
+            entry[2] = max(entry[2], event["dur"])
+
+        lines = [f"{'span':<28} {'llamadas':>9} {'total ms':>11} {'media ms':>10} {'máx ms':>10}"]
+        for name, (calls, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<28} {calls:>9,} {total / 1000:>11.3f} "
+                         f"{total / calls / 1000:>10.4f} {longest / 1000:>10.4f}")
+
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'contador':<28} {'valor':>12}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<28} {value:>12,}")
+
+        blocks = [event for event in self.events if event["name"] in BLOCK_SPANS]
+        if blocks and slowest_blocks:
+            lines.append("")
+            lines.append("Bloques más lentos:")
+            for event in sorted(blocks, key=lambda e: -e["dur"])[:slowest_blocks]:
+                args = event.get("args", {})
+                lines.append(f"  {event['name']:<18} {event['dur'] / 1000:>10.4f} ms  "
+                             f"{args.get('nombre')} ({args.get('subredes', '?')} subredes)")
+        return "\n".join(lines)
+
+
+def span(name, **args):
+    """
+    Context manager que mide un intervalo con nombre. Sin Tracer activo
+    regresa un span nulo compartido.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, args)
+
+
+def traced(name):
+    """
+    Decorador: mide cada llamada a la función como un span name. Sin Tracer
+    activo solo agrega una comprobación por llamada.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_span(name, start_ns, end_ns, **args):
+    """Registra un span ya medido (tiempos de time.perf_counter_ns())."""
+    if _tracer is not None:
+        _tracer.add_span(name, start_ns, end_ns, args)
+
+
+def merge(events, counters):
+    """Agrega al Tracer activo, si existe, eventos y contadores de otro proceso."""
+    if _tracer is not None:
+        _tracer.merge(events, counters)
+
+
+def counter(name, value=1):
+    """Suma value al contador name del Tracer activo, si existe."""
+    if _tracer is not None:
+        _tracer.count(name, value)
+
+
+def enabled():
+    return _tracer is not None
+
+
+def start_tracing(tracer=None):
+    """Activa el trazado en el proceso y regresa el Tracer."""
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def stop_tracing():
+    """Desactiva el trazado y regresa el Tracer que estaba activo."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
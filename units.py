@@ -0,0 +1,229 @@
+# units.py
+
+"""
+Planes de varios archivos: cada archivo es una unidad de compilación.
+
+Un plan puede incluir otros archivos con la directiva
+
+    INCLUDE "sucursales/norte.vlsm";
+
+cuya ruta es relativa al archivo que la contiene. compile_program() sigue
+los INCLUDE desde el archivo raíz y compila cada unidad por separado con
+pipeline.compile_plan() (léxico, sintáctico, semántico, VLSM e IR). Las
+unidades de un mismo nivel se compilan en paralelo. Cada unidad tiene su
+propia entrada en la caché persistente (cache.py), así que al editar un
+archivo solo se recompila ese archivo.
+
+Al final link() enlaza las unidades en un solo plan con el mismo formato
+que compile_plan(). Cada unidad va después de las unidades que incluye, en
+el orden de sus INCLUDE, y una unidad incluida varias veces se enlaza una
+sola vez. Los errores de enlace (archivos que no se pueden leer,
+inclusiones circulares y redes base de unidades distintas que se
+traslapan) quedan en plan['link_errors'].
+"""
+
+import hashlib
+import os
+
+from cache import PlanCache, compile_cached
+
+
+def resolve_include(unit_path, target):
+    """Ruta de un INCLUDE, relativa al archivo que lo contiene."""
+    return os.path.normpath(os.path.join(os.path.dirname(unit_path), target))
+
+
+def compile_unit(path, cache_dir=None, cache_size=None):
+    """
+    Compila un archivo como unidad. Se ejecuta dentro del pool.
+    Retorna {"ruta", "plan", "cache", "error"}; plan es None si el archivo
+    no se pudo leer.
+    """
+    unit = {"ruta": path, "plan": None, "cache": False, "error": None}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        unit["error"] = f"No se pudo leer el archivo: {e}"
+        return unit
+    cache = PlanCache(cache_dir, cache_size) if cache_dir else None
+    unit["plan"], _, unit["cache"] = compile_cached(code, (), cache, link_includes=True)
+    return unit
+
+
+def compile_units(root, jobs=None, cache_dir=None, cache_size=None, plans=None):
+    """
+    Compila todas las unidades alcanzables desde root, nivel por nivel.
+
+    jobs: procesos del pool (1 = sin pool).
+    plans: diccionario opcional ruta -> plan de unidades ya compiladas.
+
+    Retorna un diccionario ruta -> unidad (ver compile_unit), en el orden
+    en que se descubrieron.
+    """
+    root = os.path.normpath(root)
+    units = {path: {"ruta": path, "plan": plan, "cache": False, "error": None}
+             for path, plan in (plans or {}).items()}
+    level = [root]
+    seen = {root}
+    pool = None
+    try:
+        while level:
+            pending = [path for path in level if path not in units]
+            if len(pending) > 1 and jobs != 1:
+                if pool is None:
+                    from concurrent.futures import ProcessPoolExecutor
+                    pool = ProcessPoolExecutor(max_workers=jobs)
+                compiled = pool.map(compile_unit, pending, [cache_dir] * len(pending),
+                                    [cache_size] * len(pending))
+            else:
+                compiled = (compile_unit(path, cache_dir, cache_size) for path in pending)
+            for unit in compiled:
+                units[unit["ruta"]] = unit
+
+            # Siguiente nivel: los INCLUDE de este nivel que no se han visto
+            next_level = []
+            for path in level:
+                plan = units[path]["plan"]
+                for include in plan['includes'] if plan else ():
+                    target = resolve_include(path, include['archivo'])
+                    if target not in seen:
+                        seen.add(target)
+                        next_level.append(target)
+            level = next_level
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return units
+
+
+def _overlap_errors(order, units):
+    """Errores por redes base de unidades distintas que se traslapan."""
+    import ipaddress
+
+    networks = []
+    for path in order:
+        for block in units[path]["plan"]['blocks']:
+            try:
+                network = ipaddress.IPv4Network(f"{block['ip_address']}{block['subnet_mask']}", strict=False)
+            except ValueError:
+                continue
+            networks.append((int(network.network_address), int(network.broadcast_address),
+                             path, block.get('name'), str(network)))
+    networks.sort()
+
+    errors = []
+    # Redes que siguen abiertas en el barrido; con CIDR un traslape siempre
+    # es una red contenida en otra, así que la lista es corta
+    active = []
+    for network in networks:
+        start, _, path, name, text = network
+        active = [other for other in active if other[1] >= start]
+        for other in active:
+            if other[2] != path:
+                errors.append(
+                    f"Error de enlace: la red '{name}' ({text}) de {path} se traslapa con "
+                    f"la red '{other[3]}' ({other[4]}) de {other[2]}."
+                )
+        active.append(network)
+    return errors
+
+
+def _linked_key(order, units):
+    """Clave del programa enlazado, o None si alguna unidad no tiene clave."""
+    keys = [units[path]["plan"].get('key') for path in order]
+    if not all(keys):
+        return None
+    digest = hashlib.sha256()
+    for path, key in zip(order, keys):
+        digest.update(f"{path}\0{key}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def link(root, units):
+    """
+    Enlaza las unidades compiladas a partir de root en un solo plan con el
+    formato de compile_plan(), más 'link_errors' y 'unidades' (rutas en
+    orden de enlace). Los mensajes de cada unidad llevan su ruta. La clave
+    del plan enlazado combina las claves de las unidades en ese orden.
+    """
+    root = os.path.normpath(root)
+    plan = {
+        'tokens': [],
+        'lex_errors': [],
+        'blocks': [],
+        'syntax_errors': [],
+        'tree': [],
+        'semantic_errors': [],
+        'link_errors': [],
+        'vlsm_results': None,
+        'ir': [],
+        'includes': [],
+        'unidades': [],
+        'ok': False,
+        'key': None,
+    }
+
+    if units[root]["error"]:
+        plan['link_errors'].append(f"{root}: {units[root]['error']}")
+        return plan
+
+    # Recorrido en profundidad: cada unidad después de sus INCLUDE
+    order = []
+    state = {}
+
+    def visit(path, stack):
+        state[path] = "visitando"
+        for include in units[path]["plan"]['includes']:
+            target = resolve_include(path, include['archivo'])
+            where = f"{path}, línea {include['linea']}"
+            if state.get(target) == "visitando":
+                cycle = " -> ".join(stack[stack.index(target):] + [target])
+                plan['link_errors'].append(f"{where}: inclusión circular: {cycle}")
+            elif target not in state:
+                if units[target]["error"]:
+                    state[target] = "error"
+                    plan['link_errors'].append(
+                        f"{where}: no se pudo incluir '{include['archivo']}': {units[target]['error']}"
+                    )
+                else:
+                    visit(target, stack + [target])
+        state[path] = "enlazada"
+        order.append(path)
+
+    visit(root, [root])
+
+    vlsm_results = []
+    for path in order:
+        unit_plan = units[path]["plan"]
+        plan['tokens'].extend(unit_plan['tokens'])
+        plan['blocks'].extend(unit_plan['blocks'])
+        plan['tree'].extend(unit_plan['tree'])
+        # El optimizador trabaja dentro de cada bloque, así que el IR de las
+        # unidades se puede concatenar
+        plan['ir'].extend(unit_plan['ir'])
+        for key in ('lex_errors', 'syntax_errors', 'semantic_errors'):
+            plan[key].extend(f"{path}: {message}" for message in unit_plan[key])
+        vlsm_results.extend(unit_plan['vlsm_results'] or [])
+    plan['includes'] = units[root]["plan"]['includes']
+    plan['unidades'] = order
+    plan['key'] = _linked_key(order, units)
+
+    if not (plan['lex_errors'] or plan['syntax_errors'] or plan['semantic_errors']):
+        plan['link_errors'].extend(_overlap_errors(order, units))
+
+    plan['ok'] = bool(plan['blocks']) and not any(
+        plan[key] for key in ('lex_errors', 'syntax_errors', 'semantic_errors', 'link_errors')
+    )
+    if plan['ok']:
+        plan['vlsm_results'] = vlsm_results
+    return plan
+
+
+def compile_program(root, jobs=None, cache_dir=None, cache_size=None, plans=None):
+    """
+    Compila y enlaza el plan root con todos sus INCLUDE.
+    Los parámetros son los de compile_units(). Retorna (plan, unidades).
+    """
+    units = compile_units(root, jobs, cache_dir, cache_size, plans)
+    return link(root, units), units
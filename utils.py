@@ -1,5 +1,9 @@
 # utils.py
 import tkinter as tk
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from tkinter import ttk, font as tkfont
 
 class TextLineNumbers(tk.Canvas):
     """
@@ -31,3 +35,402 @@ class TextLineNumbers(tk.Canvas):
             linenum = str(i).split(".")[0]
             self.create_text(2, y, anchor="nw", text=linenum)
             i = self.textwidget.index(f"{i}+1line")
+
+
+class VirtualTreeview(tk.Frame):
+    """
+    Tabla de solo lectura para listas muy grandes.
+
+    Solo existen como filas del Treeview las que caben en pantalla; al
+    desplazarse se reasignan sus valores desde la lista completa. El costo
+    de mostrar datos no depende del número de filas sino del alto visible.
+    """
+    def __init__(self, parent, columns, column_width=130, height=12, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.rows = []
+        self.offset = 0
+        self.page = height
+        self.visible_height = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height,
+                                 selectmode="browse")
+        for c in columns:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, anchor="center", width=column_width)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-1, "pages"))
+        self.tree.bind("<Next>", lambda e: self.scroll(1, "pages"))
+
+    def set_rows(self, rows):
+        """Reemplaza los datos de la tabla (lista de tuplas de valores)."""
+        self.rows = rows
+        self.offset = 0
+        self._render()
+        self.after_idle(self._fit_page)
+
+    def clear(self):
+        self.set_rows([])
+
+    def scroll(self, amount, what="units"):
+        step = self.page if what == "pages" else 3
+        self._move_to(self.offset + int(amount) * step)
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._move_to(round(float(args[0]) * len(self.rows)))
+        elif action == "scroll":
+            self.scroll(args[0], args[1])
+
+    def _on_configure(self, event):
+        self.visible_height = event.height
+        self._fit_page()
+
+    def _fit_page(self):
+        """Ajusta el tamaño de la página al alto real del widget."""
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items and self.visible_height else None
+        if bbox:
+            page = max(1, (self.visible_height - bbox[1]) // bbox[3])
+            if page != self.page:
+                self.page = page
+                self.offset = max(0, min(self.offset, len(self.rows) - page))
+                self._render()
+
+    def _move_to(self, offset):
+        offset = max(0, min(offset, len(self.rows) - self.page))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        visible = self.rows[self.offset:self.offset + self.page]
+        items = self.tree.get_children()
+
+        # Reutiliza las filas existentes y solo crea o borra la diferencia
+        for item, values in zip(items, visible):
+            self.tree.item(item, values=values)
+        if len(items) > len(visible):
+            self.tree.delete(*items[len(visible):])
+        for values in visible[len(items):]:
+            self.tree.insert('', tk.END, values=values)
+
+        if self.rows:
+            first = self.offset / len(self.rows)
+            last = min(1.0, (self.offset + self.page) / len(self.rows))
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class DerivationTreeView(tk.Frame):
+    """
+    Vista desplazable con los árboles de derivación de todos los bloques,
+    uno junto a otro en un solo Canvas.
+
+    set_tree() solo mide cada bloque (ancho y profundidad) y guarda su
+    posición x en un arreglo; la distribución de los nodos de un bloque se
+    calcula cuando el bloque entra en la vista y se conservan las de los
+    últimos LAYOUT_CACHE_BLOCKS bloques, así que la memoria no crece con el
+    tamaño del plan. En cada desplazamiento solo se dibujan los nodos que
+    caen dentro de la vista; los bloques visibles se localizan con bisect
+    sobre sus posiciones x.
+    """
+    V_SPACING = 60
+    H_SPACING = 90
+    BLOCK_MARGIN = 100
+    MIN_BLOCK_WIDTH = 500
+    ROOT_Y = 40
+    # Margen extra de la vista para no cortar óvalos en los bordes
+    CULL_MARGIN = 300
+    # Bloques cuya distribución se conserva entre redibujados
+    LAYOUT_CACHE_BLOCKS = 32
+
+    FONT = ("Segoe UI", 11, "bold")
+    LEAF_FONT = ("Segoe UI", 10, "normal")
+    NODE_BG = "#e3eafc"
+    NODE_BORDER = "#5b9bd5"
+    ROOT_BG = "#d1f2eb"
+    ROOT_BORDER = "#148f77"
+    LEAF_BG = "#fff9e3"
+    LEAF_BORDER = "#f4d03f"
+    LINE_COLOR = "#4a6fa5"
+    LINE_WIDTH = 3
+    NODE_RADIUS_Y = 24
+    RED_LEN = 15
+    SMALL_LINE = 15
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.tree = []
+        # x de inicio de cada bloque y, al final, el ancho total
+        self.block_starts = array("q", [0])
+        self.layouts = OrderedDict()
+        self.total_width = 0
+        self.total_height = 0
+        self.redraw_job = None
+        self.text_widths = {}
+
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 4))
+        ttk.Label(bar, text="Ir a bloque:").pack(side="left", padx=(0, 6))
+        self.block_selector = ttk.Combobox(bar, width=40)
+        self.block_selector.pack(side="left")
+        self.block_selector.bind("<<ComboboxSelected>>", self._on_block_selected)
+        self.block_selector.bind("<Return>", self._on_block_selected)
+
+        area = ttk.Frame(self)
+        area.pack(fill="both", expand=True)
+        x_scroll = tk.Scrollbar(area, orient="horizontal")
+        y_scroll = tk.Scrollbar(area, orient="vertical")
+        self.canvas = tk.Canvas(area, bg="#fafdff", highlightthickness=0,
+                                xscrollcommand=lambda *a: self._on_view_change(x_scroll, *a),
+                                yscrollcommand=lambda *a: self._on_view_change(y_scroll, *a))
+        x_scroll.config(command=self.canvas.xview)
+        y_scroll.config(command=self.canvas.yview)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        area.grid_rowconfigure(0, weight=1)
+        area.grid_columnconfigure(0, weight=1)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+
+        self.fonts = {self.FONT: tkfont.Font(font=self.FONT),
+                      self.LEAF_FONT: tkfont.Font(font=self.LEAF_FONT)}
+        self.line_heights = {f: tk_font.metrics("linespace") for f, tk_font in self.fonts.items()}
+
+    # ---- distribución ----
+    @staticmethod
+    def _split(node):
+        if isinstance(node, tuple) and isinstance(node[1], list):
+            return node[0], node[1]
+        return node[0], None
+
+    def _measure(self, node):
+        """(ancho, profundidad) del subárbol, sin guardar nada por nodo."""
+        label, children = self._split(node)
+        if not children:
+            return self.H_SPACING, 1
+        total = depth = 0
+        for child in children:
+            width, child_depth = self._measure(child)
+            total += width
+            depth = max(depth, child_depth)
+        return max(total, self.H_SPACING * len(children)), depth + 1
+
+    def _subtree_widths(self, node, widths):
+        """Calcula (una vez) el ancho de cada subárbol; widths[id(nodo)]."""
+        label, children = self._split(node)
+        if children:
+            total = sum(self._subtree_widths(child, widths) for child in children)
+            width = max(total, self.H_SPACING * len(children))
+        else:
+            width = self.H_SPACING
+        widths[id(node)] = width
+        return width
+
+    def _layout_block(self, node, x, y, widths, ovals, connectors, is_root=False):
+        """
+        Coloca el subárbol con centro en x. ovals recibe (x, y_texto, texto,
+        tipo) y connectors (x, y, centros de los hijos) para cada nodo interno.
+        Retorna la profundidad del subárbol.
+        """
+        label, children = self._split(node)
+        depth = 1
+        if children:
+            child_y = y + self.V_SPACING
+            start_x = x - widths[id(node)] // 2
+            centers = []
+            current_x = start_x
+            for child in children:
+                effective_w = max(widths[id(child)], self.H_SPACING)
+                centers.append(current_x + effective_w // 2)
+                current_x += effective_w
+            connectors.append((x, y, centers))
+            for child, child_x in zip(children, centers):
+                depth = max(depth, 1 + self._layout_block(child, child_x, child_y, widths,
+                                                          ovals, connectors))
+
+        if is_root:
+            kind = "raiz"
+        elif children:
+            kind = "nodo"
+        else:
+            kind = "hoja"
+
+        if children:
+            text = f"<{label}>"
+            y_draw = y + 15 if label == "HOSTS_LIST" else y
+        else:
+            # leaf label structure: ('NUMBER', '5') or ('IDENTIFIER', 'Escuela')
+            text = str(node[1]) if isinstance(node, tuple) else str(node)
+            y_draw = y + 15
+        ovals.append((x, y_draw, text, kind))
+        return depth
+
+    def _block_layout(self, index):
+        """
+        Distribución del bloque index: {"ovals", "oval_xs", "connectors"}.
+        Se calcula al pedirla y se guarda entre los últimos LAYOUT_CACHE_BLOCKS.
+        """
+        layout = self.layouts.get(index)
+        if layout is not None:
+            self.layouts.move_to_end(index)
+            return layout
+
+        block = self.tree[index]
+        x0, x1 = self.block_starts[index], self.block_starts[index + 1]
+        widths = {}
+        self._subtree_widths(block, widths)
+        ovals, connectors = [], []
+        self._layout_block(block, x0 + (x1 - x0) // 2, self.ROOT_Y, widths,
+                           ovals, connectors, is_root=True)
+        ovals.sort(key=lambda oval: oval[0])
+        layout = {"ovals": ovals, "oval_xs": [oval[0] for oval in ovals],
+                  "connectors": connectors}
+        self.layouts[index] = layout
+        if len(self.layouts) > self.LAYOUT_CACHE_BLOCKS:
+            self.layouts.popitem(last=False)
+        return layout
+
+    def set_tree(self, tree):
+        """Mide los bloques, los coloca uno junto a otro y dibuja la vista."""
+        self.tree = list(tree)
+        self.block_starts = array("q", [0])
+        self.layouts.clear()
+        x0 = 0
+        max_depth = 1
+        for block in self.tree:
+            tree_width, depth = self._measure(block)
+            x0 += max(self.MIN_BLOCK_WIDTH, tree_width + self.BLOCK_MARGIN)
+            self.block_starts.append(x0)
+            max_depth = max(max_depth, depth)
+
+        self.total_width = x0
+        self.total_height = max(250, max_depth * self.V_SPACING + 80)
+        self.canvas.config(scrollregion=(0, 0, self.total_width, self.total_height))
+        self.block_selector.config(values=[self._block_name(index)
+                                           for index in range(len(self.tree))])
+        self.block_selector.set("")
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.redraw()
+
+    def clear(self):
+        self.set_tree([])
+
+    # ---- navegación ----
+    def _block_name(self, index):
+        return f"{index + 1}. {self.tree[index][0]}"
+
+    def jump_to_block(self, index):
+        """Desplaza la vista al inicio del bloque index (desde 0)."""
+        if 0 <= index < len(self.tree) and self.total_width:
+            self.canvas.xview_moveto(self.block_starts[index] / self.total_width)
+
+    def find_block(self, query):
+        """Índice del bloque cuyo nombre o número coincide con query, o None."""
+        query = query.strip()
+        if not query:
+            return None
+        number = query.split(".")[0]
+        if number.isdigit() and 1 <= int(number) <= len(self.tree):
+            return int(number) - 1
+        query = query.lower()
+        for index, block in enumerate(self.tree):
+            if str(block[0]).lower() == query:
+                return index
+        return None
+
+    def _on_block_selected(self, event=None):
+        index = self.find_block(self.block_selector.get())
+        if index is not None:
+            self.jump_to_block(index)
+
+    # ---- dibujo ----
+    def _on_view_change(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        if self.redraw_job is None:
+            self.redraw_job = self.after_idle(self.redraw)
+
+    def _text_width(self, text, font):
+        key = (text, font)
+        width = self.text_widths.get(key)
+        if width is None:
+            width = self.text_widths[key] = self.fonts[font].measure(text)
+        return width
+
+    def redraw(self):
+        """Dibuja solo los nodos y líneas que caen dentro de la vista."""
+        self.redraw_job = None
+        canvas = self.canvas
+        canvas.delete("all")
+        if not self.tree:
+            return
+
+        view_x0 = canvas.canvasx(0) - self.CULL_MARGIN
+        view_x1 = canvas.canvasx(canvas.winfo_width()) + self.CULL_MARGIN
+
+        starts = self.block_starts
+        first = max(0, bisect_right(starts, view_x0) - 1)
+        for index in range(first, len(self.tree)):
+            x0, x1 = starts[index], starts[index + 1]
+            if x0 > view_x1:
+                break
+            if x1 < view_x0:
+                continue
+            canvas.create_line(x1, 0, x1, self.total_height, fill="#d6d6d6", dash=(4, 4))
+            layout = self._block_layout(index)
+            for x, y, centers in layout["connectors"]:
+                self._draw_connector(x, y, centers, view_x0, view_x1)
+            lo = bisect_left(layout["oval_xs"], view_x0)
+            hi = bisect_right(layout["oval_xs"], view_x1)
+            for oval in layout["ovals"][lo:hi]:
+                self._draw_oval(*oval)
+
+    def _draw_connector(self, x, y, centers, view_x0, view_x1):
+        canvas = self.canvas
+        if max(x, centers[-1]) < view_x0 or min(x, centers[0]) > view_x1:
+            return
+        parent_red_start_y = y + self.NODE_RADIUS_Y
+        parent_red_end_y = parent_red_start_y + self.RED_LEN
+        child_edge_top_y = y + self.V_SPACING - self.NODE_RADIUS_Y
+
+        canvas.create_line(x, parent_red_start_y, x, parent_red_end_y, width=2,
+                           fill=self.LINE_COLOR, capstyle=tk.ROUND)
+        canvas.create_line(x, parent_red_end_y, x, child_edge_top_y, width=self.LINE_WIDTH,
+                           fill=self.LINE_COLOR, capstyle=tk.ROUND)
+        # La línea horizontal se recorta a la vista
+        canvas.create_line(max(centers[0], view_x0), child_edge_top_y,
+                           min(centers[-1], view_x1), child_edge_top_y,
+                           width=self.LINE_WIDTH, fill=self.LINE_COLOR, capstyle=tk.ROUND)
+        lo = bisect_left(centers, view_x0)
+        hi = bisect_right(centers, view_x1)
+        for child_x in centers[lo:hi]:
+            canvas.create_line(child_x, child_edge_top_y, child_x, child_edge_top_y + self.SMALL_LINE,
+                               width=2, fill=self.LINE_COLOR, capstyle=tk.ROUND)
+
+    def _draw_oval(self, x, y, text, kind):
+        if kind == "raiz":
+            bg, border, font = self.ROOT_BG, self.ROOT_BORDER, self.FONT
+        elif kind == "nodo":
+            bg, border, font = self.NODE_BG, self.NODE_BORDER, self.FONT
+        else:
+            bg, border, font = self.LEAF_BG, self.LEAF_BORDER, self.LEAF_FONT
+
+        pad_x, pad_y = 18, 14
+        half_w = max(80, self._text_width(text, font) + 2 * pad_x) / 2
+        half_h = self.line_heights[font] / 2 + pad_y
+        self.canvas.create_oval(x - half_w, y - half_h, x + half_w, y + half_h,
+                                fill=bg, outline=border, width=2)
+        self.canvas.create_text(x, y, text=text, font=font, fill="#222", anchor="c")
@@ -1,12 +1,32 @@
 # vlsm_calc.py
 import math
-import ipaddress
+
+_ipaddress = None
+
+
+def ipaddress_module():
+    """
+    Módulo ipaddress, importado en el primer uso y guardado en el módulo:
+    importar el núcleo del compilador no lo carga (benchmarks/bench_startup.py).
+    """
+    global _ipaddress
+    if _ipaddress is None:
+        import ipaddress
+        _ipaddress = ipaddress
+    return _ipaddress
+
 
 def calculate_vlsm(ip_address, subnet_mask, num_hosts_list, nombre_red=None):
     """
     Calcula las subredes resultantes aplicando VLSM.
     Retorna una lista de diccionarios con la información de cada subred.
+
+    No registra spans ni contadores: los generadores de ASM la vuelven a
+    llamar por bloque, así que la medición está en la fase VLSM del
+    pipeline (pipeline.calculate_block_vlsm).
     """
+    ipaddress = ipaddress_module()
+
     results = []
     # Crea la red base a partir de la IP y la máscara
     base_network = ipaddress.IPv4Network(f"{ip_address}{subnet_mask}", strict=True)
@@ -46,3 +66,183 @@ def calculate_vlsm(ip_address, subnet_mask, num_hosts_list, nombre_red=None):
         current_ip += block_size
 
     return results
+
+
+def _int_to_ip(value):
+    return f"{value >> 24 & 255}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+def _host_bits(num_hosts):
+    """Bits de host de una subred: igual a ceil(log2(num_hosts + 2)), con enteros."""
+    return (num_hosts + 1).bit_length()
+
+
+def _subnet_record(start, bits_host, num_hosts, ip_address, nombre_red):
+    """Registro de una subred con el mismo formato que calculate_vlsm()."""
+    block_size = 1 << bits_host
+    new_cidr = 32 - bits_host
+    return {
+        'hosts_solicitados': num_hosts,
+        'hosts_encontrados': block_size - 2,
+        'direccionamiento_de_red': _int_to_ip(start),
+        'nueva_mascara': f"/{new_cidr}",
+        'mascara_decimal': _int_to_ip((0xFFFFFFFF << bits_host) & 0xFFFFFFFF),
+        'primera_ip_utilizable': _int_to_ip(start + 1),
+        'ultima_ip_utilizable': _int_to_ip(start + block_size - 2),
+        'direccion_de_broadcast': _int_to_ip(start + block_size - 1),
+        'ip_base': ip_address,
+        'nombre_red': nombre_red
+    }
+
+
+class VLSMPlan:
+    """
+    Asignación VLSM de un bloque que se puede replanear ("what-if") al
+    cambiar la cantidad de hosts de algunas subredes.
+
+    Cada subred se identifica por su índice en la lista HOSTS original.
+    results tiene los mismos registros que calculate_vlsm(); what_if()
+    regresa un plan nuevo (el original no cambia) y solo genera los
+    registros de las subredes cuya dirección, máscara u hosts cambiaron.
+    """
+
+    def __init__(self, ip_address, subnet_mask, num_hosts_list, nombre_red=None):
+        base_network = ipaddress_module().IPv4Network(f"{ip_address}{subnet_mask}", strict=True)
+        self.ip_address = ip_address
+        self.subnet_mask = subnet_mask
+        self.nombre_red = nombre_red
+        self.base = int(base_network.network_address)
+        self.size = base_network.num_addresses
+        self.hosts = list(num_hosts_list)
+        self.bits = [_host_bits(h) for h in self.hosts]
+        self._check_space(self.bits)
+        self.starts, self.order = self._compact(self.hosts, self.bits)
+        self.records = [_subnet_record(self.starts[i], self.bits[i], self.hosts[i],
+                                       ip_address, nombre_red)
+                        for i in range(len(self.hosts))]
+
+    @classmethod
+    def from_block(cls, block):
+        """Crea el plan de un bloque del parser."""
+        return cls(block['ip_address'], block['subnet_mask'], block['num_hosts'], block.get('name'))
+
+    @property
+    def results(self):
+        """Registros de las subredes en el orden del plan."""
+        return [self.records[i] for i in self.order]
+
+    def _check_space(self, bits):
+        required = sum(1 << b for b in bits)
+        if required > self.size:
+            raise ValueError(
+                f"El espacio total requerido para todas las subredes ({required} direcciones) "
+                f"excede el tamaño de la red base {self.ip_address}{self.subnet_mask} ({self.size} direcciones)."
+            )
+
+    def _compact(self, hosts, bits):
+        """
+        Asignación de calculate_vlsm(): de más a menos hosts, una subred
+        tras otra. Retorna (inicios por índice, orden de las subredes).
+        """
+        order = sorted(range(len(hosts)), key=lambda i: -hosts[i])
+        starts = [0] * len(bits)
+        cursor = self.base
+        for i in order:
+            starts[i] = cursor
+            cursor += 1 << bits[i]
+        return starts, order
+
+    def _relocate(self, bits):
+        """
+        Asignación que conserva las direcciones actuales: las subredes que
+        se reducen quedan en su lugar y las que crecen se mueven al primer
+        espacio libre alineado. Retorna los inicios, o None si no caben.
+        """
+        starts = list(self.starts)
+        growing = [i for i in range(len(bits)) if bits[i] > self.bits[i]]
+        occupied = sorted((starts[i], starts[i] + (1 << bits[i]))
+                          for i in range(len(bits)) if bits[i] <= self.bits[i])
+
+        # Las más grandes primero, para aprovechar los huecos alineados
+        for i in sorted(growing, key=lambda i: -bits[i]):
+            size = 1 << bits[i]
+            previous_end = self.base
+            for gap_end, next_end in occupied + [(self.base + self.size, None)]:
+                candidate = -(-previous_end // size) * size
+                if candidate + size <= gap_end:
+                    starts[i] = candidate
+                    break
+                if next_end is not None:
+                    previous_end = max(previous_end, next_end)
+            else:
+                return None
+            occupied.append((starts[i], starts[i] + size))
+            occupied.sort()
+        return starts
+
+    def what_if(self, edits, minimize_renumbering=False):
+        """
+        Replanea el bloque con edits ({índice en HOSTS: nuevos hosts}).
+
+        minimize_renumbering: en lugar de recalcular la asignación compacta
+            de calculate_vlsm(), conserva la dirección de las subredes que
+            no crecen y mueve solo las que crecen a espacio libre; si no hay
+            espacio alineado suficiente se usa la asignación compacta y el
+            resumen lo indica con "reasignacion_completa". Los resultados
+            quedan ordenados por dirección.
+
+        Retorna (plan nuevo, resumen). Lanza ValueError si una edición no
+        es válida o si las subredes no caben en la red base.
+        """
+        hosts = list(self.hosts)
+        for index, num_hosts in edits.items():
+            if not 0 <= index < len(hosts):
+                raise ValueError(f"No existe la subred {index} en '{self.nombre_red}'.")
+            if not isinstance(num_hosts, int) or num_hosts <= 0:
+                raise ValueError(f"La cantidad de hosts de la subred {index} debe ser un entero positivo.")
+            hosts[index] = num_hosts
+        bits = [_host_bits(h) if h != self.hosts[i] else self.bits[i] for i, h in enumerate(hosts)]
+        self._check_space(bits)
+
+        full_reassignment = False
+        starts = self._relocate(bits) if minimize_renumbering else None
+        if starts is not None:
+            order = sorted(range(len(bits)), key=starts.__getitem__)
+        else:
+            full_reassignment = minimize_renumbering
+            starts, order = self._compact(hosts, bits)
+
+        plan = object.__new__(VLSMPlan)
+        plan.__dict__.update(self.__dict__)
+        plan.hosts, plan.bits, plan.starts, plan.order = hosts, bits, starts, order
+        plan.records = list(self.records)
+
+        changes = []
+        for i in range(len(hosts)):
+            if (starts[i], bits[i], hosts[i]) == (self.starts[i], self.bits[i], self.hosts[i]):
+                continue
+            plan.records[i] = _subnet_record(starts[i], bits[i], hosts[i], self.ip_address, self.nombre_red)
+            if starts[i] != self.starts[i]:
+                action = "movida"
+            elif bits[i] != self.bits[i]:
+                action = "redimensionada"
+            else:
+                action = "hosts"
+            changes.append({
+                "indice": i,
+                "accion": action,
+                "hosts_antes": self.hosts[i],
+                "hosts_despues": hosts[i],
+                "red_antes": f"{_int_to_ip(self.starts[i])}/{32 - self.bits[i]}",
+                "red_despues": f"{_int_to_ip(starts[i])}/{32 - bits[i]}",
+            })
+
+        summary = {
+            "cambios": changes,
+            "movidas": sum(change["accion"] == "movida" for change in changes),
+            "redimensionadas": sum(change["accion"] == "redimensionada" for change in changes),
+            "sin_cambios": len(hosts) - len(changes),
+            "reasignacion_completa": full_reassignment,
+            "direcciones_libres": self.size - sum(1 << b for b in bits),
+        }
+        return plan, summary
@@ -8,38 +8,395 @@ Este módulo funciona como una "máquina virtual" muy básica:
 - Lee su contenido.
 - Lo muestra dentro de una ventana en la GUI con un encabezado estilo consola.
 
+Para archivos muy grandes (cientos de MB) se usa IOSConfigPager, que mapea
+el archivo en memoria con mmap, indexa una sola vez el inicio de cada línea
+y entrega cualquier ventana de líneas o búsqueda sin decodificar todo.
+
+parse_ioscfg() construye un modelo en memoria del dispositivo (interfaces,
+direcciones, estado shutdown y rutas estáticas) y ForwardingTable responde
+por qué interfaz se reenviaría el tráfico hacia una dirección, usando
+búsqueda de prefijo más largo.
+
 En versiones futuras podría integrarse con librerías como Netmiko
 para enviar la configuración directamente a un dispositivo Cisco real.
 """
 
-def run_ioscfg(path):
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+from summarization import int_to_ip, ip_to_int
+
+
+def _vm_header(path, detail=None):
+    """
+    Cabecera simulada estilo "máquina virtual".
+    Esto solo es decoración para mostrar en la GUI.
+    """
+    lines = [
+        "================= VM CISCO IOSCFG =================",
+        f"Archivo: {path}",
+    ]
+    if detail:
+        lines.append(detail)
+    lines.append("===================================================")
+    return "\n".join(lines) + "\n\n"
+
+
+class IOSConfigPager:
+    """
+    Lector paginado de archivos .ioscfg basado en mmap.
+
+    El archivo no se carga completo: se recorre una sola vez para guardar
+    el desplazamiento de inicio de cada línea y después solo se decodifican
+    las líneas que se piden.
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+
+        # mmap no acepta archivos vacíos
+        if self._size:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except Exception:
+                self._file.close()
+                raise
+        else:
+            self._map = b""
+
+        self._starts = self._index_lines()
+
+    def _index_lines(self):
+        """
+        Guarda el inicio de cada línea y, al final, el tamaño del archivo.
+        La línea i ocupa los bytes [starts[i], starts[i + 1]).
+        """
+        starts = array("Q", [0])
+        find = self._map.find
+        pos = find(b"\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find(b"\n", pos + 1)
+        if starts[-1] != self._size:
+            starts.append(self._size)
+        return starts
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Libera el mapeo y cierra el archivo."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def _decode(self, start, end):
+        """Decodifica las líneas [start, end) y las separa."""
+        raw = self._map[self._starts[start]:self._starts[end]]
+        lines = raw.decode(self.encoding, errors="replace").split("\n")
+        if raw.endswith(b"\n"):
+            lines.pop()
+        return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+    def get_lines(self, start, count):
+        """
+        Devuelve hasta count líneas a partir de la línea start (base 0).
+        """
+        start = max(0, min(start, len(self)))
+        end = min(len(self), start + max(0, count))
+        if start >= end:
+            return []
+        return self._decode(start, end)
+
+    def get_line(self, number):
+        """Devuelve la línea number (base 0)."""
+        if not 0 <= number < len(self):
+            raise IndexError(f"Línea fuera de rango: {number}")
+        return self._decode(number, number + 1)[0]
+
+    def line_of_offset(self, offset):
+        """Número de línea que contiene el byte offset."""
+        return bisect_right(self._starts, offset) - 1
+
+    def search(self, pattern, start_line=0, max_results=None, regex=False):
+        """
+        Busca pattern en el archivo mapeado sin decodificarlo.
+        Genera tuplas (número de línea, texto de la línea), una por línea.
+
+        pattern: texto o bytes; con regex=True se interpreta como expresión
+                 regular sobre bytes.
+        """
+        if isinstance(pattern, str):
+            pattern = pattern.encode(self.encoding)
+        if not pattern or start_line >= len(self):
+            return
+
+        if regex:
+            compiled = re.compile(pattern)
+
+            def find(pos):
+                match = compiled.search(self._map, pos)
+                return match.start() if match else -1
+        else:
+            def find(pos):
+                return self._map.find(pattern, pos)
+
+        found = 0
+        pos = find(self._starts[max(0, start_line)])
+        while pos != -1:
+            number = self.line_of_offset(pos)
+            yield number, self._decode(number, number + 1)[0]
+            found += 1
+            if max_results is not None and found >= max_results:
+                return
+            # Se continúa desde la siguiente línea
+            if number + 1 >= len(self):
+                return
+            pos = find(self._starts[number + 1])
+
+
+class IOSInterface:
+    """
+    Interfaz de un dispositivo simulado.
+    Como en un router IOS, las interfaces inician apagadas (shutdown).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.description = None
+        self.ip_address = None
+        self.mask = None
+        self.encapsulation = None
+        self.shutdown = True
+
+    def __repr__(self):
+        state = "down" if self.shutdown else "up"
+        return f"IOSInterface({self.name}, {self.ip_address} {self.mask}, {state})"
+
+
+class IOSDevice:
+    """
+    Modelo en memoria de un dispositivo construido a partir de un .ioscfg.
+    """
+
+    def __init__(self, hostname=None):
+        self.hostname = hostname
+        self.interfaces = {}
+        # Rutas estáticas: (red, máscara, siguiente salto)
+        self.static_routes = []
+
+    def interface(self, name):
+        """Devuelve la interfaz name, creándola si no existe."""
+        iface = self.interfaces.get(name)
+        if iface is None:
+            iface = self.interfaces[name] = IOSInterface(name)
+        return iface
+
+
+def parse_ioscfg(source, device=None):
+    """
+    Interpreta un archivo .ioscfg y construye (o actualiza) un IOSDevice.
+
+    source: ruta del archivo o iterable de líneas.
+    device: dispositivo existente sobre el que se aplican los comandos,
+            útil para aplicar una configuración incremental.
+
+    Se reconocen los comandos que generan los back ends del compilador;
+    el resto se ignora.
+    """
+    if device is None:
+        device = IOSDevice()
+
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            return parse_ioscfg(f, device)
+
+    current = None
+    for raw in source:
+        line = raw.strip()
+        if not line or line.startswith("!"):
+            continue
+        words = line.split()
+
+        if current is not None:
+            if words[0] in ("exit", "end"):
+                current = None
+                continue
+            if words[0] == "description":
+                current.description = line[len("description"):].strip()
+                continue
+            if words[0] == "ip" and len(words) >= 4 and words[1] == "address":
+                current.ip_address, current.mask = words[2], words[3]
+                continue
+            if words[0] == "encapsulation":
+                current.encapsulation = " ".join(words[1:])
+                continue
+            if words[0] == "shutdown":
+                current.shutdown = True
+                continue
+            if words[0] == "no" and len(words) >= 2:
+                if words[1] == "shutdown":
+                    current.shutdown = False
+                    continue
+                if words[1:3] == ["ip", "address"]:
+                    current.ip_address = current.mask = None
+                    continue
+                if words[1] == "description":
+                    current.description = None
+                    continue
+            # Cualquier otro comando sale del modo interfaz
+            current = None
+
+        if words[0] == "hostname" and len(words) >= 2:
+            device.hostname = words[1]
+        elif words[0] == "interface" and len(words) >= 2:
+            current = device.interface(words[1])
+        elif words[:2] == ["ip", "route"] and len(words) >= 5:
+            device.static_routes.append((words[2], words[3], words[4]))
+        elif words[:3] == ["no", "ip", "route"] and len(words) >= 6:
+            route = (words[3], words[4], words[5])
+            if route in device.static_routes:
+                device.static_routes.remove(route)
+
+    return device
+
+
+class ForwardingTable:
+    """
+    Tabla de reenvío con búsqueda de prefijo más largo (LPM).
+
+    Se guarda un diccionario por longitud de prefijo (red -> interfaz); una
+    búsqueda prueba solo las longitudes presentes, de la más larga a la más
+    corta, con una consulta hash en cada una.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._masks = []
+
+    def add(self, network, prefix, iface):
+        """Agrega o reemplaza la ruta network/prefix hacia iface."""
+        mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+        table = self._tables.get(prefix)
+        if table is None:
+            table = self._tables[prefix] = {}
+            self._masks = [
+                ((0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF, self._tables[p])
+                for p in sorted(self._tables, reverse=True)
+            ]
+        table[network & mask] = iface
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+    def lookup(self, address):
+        """Interfaz de salida hacia address (texto o entero), o None."""
+        if isinstance(address, str):
+            address = ip_to_int(address)
+        for mask, table in self._masks:
+            iface = table.get(address & mask)
+            if iface is not None:
+                return iface
+        return None
+
+    def lookup_many(self, addresses):
+        """Resuelve muchas direcciones; retorna la lista de interfaces."""
+        masks = self._masks
+        results = []
+        append = results.append
+        for address in addresses:
+            if isinstance(address, str):
+                address = ip_to_int(address)
+            for mask, table in masks:
+                iface = table.get(address & mask)
+                if iface is not None:
+                    append(iface)
+                    break
+            else:
+                append(None)
+        return results
+
+    def routes(self):
+        """Lista de rutas (red, prefijo, interfaz) de la tabla."""
+        return [
+            (int_to_ip(network), prefix, iface)
+            for prefix, table in sorted(self._tables.items(), reverse=True)
+            for network, iface in table.items()
+        ]
+
+    @classmethod
+    def from_device(cls, device):
+        """
+        Construye la tabla de un IOSDevice: redes conectadas de las interfaces
+        habilitadas con dirección y rutas estáticas. Las rutas estáticas con
+        siguiente salto IP se resuelven contra las redes conectadas; las que no
+        se pueden resolver se descartan. Una red conectada tiene prioridad
+        sobre una ruta estática al mismo prefijo.
+        """
+        connected = cls()
+        for iface in device.interfaces.values():
+            if iface.shutdown or not iface.ip_address:
+                continue
+            prefix = bin(ip_to_int(iface.mask)).count("1")
+            connected.add(ip_to_int(iface.ip_address), prefix, iface.name)
+
+        table = cls()
+        for network, mask, next_hop in device.static_routes:
+            prefix = bin(ip_to_int(mask)).count("1")
+            if next_hop[0].isdigit():
+                out = connected.lookup(next_hop)
+                if out is None:
+                    continue
+            else:
+                out = next_hop
+            table.add(ip_to_int(network), prefix, out)
+
+        for prefix, routes in connected._tables.items():
+            for network, iface in routes.items():
+                table.add(network, prefix, iface)
+        return table
+
+
+def run_ioscfg(path, start_line=0, max_lines=None):
     """
     Función que recibe la ruta de un archivo .ioscfg.
-    Abre el archivo, lee todo su contenido y lo regresa como un string.
+    Lee el archivo con IOSConfigPager y regresa su contenido como un string.
     La GUI utilizará esta función para mostrar el texto generado por el compilador.
 
     Parámetros:
         path (str): Ruta completa del archivo .ioscfg.
+        start_line (int): Primera línea a mostrar (base 0).
+        max_lines (int): Si se indica, solo se regresa esa ventana de líneas;
+                         si no, todas las líneas desde start_line.
     """
 
     try:
-        # Abre el archivo en modo lectura (r), usando codificación UTF-8.
-        # El 'with' asegura que el archivo se cierre automáticamente al terminar.
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()  # Lee todo el contenido del archivo.
-
-        # Cabecera simulada estilo "máquina virtual".
-        # Esto solo es decoración para mostrar en la GUI.
-        header = (
-            "================= VM CISCO IOSCFG =================\n"
-            f"Archivo: {path}\n"
-            "===================================================\n\n"
-        )
-
-        # Regresa la cabecera y el contenido del archivo concatenados.
-        return header + content
+        with IOSConfigPager(path) as pager:
+            total = len(pager)
+            start = max(0, min(start_line, total))
+            lines = pager.get_lines(start, total if max_lines is None else max_lines)
+
+            # La cabecera indica la ventana solo si no es el archivo completo
+            detail = None
+            if (max_lines is not None or start) and lines:
+                detail = f"Líneas: {start + 1}-{start + len(lines)} de {total}"
+            elif max_lines is not None or start:
+                detail = f"Líneas: ninguna desde la {start + 1} de {total}"
+        return _vm_header(path, detail) + "\n".join(lines)
 
     except Exception as e:
         # Si ocurre cualquier error (archivo inexistente, permisos, etc.),
         # devolvemos un mensaje indicando que la VM no lo pudo leer.
-        return f"[VM-ERROR] No se pudo leer el archivo: {e}"
\ No newline at end of file
+        return f"[VM-ERROR] No se pudo leer el archivo: {e}"
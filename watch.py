@@ -0,0 +1,329 @@
+# watch.py
+
+"""
+Modo vigilancia: recompila los planes de un directorio cuando cambian.
+
+PlanWatcher revisa periódicamente (polling, sin dependencias) la fecha y el
+tamaño de los planes del directorio y espera a que pase --debounce sin
+cambios antes de recompilar, para que una ráfaga de escrituras del editor
+produzca una sola recompilación.
+
+Cada archivo tiene un IncrementalCompiler que guarda el resultado de cada
+sentencia (tokens, bloque, nodo del árbol, errores semánticos, subredes
+VLSM e IR) indexado por su texto. Al cambiar el archivo solo las
+sentencias nuevas o modificadas pasan por el lexer, el parser,
+VLSMSemanticAnalyzer y el cálculo VLSM. Los artefactos se escriben
+con artifacts.emit_artifacts(), que omite los archivos sin cambios.
+
+Un plan con INCLUDE se enlaza con units.compile_program(); si cambia un
+archivo incluido se recompilan los planes que lo incluyen.
+
+Por cada recompilación se emite en stdout un objeto JSON (JSON Lines) con
+la latencia, los bloques reutilizados y recompilados y el estado de cada
+artefacto; los diagnósticos usan el mismo formato que cli.py.
+
+Uso:
+    python watch.py planes/ --cisco --asm --format csv -o salida
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from cli import PLAN_PATTERN, _emit, plan_name, selected_artifacts
+from intermediate_code import IntermediateCodeGenerator
+from lexer import VLSMLexer
+from parser import VLSMParser
+from pipeline import calculate_block_vlsm, compile_plan, plan_errors, plan_key
+from semantic import VLSMSemanticAnalyzer
+
+
+class IncrementalCompiler:
+    """
+    Compila versiones sucesivas de un mismo plan reutilizando los bloques
+    que no cambiaron. compile() regresa un plan con el formato de
+    pipeline.compile_plan() y deja en self.stats cuántos bloques se
+    reutilizaron y cuántos se recompilaron.
+
+    El texto se divide en sentencias en cada ';' y el resultado de cada una
+    (tokens con posiciones relativas, bloque, nodo del árbol, errores
+    semánticos, subredes VLSM e IR) se guarda indexado por su texto.
+    """
+
+    def __init__(self):
+        self.lexer = VLSMLexer()
+        # texto de la sentencia -> resultado del bloque
+        self.entries = {}
+        self.stats = {"reutilizados": 0, "recompilados": 0}
+
+    @staticmethod
+    def _statements(code):
+        """Divide el texto en sentencias, cada una con su ';' final."""
+        pieces = code.split(";")
+        statements = [piece + ";" for piece in pieces[:-1]]
+        if pieces[-1].strip():
+            statements.append(pieces[-1])
+        return statements
+
+    def _compile_statement(self, statement):
+        """
+        Compila una sentencia aislada. Retorna None si no es un bloque
+        válido léxica y sintácticamente (o es un INCLUDE).
+        """
+        tokens, lex_errors = self.lexer.tokenize(statement)
+        if lex_errors:
+            return None
+        parser = VLSMParser(tokens)
+        blocks = parser.parse()
+        if parser.errors or parser.includes or len(blocks) != 1:
+            return None
+        block = blocks[0]
+        tree = VLSMParser(tokens).parse_with_tree()
+
+        analyzer = VLSMSemanticAnalyzer(blocks)
+        analyzer.analyze()
+        vlsm_results = None
+        if not analyzer.errors:
+            vlsm_results = calculate_block_vlsm(block)
+
+        generator = IntermediateCodeGenerator(blocks)
+        generator.generate()
+        return {
+            "tokens": tokens,
+            "bloque": block,
+            "arbol": tree,
+            "errores": analyzer.errors,
+            "subredes": vlsm_results,
+            # El optimizador trabaja dentro de cada bloque, así que el IR de
+            # los bloques se puede concatenar
+            "ir": generator.optimized_ir,
+        }
+
+    def compile(self, code):
+        statements = self._statements(code)
+        entries, ordered, tokens, reused = {}, [], [], 0
+        line, col = 1, 0
+        for statement in statements:
+            entry = entries.get(statement) or self.entries.get(statement)
+            if entry is None:
+                entry = self._compile_statement(statement)
+                if entry is None:
+                    break
+            else:
+                reused += 1
+            entries[statement] = entry
+            ordered.append(entry)
+
+            # Los tokens guardados tienen posiciones relativas a la sentencia
+            for token_type, value, token_line, token_col in entry["tokens"]:
+                if token_line == 1:
+                    tokens.append((token_type, value, line, token_col + col))
+                else:
+                    tokens.append((token_type, value, token_line + line - 1, token_col))
+            newlines = statement.count("\n")
+            if newlines:
+                line += newlines
+                col = len(statement) - statement.rfind("\n") - 1
+            else:
+                col += len(statement)
+        else:
+            self.entries = entries
+            self.stats = {"reutilizados": reused, "recompilados": len(statements) - reused}
+            plan = self._assemble(tokens, ordered)
+            plan['key'] = plan_key(code, link_includes=True)
+            return plan
+
+        # Con errores léxicos o sintácticos (o INCLUDE) se usa el pipeline
+        # completo: sus mensajes dependen de la recuperación del parser y
+        # esas fases omiten el análisis semántico y VLSM
+        self.stats = {"reutilizados": 0, "recompilados": len(statements)}
+        return compile_plan(code, link_includes=True)
+
+    @staticmethod
+    def _assemble(tokens, entries):
+        plan = {
+            'tokens': tokens,
+            'lex_errors': [],
+            'blocks': [entry["bloque"] for entry in entries],
+            'syntax_errors': [],
+            'tree': [node for entry in entries for node in entry["arbol"]],
+            'semantic_errors': [error for entry in entries for error in entry["errores"]],
+            'link_errors': [],
+            'vlsm_results': None,
+            'ir': [instruction for entry in entries for instruction in entry["ir"]],
+            'includes': [],
+            'ok': False,
+            'key': None,
+        }
+        plan['ok'] = bool(entries) and not plan['semantic_errors']
+        if plan['ok']:
+            plan['vlsm_results'] = [result for entry in entries for result in entry["subredes"]]
+        return plan
+
+
+class PlanWatcher:
+    """
+    Vigila los planes de directory y recompila los que cambian.
+
+    artifacts: artefactos a generar (nombres de artifacts.py).
+    out_root: cada plan escribe en <out_root>/<nombre del plan>/.
+    interval: segundos entre revisiones del directorio.
+    debounce: segundos sin cambios antes de recompilar.
+    cache_dir, cache_size: caché persistente para las unidades incluidas.
+    """
+
+    def __init__(self, directory, artifacts=(), out_root="salida", pattern=PLAN_PATTERN,
+                 interval=0.5, debounce=0.3, out=None, cache_dir=None, cache_size=None):
+        self.directory = directory
+        self.artifacts = list(artifacts)
+        self.out_root = out_root
+        self.pattern = pattern
+        self.interval = interval
+        self.debounce = debounce
+        self.out = out or sys.stdout
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.compilers = {}
+        # plan raíz -> archivos de los que depende (él mismo y sus INCLUDE)
+        self.dependencies = {}
+        self.snapshot = {}
+
+    def scan(self):
+        """Regresa {ruta: (mtime_ns, tamaño)} de los planes del directorio."""
+        files = {}
+        for path in glob.glob(os.path.join(self.directory, "**", self.pattern), recursive=True):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[os.path.normpath(path)] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    @staticmethod
+    def changes(old, new):
+        """Rutas agregadas, eliminadas o modificadas entre dos revisiones."""
+        return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+    def affected_plans(self, changed):
+        """Planes que hay que recompilar cuando cambian los archivos changed."""
+        return sorted(path for path in self.snapshot
+                      if path in changed or changed & self.dependencies.get(path, set()))
+
+    def rebuild(self, path):
+        """Recompila un plan y escribe sus artefactos; retorna el resultado."""
+        start = time.perf_counter()
+        result = {"tipo": "recompilacion", "archivo": path, "ok": False, "bloques": 0,
+                  "reutilizados": 0, "recompilados": 0, "artefactos": [], "latencia_ms": 0.0}
+        diagnostics = []
+
+        def diagnostic(phase, message):
+            diagnostics.append({"tipo": "diagnostico", "archivo": path,
+                                "fase": phase, "mensaje": message})
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            diagnostic("entrada", f"No se pudo leer el archivo: {e}")
+            plan = None
+        else:
+            compiler = self.compilers.setdefault(path, IncrementalCompiler())
+            plan = compiler.compile(code)
+            result.update(compiler.stats)
+            self.dependencies[path] = {path}
+            if plan['includes']:
+                from units import compile_program
+                plan, units = compile_program(path, 1, self.cache_dir, self.cache_size,
+                                              plans={path: plan})
+                self.dependencies[path] = set(units)
+
+        if plan is not None:
+            for phase, message in plan_errors(plan):
+                diagnostic(phase, message)
+            result["bloques"] = len(plan['blocks'])
+            result["ok"] = plan['ok']
+            if plan['ok'] and self.artifacts:
+                from artifacts import emit_artifacts
+                out_dir = os.path.join(self.out_root, plan_name(path))
+                for report in emit_artifacts(plan, self.artifacts, out_dir):
+                    result["artefactos"].append({"artefacto": report["artefacto"],
+                                                 "estado": report["estado"]})
+                    if report["estado"] == "error":
+                        result["ok"] = False
+                        diagnostic("artefactos", f"{report['artefacto']}: {report['error']}")
+
+        result["latencia_ms"] = (time.perf_counter() - start) * 1000
+        for record in diagnostics:
+            _emit(record, self.out)
+        _emit(result, self.out)
+        return result
+
+    def poll(self):
+        """Revisa el directorio y regresa las rutas que cambiaron."""
+        current = self.scan()
+        changed = self.changes(self.snapshot, current)
+        self.snapshot = current
+        return changed
+
+    def run(self, stop_event=None):
+        """
+        Compila todos los planes y luego vigila el directorio hasta que se
+        active stop_event (threading.Event) o se interrumpa el proceso.
+        """
+        self.snapshot = self.scan()
+        for path in sorted(self.snapshot):
+            self.rebuild(path)
+
+        pending, last_change = set(), None
+        while stop_event is None or not stop_event.is_set():
+            time.sleep(self.interval)
+            changed = self.poll()
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+                continue
+            if pending and time.monotonic() - last_change >= self.debounce:
+                for path in pending - self.snapshot.keys():
+                    # Plan eliminado: se olvida su estado (sus artefactos se conservan)
+                    self.compilers.pop(path, None)
+                    self.dependencies.pop(path, None)
+                for path in self.affected_plans(pending):
+                    self.rebuild(path)
+                pending = set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompila los planes de un directorio cuando cambian.")
+    parser.add_argument("directory", help="directorio de planes")
+    parser.add_argument("-o", "--output", default="salida",
+                        help="directorio raíz de los artefactos (default: salida)")
+    parser.add_argument("--pattern", default=PLAN_PATTERN)
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="segundos entre revisiones del directorio (default: 0.5)")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="segundos sin cambios antes de recompilar (default: 0.3)")
+    parser.add_argument("--cisco", action="store_true")
+    parser.add_argument("--asm", action="store_true")
+    parser.add_argument("--asm-packed", action="store_true")
+    parser.add_argument("--ir", action="store_true")
+    parser.add_argument("--format", nargs="+", default=[], metavar="FORMATO",
+                        choices=["csv", "jsonl", "arrow", "parquet", "xlsx"])
+    parser.add_argument("--cache-dir", help="caché persistente para las unidades incluidas")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"No existe el directorio {args.directory}")
+
+    watcher = PlanWatcher(args.directory, selected_artifacts(args), args.output, args.pattern,
+                          args.interval, args.debounce, cache_dir=args.cache_dir)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())